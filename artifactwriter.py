@@ -0,0 +1,75 @@
+import base64
+import logging
+import queue
+import threading
+
+from tracer import get_tracer
+
+POLICY_ALL = "all"
+POLICY_FIRST_AND_LAST = "first_and_last"
+POLICY_ON_ERROR = "on_error"
+POLICIES = [POLICY_ALL, POLICY_FIRST_AND_LAST, POLICY_ON_ERROR]
+
+# screenshots waiting to be written before capture blocks
+DEFAULT_QUEUE_SIZE = 16
+
+# screenshots written under every policy
+ERROR_SCREENSHOTS = {"timeout", "error"}
+
+_STOP = object()
+
+
+# writes captured screenshots and other artifacts on a background thread so image
+# decoding and disk io stay off the solve path
+class ArtifactWriter:
+
+    # the completed board already shows the last attempt, so intermediate attempts are
+    # the only screenshots first_and_last skips
+    def should_capture(self, name):
+        if name in ERROR_SCREENSHOTS:
+            return True
+        if self.policy == POLICY_ALL:
+            return True
+        if self.policy == POLICY_FIRST_AND_LAST:
+            return not name.startswith("attempt_") or name == "attempt_0"
+        if self.policy == POLICY_ON_ERROR:
+            return False
+        raise ValueError(f"unknown screenshot policy {self.policy}")
+
+    # screenshot data is the base64 png returned by chrome, decoded on the writer thread
+    def submit_screenshot(self, name, data):
+        self.queue.put((f"{name}.png", data))
+
+    def write(self, file_name, data):
+        with get_tracer().span("artifact.write", "artifact", file=file_name):
+            with open(f"{self.output_dir}/{file_name}", "wb") as f:
+                f.write(base64.b64decode(data))
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self.write(*item)
+            except Exception as e:
+                self.logger.error(f"failed to write artifact {item[0]}: {e}")
+            finally:
+                self.queue.task_done()
+
+    def close(self):
+        if not self.thread.is_alive():
+            return
+        self.queue.put(_STOP)
+        self.thread.join()
+        self.logger.info("artifact writer flushed and stopped")
+
+    def __init__(self, output_dir, policy=POLICY_ALL, queue_size=DEFAULT_QUEUE_SIZE):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown screenshot policy {policy}")
+        self.logger = logging.getLogger("artifacts")
+        self.output_dir = output_dir
+        self.policy = policy
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = threading.Thread(target=self.run, name="artifact-writer", daemon=True)
+        self.thread.start()
@@ -0,0 +1,34 @@
+import base64
+
+import pytest
+
+from artifactwriter import ArtifactWriter
+
+
+class TestArtifactWriter:
+
+    def test_writes_decoded_screenshots_on_close(self, tmp_path):
+        writer = ArtifactWriter(str(tmp_path), queue_size=1)
+        png = b"\x89PNG\r\n\x1a\nnot really an image"
+        for attempt in range(3):
+            writer.submit_screenshot(f"attempt_{attempt}", base64.b64encode(png).decode("ascii"))
+        writer.close()
+
+        assert (tmp_path / "attempt_2.png").read_bytes() == png
+        assert not writer.thread.is_alive()
+
+    def test_policies(self, tmp_path):
+        names = ["game_start", "attempt_0", "attempt_1", "attempt_2", "completed_game", "stats", "timeout", "error"]
+
+        def captured(policy):
+            writer = ArtifactWriter(str(tmp_path), policy)
+            writer.close()
+            return [name for name in names if writer.should_capture(name)]
+
+        assert captured("all") == names
+        assert captured("first_and_last") == ["game_start", "attempt_0", "completed_game", "stats", "timeout",
+                                              "error"]
+        assert captured("on_error") == ["timeout", "error"]
+
+        with pytest.raises(ValueError):
+            ArtifactWriter(str(tmp_path), "sometimes")
@@ -0,0 +1,140 @@
+import logging
+import math
+import multiprocessing
+import time
+
+from decisiontree import DecisionTree
+from feedback import CACHE_DIR, FeedbackMatrix
+from openingbook import load_opening_book
+from simulatedbrowser import SimulatedBrowserWrapper
+from strategy import get_strategy
+from util import Util
+from wordindex import WordIndex
+from wordlesolver import WordleSolver
+from wordlist import DEFAULT_DICTIONARY, load_dictionary, load_word_list
+
+# work chunks handed to each worker over the whole batch, more evens out slow chunks
+CHUNKS_PER_PROCESS = 4
+
+# per worker solver state, set by init_worker in pool processes
+_worker_solver = None
+
+
+# outcome of solving a single answer word offline
+class SolveRecord:
+
+    def to_dict(self):
+        return {
+            "answer": self.answer,
+            "solved": self.solved,
+            "guesses": self.guesses,
+            "latency_ms": self.latency_ms,
+        }
+
+    def __init__(self, answer, solved, guesses, latency_ms):
+        self.answer = answer
+        self.solved = solved
+        self.guesses = guesses
+        self.latency_ms = latency_ms
+
+
+# solves answers in the current process against a simulated feedback oracle
+class OfflineSolver:
+
+    def solve_one(self, answer):
+        browser_wrapper = SimulatedBrowserWrapper(answer)
+        solver = WordleSolver(None, browser_wrapper, self.util, self.feedback_matrix, self.strategy,
+                              self.opening_book, self.word_index, self.guess_mode)
+
+        start = time.perf_counter()
+        solved, _ = solver.solve()
+        latency_ms = self.util.ms_from_secs(time.perf_counter() - start)
+        return SolveRecord(answer, solved, len(browser_wrapper.guesses), latency_ms)
+
+    def run(self, answers):
+        return [self.solve_one(answer) for answer in answers]
+
+    def load_tree(self, tree_path):
+        tree = DecisionTree(self.word_index.words, tree_path, self.guess_mode)
+        if not tree.load():
+            raise ValueError(f"no decision tree for this word list at {tree_path}")
+        return tree
+
+    # a caller that already holds the word index, matrix, strategy or book, like a warm solver
+    # service dictionary, passes them in rather than having them loaded again
+    def __init__(self, strategy_name, use_book=True, words=None, cache_dir=CACHE_DIR, guess_mode="candidates",
+                 tree_path=None, word_list=None, word_index=None, feedback_matrix=None, strategy=None,
+                 opening_book=None):
+        self.util = Util()
+        self.guess_mode = guess_mode
+        # the dictionary the letter statistics come from, and the answers unless words are given
+        self.word_list = word_list if word_list is not None else load_word_list()
+        if word_index is not None:
+            self.word_index = word_index
+        else:
+            self.word_index = WordIndex(words) if words is not None else self.word_list.word_index()
+        words = self.word_index.words
+        self.feedback_matrix = feedback_matrix if feedback_matrix is not None else FeedbackMatrix(words, cache_dir)
+        if strategy is None:
+            strategy = get_strategy(strategy_name, self.feedback_matrix, self.word_index, self.word_list)
+        self.strategy = strategy
+
+        # a decision tree answers every turn it covers the way the opening book answers the first two
+        if tree_path is not None:
+            self.opening_book = self.load_tree(tree_path)
+        elif opening_book is not None:
+            self.opening_book = opening_book
+        elif use_book:
+            self.opening_book = load_opening_book(self.strategy, self.feedback_matrix, cache_dir, guess_mode,
+                                                  self.word_index)
+        else:
+            self.opening_book = None
+
+
+# workers load the dictionary from its memory mapped index, and the feedback matrix and
+# opening book the parent already wrote to disk, so only names and options are sent over
+def init_worker(strategy_name, use_book, words, cache_dir, guess_mode, tree_path, dictionary):
+    global _worker_solver
+    _worker_solver = OfflineSolver(strategy_name, use_book, words, cache_dir, guess_mode, tree_path,
+                                   load_dictionary(dictionary))
+
+
+def solve_answer(answer):
+    return _worker_solver.solve_one(answer)
+
+
+# fans offline games out over a process pool, results come back in answer order
+class BatchSolver:
+
+    def chunk_size(self, answer_count):
+        return max(1, math.ceil(answer_count / (self.processes * CHUNKS_PER_PROCESS)))
+
+    def solve_all(self, answers):
+        answers = list(answers)
+        if self.processes == 1:
+            return OfflineSolver(self.strategy_name, self.use_book, self.words, self.cache_dir, self.guess_mode,
+                                 self.tree_path, self.word_list).run(answers)
+
+        # build the matrix and book once up front so workers never race to create them
+        OfflineSolver(self.strategy_name, self.use_book, self.words, self.cache_dir, self.guess_mode, self.tree_path,
+                      self.word_list)
+
+        initargs = (self.strategy_name, self.use_book, self.words, self.cache_dir, self.guess_mode, self.tree_path,
+                    self.dictionary)
+        self.logger.info(f"solving {len(answers)} answers on {self.processes} processes")
+        with multiprocessing.Pool(self.processes, initializer=init_worker, initargs=initargs) as pool:
+            return list(pool.imap(solve_answer, answers, chunksize=self.chunk_size(len(answers))))
+
+    def __init__(self, strategy_name, processes=None, use_book=True, words=None, cache_dir=CACHE_DIR,
+                 guess_mode="candidates", tree_path=None, dictionary=DEFAULT_DICTIONARY):
+        self.logger = logging.getLogger("batch")
+        self.guess_mode = guess_mode
+        self.tree_path = tree_path
+        self.strategy_name = strategy_name
+        self.processes = processes or multiprocessing.cpu_count()
+        self.use_book = use_book
+        self.dictionary = dictionary
+        self.word_list = load_dictionary(dictionary)
+        # words to solve against in place of the dictionary's own, None for the whole dictionary
+        self.words = sorted(words) if words is not None else None
+        self.cache_dir = cache_dir
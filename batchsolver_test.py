@@ -0,0 +1,42 @@
+import pytest
+
+from batchsolver import BatchSolver, OfflineSolver
+from constraints import Constraints
+from feedback import get_feedback
+from simulatedbrowser import SimulatedBrowserWrapper
+from wordlesolver import WordleSolver
+
+
+class TestBatchSolver:
+
+    def test_pool_matches_serial_in_order(self, small_words, tmp_path):
+        answers = list(reversed(small_words))
+        serial = BatchSolver("entropy", processes=1, words=small_words, cache_dir=str(tmp_path)).solve_all(answers)
+        pooled = BatchSolver("entropy", processes=2, words=small_words, cache_dir=str(tmp_path)).solve_all(answers)
+
+        assert [r.answer for r in pooled] == answers
+        assert [(r.solved, r.guesses) for r in pooled] == [(r.solved, r.guesses) for r in serial]
+        assert all(r.solved for r in pooled)
+
+    @pytest.mark.parametrize("strategy_name", ["adaptive", "entropy"])
+    def test_hard_mode_guesses_use_every_hint(self, small_words, strategy_name, tmp_path):
+        offline_solver = OfflineSolver(strategy_name, use_book=False, words=small_words, cache_dir=str(tmp_path),
+                                       guess_mode="hard")
+        word_index = offline_solver.word_index
+        for answer in small_words:
+            browser_wrapper = SimulatedBrowserWrapper(answer)
+            solver = WordleSolver(None, browser_wrapper, offline_solver.util, offline_solver.feedback_matrix,
+                                  offline_solver.strategy, word_index=word_index, guess_mode="hard")
+            solved, _ = solver.solve()
+            assert solved
+
+            constraints = Constraints(5, word_index.alphabet)
+            for guess in browser_wrapper.guesses:
+                allowed = word_index.words_at(word_index.hard_mode_filter(constraints, word_index.all_indices()))
+                assert guess in allowed
+                constraints.apply(guess, get_feedback(guess, answer))
+
+    def test_full_list_probes_solve(self, small_words, tmp_path):
+        records = BatchSolver("entropy", processes=1, words=small_words, cache_dir=str(tmp_path),
+                              guess_mode="full").solve_all(small_words)
+        assert all(r.solved for r in records)
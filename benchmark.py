@@ -0,0 +1,195 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import time
+import timeit
+
+import numpy as np
+
+from batchsolver import BatchSolver
+from feedback import CACHE_DIR
+from strategy import STRATEGY_NAMES
+from util import atomic_write
+from wordlesolver import GUESS_MODES, MAX_ATTEMPTS
+from wordlist import DEFAULT_DICTIONARY, load_dictionary
+
+PERCENTILES = [50, 90, 99]
+
+# solve results are the same on every machine and are tracked with the code, timings are only
+# comparable on one machine so they live in the local cache
+BASELINE_FILE = f"{os.path.dirname(os.path.realpath(__file__))}/benchmark_baseline.json"
+TIMINGS_FILE = f"{CACHE_DIR}/benchmark_timings.json"
+
+# result fields that do not depend on the machine, every other field is a timing
+STATS_FIELDS = ["games", "mean_guesses", "win_rate", "distribution"]
+
+# how much worse than the baseline a result may be before it counts as a regression: a
+# fraction of the baseline time, mean guesses added and win rate lost
+TIME_TOLERANCE = 0.25
+GUESS_TOLERANCE = 0.01
+WIN_RATE_TOLERANCE = 0.002
+
+
+def percentiles(values):
+    if len(values) == 0:
+        return {f"p{p}": None for p in PERCENTILES}
+    return {f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+def summarize(records, wall_clock_s):
+    wins = [r for r in records if r.solved]
+    guesses = [r.guesses for r in wins]
+    latencies = [r.latency_ms for r in records]
+    distribution = {str(n): guesses.count(n) for n in range(1, MAX_ATTEMPTS + 1)}
+
+    return {
+        "games": len(records),
+        "wins": len(wins),
+        "win_rate": len(wins) / len(records) if records else 0.0,
+        "mean_guesses": float(np.mean(guesses)) if guesses else None,
+        "guesses": percentiles(guesses),
+        "distribution": distribution,
+        "failures": sorted(r.answer for r in records if not r.solved),
+        "wall_clock_s": wall_clock_s,
+        "latency_ms": {
+            "mean": float(np.mean(latencies)) if latencies else None,
+            "max": float(np.max(latencies)) if latencies else None,
+            **percentiles(latencies),
+        },
+    }
+
+
+# best seconds per call over several runs, the least disturbed run is the most repeatable. fast
+# calls are looped until a run takes at least 0.2 s so timer noise does not dominate
+def time_call(fn, repeat=5):
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(number=number, repeat=repeat)) / number
+
+
+def split_result(result):
+    stats = {k: v for k, v in result.items() if k in STATS_FIELDS}
+    timings = {k: v for k, v in result.items() if k not in STATS_FIELDS}
+    return stats, timings
+
+
+# named benchmark results compared against, and recorded into, a tracked json file of solve stats
+# and a local one of timings. a result with no baseline entry yet is recorded as the new
+# baseline, update replaces every entry
+class BenchmarkBaseline:
+
+    def regressions(self, name, result):
+        base = self.entries.get(name)
+        if base is None:
+            return []
+        found = []
+        if "seconds" in base and result.get("seconds", 0) > base["seconds"] * (1 + self.time_tolerance):
+            found.append(f"{name} took {result['seconds']:.6f} s, baseline {base['seconds']:.6f} s")
+        if "mean_guesses" in base and result.get("mean_guesses", 0) > base["mean_guesses"] + GUESS_TOLERANCE:
+            found.append(f"{name} mean guesses {result['mean_guesses']:.4f}, baseline {base['mean_guesses']:.4f}")
+        if "win_rate" in base and result.get("win_rate", 1) < base["win_rate"] - WIN_RATE_TOLERANCE:
+            found.append(f"{name} win rate {result['win_rate']:.4%}, baseline {base['win_rate']:.4%}")
+        return found
+
+    def check(self, name, result):
+        found = [] if self.update else self.regressions(name, result)
+        self.results[name] = result
+        for message in found:
+            self.logger.warning(f"regression: {message}")
+        return found
+
+    def load(self):
+        entries = {}
+        for path in [self.path, self.timings_path]:
+            if not os.path.exists(path):
+                continue
+            with open(path) as f:
+                for name, fields in json.load(f)["benchmarks"].items():
+                    entries.setdefault(name, {}).update(fields)
+        return entries
+
+    def write(self, path, baseline):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with atomic_write(path) as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+            f.write("\n")
+        self.logger.info(f"saved benchmark baseline to {path}")
+
+    def save(self):
+        entries = dict(self.entries)
+        for name, result in self.results.items():
+            if self.update or name not in entries:
+                entries[name] = result
+
+        stats, timings = {}, {}
+        for name, result in entries.items():
+            stats[name], timings[name] = split_result(result)
+        self.write(self.path, {"benchmarks": {name: fields for name, fields in stats.items() if fields}})
+        self.write(self.timings_path, {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "benchmarks": {name: fields for name, fields in timings.items() if fields},
+        })
+
+    def __init__(self, path=BASELINE_FILE, update=False, time_tolerance=TIME_TOLERANCE, timings_path=TIMINGS_FILE):
+        self.logger = logging.getLogger("benchmark")
+        self.path = path
+        self.timings_path = timings_path
+        self.update = update
+        self.time_tolerance = time_tolerance
+        self.entries = self.load()
+        self.results = {}
+
+
+# '-' for a stat with no games to take it from
+def format_stat(value, spec):
+    return "-" if value is None else f"{value:{spec}}"
+
+
+def print_report(summary):
+    print(f"games        {summary['games']}")
+    print(f"win rate     {summary['win_rate']:.2%} ({summary['wins']}/{summary['games']})")
+    print(f"mean guesses {format_stat(summary['mean_guesses'], '.4f')}")
+    print(f"guesses      " + "  ".join(f"{k} {format_stat(v, 'g')}" for k, v in summary["guesses"].items()))
+    print(f"distribution " + "  ".join(f"{k}:{v}" for k, v in summary["distribution"].items()))
+    print(f"wall clock   {summary['wall_clock_s']:.2f} s")
+    print(f"latency ms   " + "  ".join(f"{k} {format_stat(v, '.3f')}" for k, v in summary["latency_ms"].items()))
+    print(f"failures     {len(summary['failures'])}")
+    for word in summary["failures"]:
+        print(f"    {word}")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+
+    parser = argparse.ArgumentParser(description="solve every answer word offline and report stats")
+    parser.add_argument("--strategy", choices=STRATEGY_NAMES, default="frequency")
+    parser.add_argument("--guess-mode", choices=GUESS_MODES, default="candidates",
+                        help="guess from the candidates, hard mode words or the full list")
+    parser.add_argument("--dictionary", default=DEFAULT_DICTIONARY, help="solve a dictionary from dictionaries/")
+    parser.add_argument("--common", action="store_true", help="only use COMMON_WORDS as answers")
+    parser.add_argument("--limit", type=int, help="only solve the first N answers")
+    parser.add_argument("--no-book", action="store_true", help="do not use the opening book")
+    parser.add_argument("--tree", help="play from the decision tree at this path")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes, 0 for one per core")
+    parser.add_argument("--json", help="write the summary and per word records to this file")
+    args = parser.parse_args()
+
+    word_list = load_dictionary(args.dictionary)
+    answer_words = sorted(word_list.common_words if args.common else word_list.words)[:args.limit]
+    batch_solver = BatchSolver(args.strategy, processes=args.processes, use_book=not args.no_book,
+                               guess_mode=args.guess_mode, tree_path=args.tree, dictionary=args.dictionary)
+
+    start_time = time.perf_counter()
+    results = batch_solver.solve_all(answer_words)
+    report = summarize(results, time.perf_counter() - start_time)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w") as out:
+            records = [r.to_dict() for r in results]
+            json.dump({"strategy": args.strategy, "guess_mode": args.guess_mode, "dictionary": args.dictionary,
+                       "summary": report, "records": records}, out, indent=1)
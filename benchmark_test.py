@@ -0,0 +1,176 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pytest
+
+from batchsolver import BatchSolver
+from benchmark import BASELINE_FILE, TIME_TOLERANCE, TIMINGS_FILE, BenchmarkBaseline, print_report, summarize, time_call
+from constraints import Constraints
+from feedback import BLOCK_SIZE, FeedbackMatrix, compute_patterns, get_feedback
+from strategy import EntropyStrategy, FrequencyStrategy
+from util import Util
+from wordindex import encode_words
+from wordlist import WordList, load_word_list
+
+APP_DIR = os.path.dirname(os.path.realpath(__file__))
+
+# the suite solves the whole word list, RUN_BENCHMARKS=1 runs it and UPDATE_BENCHMARK_BASELINE=1
+# records the current results as the new baseline
+requires_benchmarks = pytest.mark.skipif(not Util().get_bool_from_env("RUN_BENCHMARKS", default=False),
+                                         reason="set RUN_BENCHMARKS=1 to run the benchmark suite")
+
+# a guess and answer whose feedback leaves a few hundred candidates
+OPENING_GUESS = "crane"
+SAMPLE_ANSWER = "moist"
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    util = Util()
+    benchmark_baseline = BenchmarkBaseline(
+        os.getenv("BENCHMARK_BASELINE", BASELINE_FILE),
+        update=util.get_bool_from_env("UPDATE_BENCHMARK_BASELINE", default=False),
+        time_tolerance=float(os.getenv("BENCHMARK_TIME_TOLERANCE", TIME_TOLERANCE)),
+        timings_path=os.getenv("BENCHMARK_TIMINGS", TIMINGS_FILE),
+    )
+    yield benchmark_baseline
+    benchmark_baseline.save()
+
+
+@pytest.fixture(scope="module")
+def word_list():
+    return load_word_list()
+
+
+@pytest.fixture(scope="module")
+def feedback_matrix(word_list):
+    return FeedbackMatrix(word_list.words)
+
+
+def assert_no_regression(baseline, name, result):
+    regressions = baseline.check(name, result)
+    assert not regressions, "; ".join(regressions)
+
+
+def after_opening(word_list, feedback_matrix):
+    letter_results = get_feedback(OPENING_GUESS, SAMPLE_ANSWER)
+    constraints = Constraints(word_list.word_length, word_list.alphabet)
+    constraints.apply(OPENING_GUESS, letter_results)
+    candidates = feedback_matrix.filter(OPENING_GUESS, letter_results, word_list.word_index().all_indices())
+    return constraints, letter_results, candidates
+
+
+class TestBenchmarkBaseline:
+
+    def test_regressions_are_flagged_against_the_baseline(self, tmp_path):
+        path, timings_path = str(tmp_path / "baseline.json"), str(tmp_path / "timings.json")
+        first = BenchmarkBaseline(path, timings_path=timings_path)
+        assert first.check("solve", {"seconds": 1.0, "mean_guesses": 4.0, "win_rate": 0.9}) == []
+        first.save()
+
+        second = BenchmarkBaseline(path, timings_path=timings_path)
+        assert second.check("solve", {"seconds": 1.1, "mean_guesses": 4.0, "win_rate": 0.9}) == []
+        assert len(second.check("solve", {"seconds": 2.0, "mean_guesses": 4.5, "win_rate": 0.8})) == 3
+        second.save()
+
+        assert BenchmarkBaseline(path, timings_path=timings_path).entries["solve"]["seconds"] == 1.0
+        BenchmarkBaseline(path, update=True, timings_path=timings_path).save()
+
+    # only machine independent results go in the tracked file
+    def test_timings_are_kept_apart_from_stats(self, tmp_path):
+        path, timings_path = str(tmp_path / "baseline.json"), str(tmp_path / "timings.json")
+        baseline = BenchmarkBaseline(path, timings_path=timings_path)
+        baseline.check("solve", {"seconds": 1.0, "mean_guesses": 4.0, "win_rate": 0.9})
+        baseline.check("filter", {"seconds": 0.5})
+        baseline.save()
+
+        with open(path) as f:
+            assert json.load(f) == {"benchmarks": {"solve": {"mean_guesses": 4.0, "win_rate": 0.9}}}
+        with open(timings_path) as f:
+            assert json.load(f)["benchmarks"] == {"solve": {"seconds": 1.0}, "filter": {"seconds": 0.5}}
+
+    def test_report_without_wins(self, capsys):
+        print_report(summarize([], 0.0))
+        assert "mean guesses -" in capsys.readouterr().out
+
+
+@requires_benchmarks
+class TestMicroBenchmarks:
+
+    def test_constraint_filter_full_list(self, baseline, word_list, feedback_matrix):
+        constraints, _, _ = after_opening(word_list, feedback_matrix)
+        word_index = word_list.word_index()
+        all_indices = word_index.all_indices()
+        seconds = time_call(lambda: word_index.filter(constraints, all_indices))
+        assert_no_regression(baseline, "filter.constraints", {"seconds": seconds})
+
+    def test_feedback_matrix_filter_full_list(self, baseline, word_list, feedback_matrix):
+        _, letter_results, _ = after_opening(word_list, feedback_matrix)
+        all_indices = word_list.word_index().all_indices()
+        seconds = time_call(lambda: feedback_matrix.filter(OPENING_GUESS, letter_results, all_indices))
+        assert_no_regression(baseline, "filter.feedback_matrix", {"seconds": seconds})
+
+    def test_get_commonality_full_list(self, baseline, word_list):
+        strategy = FrequencyStrategy(word_list)
+        seconds = time_call(lambda: [strategy.get_commonality(word, 4) for word in word_list.words])
+        assert_no_regression(baseline, "score.get_commonality", {"seconds": seconds})
+
+    def test_frequency_select_full_list(self, baseline, word_list):
+        strategy = FrequencyStrategy(word_list)
+        seconds = time_call(lambda: strategy.select(word_list.words, 4))
+        assert_no_regression(baseline, "score.frequency", {"seconds": seconds})
+
+    def test_entropy_select_after_opening(self, baseline, word_list, feedback_matrix):
+        _, _, candidates = after_opening(word_list, feedback_matrix)
+        possible_words = feedback_matrix.words_at(candidates)
+        strategy = EntropyStrategy(feedback_matrix)
+        seconds = time_call(lambda: strategy.select(possible_words, 1, word_list.words), repeat=3)
+        assert_no_regression(baseline, "score.entropy_probe", {"seconds": seconds})
+
+    def test_compute_patterns_block(self, baseline, word_list):
+        encoded = encode_words(word_list.words)
+        seconds = time_call(lambda: compute_patterns(encoded[:BLOCK_SIZE], encoded), repeat=3)
+        assert_no_regression(baseline, "feedback.compute_patterns", {"seconds": seconds})
+
+    def test_get_feedback_scalar(self, baseline, word_list):
+        pairs = list(zip(word_list.words[:1000], reversed(word_list.words[-1000:])))
+        seconds = time_call(lambda: [get_feedback(guess, answer) for guess, answer in pairs])
+        assert_no_regression(baseline, "feedback.get_feedback", {"seconds": seconds})
+
+    def test_word_list_load_from_index(self, baseline, word_list):
+        seconds = time_call(lambda: WordList(word_list.source_path), repeat=3)
+        assert_no_regression(baseline, "startup.word_list", {"seconds": seconds})
+
+    # a fresh interpreter importing the solver, the cost paid by every daily run before it solves
+    def test_import_time(self, baseline):
+        command = [sys.executable, "-c", "import wordlesolver"]
+        seconds = time_call(lambda: subprocess.run(command, cwd=APP_DIR, check=True))
+        assert_no_regression(baseline, "startup.import", {"seconds": seconds})
+
+
+@requires_benchmarks
+class TestMacroBenchmarks:
+
+    @pytest.mark.parametrize("strategy_name,common", [("frequency", False), ("entropy", True)])
+    def test_solve_stats(self, baseline, word_list, strategy_name, common):
+        answers = sorted(word_list.common_words) if common else word_list.words
+        batch_solver = BatchSolver(strategy_name, processes=1)
+
+        start = time.perf_counter()
+        summary = summarize(batch_solver.solve_all(answers), time.perf_counter() - start)
+
+        name = f"solve.{strategy_name}.{'common' if common else 'all'}"
+        result = {
+            "seconds": summary["wall_clock_s"],
+            "mean_guesses": summary["mean_guesses"],
+            "win_rate": summary["win_rate"],
+            "distribution": summary["distribution"],
+            "p99_latency_ms": summary["latency_ms"]["p99"],
+            "games": summary["games"],
+        }
+        assert np.isfinite(result["mean_guesses"])
+        assert_no_regression(baseline, name, result)
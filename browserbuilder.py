@@ -1,24 +1,37 @@
 import logging
 import os
-from pyvirtualdisplay.display import Display
-from selenium import webdriver
-from webdriver_manager.chrome import ChromeDriverManager
+from tracer import get_tracer
 
 IMPLICIT_WAIT_SECONDS = 5
 
+# chromedriver binary, resolved once per process and shared by every browser
+_driver_path = None
 
+
+def get_driver_path():
+    global _driver_path
+    if _driver_path is None:
+        from webdriver_manager.chrome import ChromeDriverManager
+        _driver_path = ChromeDriverManager().install()
+    return _driver_path
+
+
+# selenium, webdriver_manager and pyvirtualdisplay are loaded where a browser is launched,
+# so the wrapper and pool import without them and run against a passed in webdriver
 class BrowserBuilder:
 
     webdriver = None
 
     def setup_webdriver(self):
+        from selenium import webdriver
         self.logger.info('setting driver options')
         driver_options = webdriver.ChromeOptions()
         driver_options.add_argument("--incognito")
         self.logger.info('initializing driver')
-        return webdriver.Chrome(ChromeDriverManager().install(), options=driver_options)
+        return webdriver.Chrome(get_driver_path(), options=driver_options)
 
     def setup_headless_webdriver(self):
+        from selenium import webdriver
         self.logger.info('setting chrome options')
         driver_options = webdriver.ChromeOptions()
         driver_options.add_argument('--no-sandbox')
@@ -30,19 +43,32 @@ class BrowserBuilder:
         self.logger.info('initializing driver')
         return webdriver.Chrome(chrome_options=driver_options)
 
-    def __init__(self, in_container):
-        self.logger = logging.getLogger("builder")
+    def quit(self):
+        self.webdriver.quit()
+        if self.display is not None:
+            self.display.stop()
+
+    def launch(self, in_container, start_display):
         match in_container:
             case True:
-                self.logger.info('setting up virtual display')
-                self.display = Display(visible=False, size=(800, 600))
-                self.display.start()
-                self.logger.info('initialized virtual display')
+                if start_display:
+                    from pyvirtualdisplay.display import Display
+                    self.logger.info('setting up virtual display')
+                    self.display = Display(visible=False, size=(800, 600))
+                    self.display.start()
+                    self.logger.info('initialized virtual display')
                 self.logger.info('configuring browser')
                 self.webdriver = self.setup_headless_webdriver()
             case False:
                 self.logger.info('configuring browser')
                 self.webdriver = self.setup_webdriver()
+
+    # a pool shares one virtual display between its browsers and passes start_display=False
+    def __init__(self, in_container, start_display=True):
+        self.logger = logging.getLogger("builder")
+        self.display = None
+        with get_tracer().span("browser.launch", "browser", in_container=in_container):
+            self.launch(in_container, start_display)
         self.webdriver.implicitly_wait(IMPLICIT_WAIT_SECONDS)
         self.webdriver.set_window_size(650, 760)
         self.webdriver.set_window_position(0, 0)
@@ -0,0 +1,122 @@
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+
+from browserbuilder import BrowserBuilder, get_driver_path
+from browserwrapper import WORDLE_URL, BrowserWrapper
+
+DEFAULT_POOL_SIZE = 2
+
+# browsers are replaced after this many games to bound memory growth in chrome
+DEFAULT_MAX_GAMES = 50
+
+
+# a warm chrome session owned by a pool
+class PooledBrowser:
+
+    def __init__(self, browser_builder, browser_id):
+        self.browser_builder = browser_builder
+        self.webdriver = browser_builder.webdriver
+        self.browser_id = browser_id
+        self.games_played = 0
+
+
+# keeps warm chrome sessions alive and hands them to concurrent solve jobs, resetting
+# game state between uses and recycling sessions that fail a health check or get old
+class BrowserPool:
+
+    def create_browser(self):
+        with self.lock:
+            self.created += 1
+            browser_id = self.created
+        self.logger.info(f"starting pooled browser {browser_id}")
+        return PooledBrowser(BrowserBuilder(self.in_container, start_display=False), browser_id)
+
+    def is_healthy(self, browser):
+        try:
+            return browser.webdriver.execute_script("return document.readyState") is not None
+        except Exception as e:
+            self.logger.warning(f"pooled browser {browser.browser_id} failed health check: {e}")
+            return False
+
+    # wordle keeps the game in local storage, clear it so the next open starts a fresh board
+    def reset(self, browser):
+        browser.webdriver.delete_all_cookies()
+        browser.webdriver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+
+    def retire(self, browser):
+        self.logger.info(f"retiring pooled browser {browser.browser_id} after {browser.games_played} games")
+        try:
+            browser.browser_builder.quit()
+        except Exception as e:
+            self.logger.warning(f"failed to quit pooled browser {browser.browser_id}: {e}")
+
+    def acquire(self, timeout=None):
+        if self.closed:
+            raise RuntimeError("browser pool is closed")
+        browser = self.idle.get(timeout=timeout)
+        if not self.is_healthy(browser):
+            self.retire(browser)
+            browser = self.create_browser()
+        return browser
+
+    def release(self, browser):
+        browser.games_played += 1
+        if self.closed:
+            self.retire(browser)
+            return
+
+        if browser.games_played >= self.max_games or not self.is_healthy(browser):
+            self.retire(browser)
+            browser = self.create_browser()
+        else:
+            try:
+                self.reset(browser)
+            except Exception as e:
+                self.logger.warning(f"failed to reset pooled browser {browser.browser_id}: {e}")
+                self.retire(browser)
+                browser = self.create_browser()
+        self.idle.put(browser)
+
+    # a BrowserWrapper on a pooled browser, released back to the pool on exit
+    @contextmanager
+    def game(self, output_dir, util, event_waits=False, wordle_url=WORDLE_URL, timeout=None, artifact_writer=None):
+        browser = self.acquire(timeout)
+        try:
+            yield BrowserWrapper(self.in_container, output_dir, util, event_waits, wordle_url, browser.webdriver,
+                                 artifact_writer)
+        finally:
+            self.release(browser)
+
+    def close(self):
+        self.closed = True
+        while True:
+            try:
+                self.retire(self.idle.get_nowait())
+            except queue.Empty:
+                break
+        if self.display is not None:
+            self.display.stop()
+
+    def __init__(self, in_container, size=DEFAULT_POOL_SIZE, max_games=DEFAULT_MAX_GAMES):
+        self.logger = logging.getLogger("pool")
+        self.in_container = in_container
+        self.max_games = max_games
+        self.lock = threading.Lock()
+        self.idle = queue.Queue()
+        self.created = 0
+        self.closed = False
+
+        # one virtual display and one driver binary for every browser in the pool
+        self.display = None
+        if in_container:
+            from pyvirtualdisplay.display import Display
+            self.display = Display(visible=False, size=(800, 600))
+            self.display.start()
+        else:
+            get_driver_path()
+
+        for _ in range(size):
+            self.idle.put(self.create_browser())
+        self.logger.info(f"browser pool ready with {size} browsers")
@@ -0,0 +1,95 @@
+import pytest
+
+import browserpool
+from browserpool import BrowserPool
+
+
+# records the calls the pool makes, broken drivers fail every script like a crashed chrome
+class FakeDriver:
+
+    def execute_script(self, script):
+        if self.broken:
+            raise RuntimeError("chrome not reachable")
+        self.scripts.append(script)
+        return "complete"
+
+    def delete_all_cookies(self):
+        self.cookies_cleared += 1
+
+    def quit(self):
+        self.quit_called = True
+
+    def __init__(self):
+        self.broken = False
+        self.scripts = []
+        self.cookies_cleared = 0
+        self.quit_called = False
+
+
+class FakeBrowserBuilder:
+
+    def quit(self):
+        self.webdriver.quit()
+
+    def __init__(self, in_container, start_display=True):
+        self.webdriver = FakeDriver()
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(browserpool, "BrowserBuilder", FakeBrowserBuilder)
+    monkeypatch.setattr(browserpool, "get_driver_path", lambda: None)
+
+    def make_pool(size=1, max_games=2):
+        return BrowserPool(False, size, max_games)
+    return make_pool
+
+
+class TestBrowserPool:
+
+    def test_browsers_are_recycled_after_max_games(self, pool):
+        browser_pool = pool(size=1, max_games=2)
+
+        first = browser_pool.acquire()
+        browser_pool.release(first)
+        assert browser_pool.acquire() is first
+        browser_pool.release(first)
+
+        replacement = browser_pool.acquire()
+        assert first.webdriver.quit_called
+        assert replacement.browser_id == 2 and replacement.games_played == 0
+
+    def test_unhealthy_browser_is_replaced(self, pool):
+        browser_pool = pool(size=1, max_games=10)
+        browser = browser_pool.acquire()
+        browser_pool.release(browser)
+
+        browser.webdriver.broken = True
+        replacement = browser_pool.acquire()
+
+        assert replacement is not browser and browser.webdriver.quit_called
+        assert browser_pool.created == 2
+
+    def test_release_resets_game_state(self, pool):
+        browser_pool = pool(size=1, max_games=10)
+        browser = browser_pool.acquire()
+        browser_pool.release(browser)
+
+        assert browser.games_played == 1
+        assert browser.webdriver.cookies_cleared == 1
+        assert any("localStorage.clear()" in script for script in browser.webdriver.scripts)
+        assert browser_pool.acquire() is browser
+
+    def test_close_retires_idle_and_released_browsers(self, pool):
+        browser_pool = pool(size=2, max_games=10)
+        held = browser_pool.acquire()
+        idle = browser_pool.idle.queue[0]
+
+        browser_pool.close()
+        assert idle.webdriver.quit_called and not held.webdriver.quit_called
+        with pytest.raises(RuntimeError):
+            browser_pool.acquire()
+
+        browser_pool.release(held)
+        assert held.webdriver.quit_called
+        assert browser_pool.idle.empty()
@@ -1,87 +1,157 @@
 import logging
-from selenium.webdriver.common.by import By
-import pyperclip
-from pynput.keyboard import Key, Controller
+import threading
 import time
 from browserbuilder import BrowserBuilder
+from pagescripts import READ_BOARD_STATE, WAIT_FOR_ROW_SETTLED, WAIT_FOR_SHADOW_ELEMENT
 from result import Result
+from tracer import get_tracer
 
 MAX_WAIT_MS = 10000
 WAIT_DURATION_MS = 100
 WORDLE_URL = "https://www.nytimes.com/games/wordle/index.html"
+STATS_SELECTOR = "#game > game-modal > game-stats"
+
+# w3c webdriver locator strategy and enter key code, what selenium's TAG_NAME and Keys.ENTER hold
+TAG_NAME = "tag name"
+ENTER_KEY = "\ue007"
+
+# the system clipboard is shared by every browser in the process
+CLIPBOARD_LOCK = threading.Lock()
 
 
 class BrowserWrapper:
 
-    def tile_is_idle(self, tile):
-        return tile.get_attribute("data-animation") == "idle"
+    # each poll is one READ_BOARD_STATE round trip, the row's last tile flips last
+    def last_tile_animation(self, attempt):
+        return self.read_board()[attempt]["tiles"][-1]["animation"]
+
+    def tile_is_idle(self, attempt):
+        return self.last_tile_animation(attempt) == "idle"
 
-    def tile_is_not_idle(self, tile):
-        return not self.tile_is_idle(tile)
+    def tile_is_not_idle(self, attempt):
+        return not self.tile_is_idle(attempt)
 
     def check_wait_iter(self, waited_ms, max_waited_ms):
         if waited_ms > max_waited_ms:
-            self.shoot_screen("timeout")
-            raise TimeoutError("timed out waiting for results")
+            self.timed_out()
+
+    def timed_out(self):
+        self.shoot_screen("timeout")
+        raise TimeoutError("timed out waiting for results")
+
+    # pooled browsers share one display, so they type through webdriver instead of the os keyboard
+    def type_word(self, word):
+        with get_tracer().span("browser.type", "browser", word=word):
+            if self.keyboard is None:
+                self.webdriver.switch_to.active_element.send_keys(word + ENTER_KEY)
+            else:
+                from pynput.keyboard import Key
+                self.keyboard.type(word)
+                self.keyboard.press(Key.enter)
 
     def submit_word(self, word, attempt):
-        self.keyboard.type(word)
-        self.keyboard.press(Key.enter)
+        self.type_word(word)
 
-        row = self.webdriver.execute_script('return arguments[0].shadowRoot', self.rows[attempt])
-        tiles = row.find_elements(By.CSS_SELECTOR, "game-tile")
-        last_tile = self.get_element_from_shadow_with_query(tiles[4], "div")
+        if self.event_waits:
+            board = self.wait_for_row_settled(attempt)
+        else:
+            waited_ms = self.wait_for_condition_end(self.tile_is_idle, attempt)
+            self.logger.info(f"waited {waited_ms}ms for tile animation to start")
 
-        waited_ms = self.wait_for_condition_end(self.tile_is_idle, last_tile)
-        self.logger.info(f"waited {waited_ms}ms for tile animation to start")
-
-        waited_ms = self.wait_for_condition_end(self.tile_is_not_idle, last_tile)
-        self.logger.info(f"waited {waited_ms}ms for tile animation to stop")
+            waited_ms = self.wait_for_condition_end(self.tile_is_not_idle, attempt)
+            self.logger.info(f"waited {waited_ms}ms for tile animation to stop")
+            board = self.read_board()
         self.shoot_screen(f"attempt_{attempt}")
 
-        letter_results = []
-        for tile in tiles:
-            res = [tile.get_attribute("evaluation")][0]
-            letter_results.append(Result[res.upper()])
+        return self.get_row_results(board, attempt)
+
+    # letters, evaluations and animation state of every row in a single round trip
+    def read_board(self):
+        with get_tracer().span("webdriver.read_board", "webdriver"):
+            return self.webdriver.execute_script(READ_BOARD_STATE)
 
-        return letter_results
+    def get_row_results(self, board, attempt):
+        return [Result[tile["evaluation"].upper()] for tile in board[attempt]["tiles"]]
 
     def wait_for_condition_end(self, condition, *args):
         elapsed_wait_ms = 0
 
         # wait for animation to start after submitting
-        while condition(*args) and elapsed_wait_ms < MAX_WAIT_MS:
-            self.wait(WAIT_DURATION_MS)
-            elapsed_wait_ms += WAIT_DURATION_MS
+        with get_tracer().span("browser.wait_animation", "wait", condition=condition.__name__):
+            while condition(*args) and elapsed_wait_ms < MAX_WAIT_MS:
+                self.wait(WAIT_DURATION_MS)
+                elapsed_wait_ms += WAIT_DURATION_MS
 
         self.check_wait_iter(elapsed_wait_ms, MAX_WAIT_MS)
         return elapsed_wait_ms
 
+    # blocks in a single async script until the row's tiles stop animating, then returns the board
+    def wait_for_row_settled(self, attempt):
+        with get_tracer().span("browser.wait_animation", "wait", attempt=attempt):
+            result = self.webdriver.execute_async_script(WAIT_FOR_ROW_SETTLED, attempt, MAX_WAIT_MS)
+        self.time_waiting_ms += result["waitedMs"]
+        if not result["settled"]:
+            self.timed_out()
+        self.logger.info(f"waited {result['waitedMs']}ms for tile animation to settle")
+        return result["board"]
+
+    # blocks in a single async script until the selector appears in the shadow root
+    def wait_for_shadow_element(self, shadow, query):
+        with get_tracer().span("browser.wait_element", "wait", query=query):
+            result = self.webdriver.execute_async_script(WAIT_FOR_SHADOW_ELEMENT, shadow, query, MAX_WAIT_MS)
+        self.time_waiting_ms += result["waitedMs"]
+        if not result["found"]:
+            self.timed_out()
+        self.logger.info(f"waited {result['waitedMs']}ms for {query}")
+
     def wait(self, ms):
         self.time_waiting_ms += ms
         time.sleep(self.util.secs_from_ms(ms))
 
+    # with an artifact writer the png is decoded and saved on its thread, only the capture blocks
     def shoot_screen(self, file_name):
-        self.webdriver.save_screenshot(f"{self.output_dir}/{file_name}.png")
+        if self.artifact_writer is None:
+            with get_tracer().span("browser.screenshot", "browser", file=file_name):
+                self.webdriver.save_screenshot(f"{self.output_dir}/{file_name}.png")
+            return
+
+        if not self.artifact_writer.should_capture(file_name):
+            return
+        with get_tracer().span("browser.screenshot", "browser", file=file_name):
+            data = self.capture_screenshot()
+        self.artifact_writer.submit_screenshot(file_name, data)
+
+    # a raw devtools capture skips webdriver's own screenshot handling, drivers without cdp fall back
+    def capture_screenshot(self):
+        try:
+            return self.webdriver.execute_cdp_cmd("Page.captureScreenshot", {"format": "png"})["data"]
+        except AttributeError:
+            return self.webdriver.get_screenshot_as_base64()
 
     def save_game_summary(self):
         # get a screenshot before stats appear
         self.shoot_screen("completed_game")
 
         # wait for game stats to appear
-        while self.get_element_from_shadow_with_query(self.game_app, "#game > game-modal > game-stats") is None:
-            self.wait(500)
+        if self.event_waits:
+            self.wait_for_shadow_element(self.game_app, STATS_SELECTOR)
+        else:
+            with get_tracer().span("browser.wait_element", "wait", query=STATS_SELECTOR):
+                while self.get_element_from_shadow_with_query(self.game_app, STATS_SELECTOR) is None:
+                    self.wait(500)
 
         # get a screenshot before stats appear
         self.shoot_screen("stats")
 
-        stats_panel = self.get_element_from_shadow_with_query(self.game_app, "#game > game-modal > game-stats")
+        stats_panel = self.get_element_from_shadow_with_query(self.game_app, STATS_SELECTOR)
         share_button = self.get_element_from_shadow_with_query(stats_panel, "#share-button")
-        share_button.click()
-        self.webdriver.find_element(By.TAG_NAME, 'html').click()
+        with CLIPBOARD_LOCK, get_tracer().span("browser.share", "browser"):
+            share_button.click()
+            self.webdriver.find_element(TAG_NAME, 'html').click()
 
-        # get text summary
-        game_summary = pyperclip.paste()
+            # get text summary
+            import pyperclip
+            game_summary = pyperclip.paste()
 
         # the linux chrome driver uses white squares instead of black
         # for absent letters, swap those out in game summary
@@ -94,40 +164,62 @@ class BrowserWrapper:
 
     def get_element_from_shadow_by_id(self, shadow, element_id):
         tpl = f"return arguments[0].shadowRoot.getElementById('{element_id}')"
-        return self.webdriver.execute_script(tpl, shadow)
+        with get_tracer().span("webdriver.execute_script", "webdriver", element_id=element_id):
+            return self.webdriver.execute_script(tpl, shadow)
 
     def get_element_from_shadow_with_query(self, shadow, query):
         tpl = f"return arguments[0].shadowRoot.querySelector('{query}')"
-        return self.webdriver.execute_script(tpl, shadow)
+        with get_tracer().span("webdriver.execute_script", "webdriver", query=query):
+            return self.webdriver.execute_script(tpl, shadow)
 
     def exit_handler(self):
         self.logger.info("shutting down webdriver")
         self.webdriver.close()
         self.logger.info("webdriver is shut down")
 
-    def __init__(self, in_container, output_dir, util):
-
-        self.time_waiting_ms = 0
-        self.logger = logging.getLogger("browser")
-        self.output_dir = output_dir
-        self.util = util
-
-        browser_builder = BrowserBuilder(in_container)
-        self.webdriver = browser_builder.webdriver
-
+    def open_game(self, wordle_url):
         self.logger.info('opening wordle url')
-        self.webdriver.get(WORDLE_URL)
+        with get_tracer().span("webdriver.get", "webdriver", url=wordle_url):
+            self.webdriver.get(wordle_url)
 
-        self.logger.info(f'accessed url: {WORDLE_URL}')
+        self.logger.info(f'accessed url: {wordle_url}')
         self.logger.info(f'page title: {self.webdriver.title}')
         self.shoot_screen("game_start")
 
         # close welcome screen
-        self.webdriver.find_element(By.TAG_NAME, 'html').click()
+        self.webdriver.find_element(TAG_NAME, 'html').click()
 
-        self.game_app = self.webdriver.find_element(By.TAG_NAME, 'game-app')
+        self.game_app = self.webdriver.find_element(TAG_NAME, 'game-app')
         self.game_board = self.get_element_from_shadow_by_id(self.game_app, "board")
-        self.rows = self.game_board.find_elements(By.TAG_NAME, 'game-row')
+        self.rows = self.game_board.find_elements(TAG_NAME, 'game-row')
+
+    # webdriver is passed in when the browser comes from a BrowserPool
+    def __init__(self, in_container, output_dir, util, event_waits=False, wordle_url=WORDLE_URL, webdriver=None,
+                 artifact_writer=None):
+
+        self.time_waiting_ms = 0
+
+        # wait on in-page mutation observers instead of polling on a sleep
+        self.event_waits = event_waits
+        self.logger = logging.getLogger("browser")
+        self.output_dir = output_dir
+        self.util = util
+
+        # screenshots are written synchronously when no writer is given
+        self.artifact_writer = artifact_writer
+
+        if webdriver is None:
+            browser_builder = BrowserBuilder(in_container)
+            self.webdriver = browser_builder.webdriver
+
+            # keyboard init needs to happen after creation of virtual display, pynput
+            # needs a display to import, so it is only loaded when the os keyboard is used
+            from pynput.keyboard import Controller
+            self.keyboard = Controller()
+        else:
+            self.webdriver = webdriver
+            self.keyboard = None
+        self.webdriver.set_script_timeout(util.secs_from_ms(MAX_WAIT_MS) + 1)
 
-        # keyboard init needs to happen after creation of virtual display
-        self.keyboard = Controller()
+        # the live game by default, or a local stand-in page for offline runs
+        self.open_game(wordle_url)
@@ -0,0 +1,126 @@
+import base64
+
+import pytest
+
+from artifactwriter import POLICY_FIRST_AND_LAST, ArtifactWriter
+from browserwrapper import ENTER_KEY, BrowserWrapper
+from pagescripts import READ_BOARD_STATE, WAIT_FOR_ROW_SETTLED
+from result import Result
+from util import Util
+
+
+# six rows that all show the same evaluations, as READ_BOARD_STATE returns them
+def board_with(evaluations, animation="idle"):
+    tiles = [{"letter": "", "evaluation": evaluation, "animation": animation} for evaluation in evaluations]
+    return [{"tiles": tiles} for _ in range(6)]
+
+
+class FakeElement:
+
+    def click(self):
+        self.clicks += 1
+
+    def send_keys(self, keys):
+        self.typed.append(keys)
+
+    def find_elements(self, by, value):
+        return [FakeElement() for _ in range(6)]
+
+    def __init__(self):
+        self.clicks = 0
+        self.typed = []
+
+
+class FakeSwitchTo:
+
+    def __init__(self):
+        self.active_element = FakeElement()
+
+
+# a chrome session on the game page, the board animations play back one per poll
+class FakeDriver:
+
+    title = "Wordle"
+
+    def get(self, url):
+        self.url = url
+
+    def set_script_timeout(self, seconds):
+        self.script_timeout = seconds
+
+    def find_element(self, by, value):
+        return self.elements.setdefault((by, value), FakeElement())
+
+    def execute_script(self, script, *args):
+        if script == READ_BOARD_STATE:
+            animation = self.animations.pop(0) if self.animations else "idle"
+            return board_with(self.evaluations, animation)
+        return FakeElement()
+
+    def execute_async_script(self, script, *args):
+        assert script == WAIT_FOR_ROW_SETTLED
+        return {"settled": True, "waitedMs": 250, "board": board_with(self.evaluations)}
+
+    def save_screenshot(self, path):
+        with open(path, "wb") as f:
+            f.write(b"png")
+        self.screenshots.append(path)
+
+    def __init__(self, evaluations):
+        self.evaluations = evaluations
+        self.animations = []
+        self.elements = {}
+        self.screenshots = []
+        self.switch_to = FakeSwitchTo()
+
+
+@pytest.fixture
+def driver():
+    return FakeDriver(["correct", "present", "absent", "absent", "correct"])
+
+
+class TestBrowserWrapper:
+
+    def test_open_game_takes_start_screenshot(self, driver, tmp_path):
+        BrowserWrapper(False, str(tmp_path), Util(), wordle_url="http://localhost/", webdriver=driver)
+
+        assert driver.url == "http://localhost/"
+        assert driver.screenshots == [f"{tmp_path}/game_start.png"]
+        assert driver.elements[("tag name", "html")].clicks == 1
+
+    def test_shoot_screen_writes_png(self, driver, tmp_path):
+        browser_wrapper = BrowserWrapper(False, str(tmp_path), Util(), webdriver=driver)
+        browser_wrapper.shoot_screen("timeout")
+
+        assert (tmp_path / "timeout.png").read_bytes() == b"png"
+
+    def test_submit_word_with_event_waits(self, driver, tmp_path):
+        browser_wrapper = BrowserWrapper(False, str(tmp_path), Util(), event_waits=True, webdriver=driver)
+        results = browser_wrapper.submit_word("crane", 0)
+
+        assert results == [Result.CORRECT, Result.PRESENT, Result.ABSENT, Result.ABSENT, Result.CORRECT]
+        assert driver.switch_to.active_element.typed == ["crane" + ENTER_KEY]
+        assert browser_wrapper.time_waiting_ms == 250
+        assert (tmp_path / "attempt_0.png").exists()
+
+    def test_submit_word_polls_until_tiles_settle(self, driver, tmp_path):
+        browser_wrapper = BrowserWrapper(False, str(tmp_path), Util(), webdriver=driver)
+        driver.animations = ["idle", "flip-in", "flip-out"]
+        results = browser_wrapper.submit_word("crane", 0)
+
+        assert results[0] == Result.CORRECT and results[-1] == Result.CORRECT
+        assert browser_wrapper.time_waiting_ms > 0
+        assert (tmp_path / "attempt_0.png").exists()
+
+    def test_shoot_screen_hands_capture_to_artifact_writer(self, driver, tmp_path):
+        driver.execute_cdp_cmd = lambda command, params: {"data": base64.b64encode(b"cdp png").decode("ascii")}
+        writer = ArtifactWriter(str(tmp_path), POLICY_FIRST_AND_LAST)
+        browser_wrapper = BrowserWrapper(False, str(tmp_path), Util(), event_waits=True, webdriver=driver,
+                                         artifact_writer=writer)
+        browser_wrapper.submit_word("crane", 0)
+        browser_wrapper.submit_word("crane", 1)
+        writer.close()
+
+        assert driver.screenshots == []
+        assert (tmp_path / "game_start.png").read_bytes() == b"cdp png"
+        assert (tmp_path / "attempt_0.png").exists() and not (tmp_path / "attempt_1.png").exists()
@@ -0,0 +1,17 @@
+import pytest
+
+from feedback import FeedbackMatrix
+
+# seven words one letter apart and three that split them, small enough to solve exhaustively
+SMALL_WORDS = ["batch", "catch", "hatch", "latch", "match", "patch", "watch", "blimp", "champ", "plumb"]
+
+
+@pytest.fixture
+def small_words():
+    return list(SMALL_WORDS)
+
+
+# the feedback matrix of small_words, cached in the test's tmp_path
+@pytest.fixture
+def small_matrix(small_words, tmp_path):
+    return FeedbackMatrix(small_words, cache_dir=str(tmp_path))
@@ -0,0 +1,62 @@
+import numpy as np
+
+from result import Result
+
+
+# everything revealed about the answer so far: a bit mask of the alphabet's allowed letters
+# per position, and bounds on how many times each letter occurs in the answer
+class Constraints:
+
+    def letter_bit(self, letter):
+        return 1 << self.letter_index[letter]
+
+    def counted_letters(self):
+        return np.flatnonzero((self.min_count > 0) | (self.max_count < self.word_length))
+
+    # a repeated letter marked absent caps its count at the number of times it was
+    # marked correct or present, otherwise those marks only raise the minimum
+    def apply(self, word, letter_results):
+        marked = {}
+        capped = set()
+        for idx, (letter, status) in enumerate(zip(word, letter_results)):
+            bit = self.letter_bit(letter)
+            match status:
+                case Result.CORRECT:
+                    self.allowed[idx] = bit
+                    self.correct[idx] = self.letter_index[letter]
+                    marked[letter] = marked.get(letter, 0) + 1
+                case Result.PRESENT:
+                    self.allowed[idx] &= ~bit
+                    marked[letter] = marked.get(letter, 0) + 1
+                case Result.ABSENT:
+                    self.allowed[idx] &= ~bit
+                    capped.add(letter)
+
+        for letter in set(word):
+            letter_idx = self.letter_index[letter]
+            count = marked.get(letter, 0)
+            self.min_count[letter_idx] = max(self.min_count[letter_idx], count)
+            if letter in capped:
+                self.max_count[letter_idx] = min(self.max_count[letter_idx], count)
+
+    def allows(self, word):
+        for letter, mask in zip(word, self.allowed):
+            if not self.letter_bit(letter) & mask:
+                return False
+        for letter_idx in self.counted_letters():
+            count = word.count(self.alphabet[letter_idx])
+            if not self.min_count[letter_idx] <= count <= self.max_count[letter_idx]:
+                return False
+        return True
+
+    # the alphabet must be the one the words filtered against were encoded with
+    def __init__(self, word_length, alphabet):
+        self.word_length = word_length
+        self.alphabet = alphabet
+        self.letter_index = {letter: idx for idx, letter in enumerate(alphabet)}
+        self.allowed = [(1 << len(alphabet)) - 1] * word_length
+        self.min_count = np.zeros(len(alphabet), dtype=np.uint8)
+        self.max_count = np.full(len(alphabet), word_length, dtype=np.uint8)
+
+        # letter index revealed as correct at each position, -1 where none has been
+        self.correct = np.full(word_length, -1, dtype=np.int8)
@@ -0,0 +1,53 @@
+import random
+import string
+
+import pytest
+
+from constraints import Constraints
+from feedback import get_feedback
+from wordindex import WordIndex
+from wordlist import load_word_list
+
+
+class TestConstraints:
+
+    @pytest.mark.parametrize("guess,answer", [
+        ("speed", "abide"),
+        ("eerie", "ready"),
+        ("geese", "elope"),
+        ("lolly", "hello"),
+        ("sassy", "essay"),
+    ])
+    def test_duplicate_letter_semantics(self, guess, answer):
+        constraints = Constraints(5, string.ascii_lowercase)
+        constraints.apply(guess, get_feedback(guess, answer))
+
+        assert constraints.allows(answer)
+        assert not constraints.allows(guess)
+
+    def test_filter_matches_feedback_consistency(self):
+        word_index = WordIndex(load_word_list().words)
+        rng = random.Random(7)
+
+        for _ in range(20):
+            answer = rng.choice(word_index.words)
+            constraints = Constraints(5, word_index.alphabet)
+            history = []
+            for guess in rng.sample(word_index.words, 2):
+                letter_results = get_feedback(guess, answer)
+                constraints.apply(guess, letter_results)
+                history.append((guess, letter_results))
+
+            remaining = word_index.words_at(word_index.filter(constraints, word_index.all_indices()))
+            expected = [w for w in word_index.words if all(get_feedback(g, w) == r for g, r in history)]
+            assert remaining == expected
+
+    def test_hard_mode_filter_keeps_words_using_every_hint(self):
+        word_index = WordIndex(load_word_list().words)
+        constraints = Constraints(5, word_index.alphabet)
+        constraints.apply("crane", get_feedback("crane", "caper"))
+
+        guesses = word_index.words_at(word_index.hard_mode_filter(constraints, word_index.all_indices()))
+        expected = [w for w in word_index.words if w[0] == "c" and "r" in w and "a" in w and "e" in w]
+        assert guesses == expected
+        assert "caper" in guesses and "crane" in guesses
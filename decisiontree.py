@@ -0,0 +1,372 @@
+import argparse
+import hashlib
+import json
+import logging
+import math
+import multiprocessing
+import os
+import resource
+import time
+
+import numpy as np
+
+from feedback import CACHE_DIR, FeedbackMatrix, word_list_digest
+from openingbook import history_key
+from strategy import EntropyStrategy, probe_order, top_k
+from util import atomic_write
+from wordlesolver import MAX_ATTEMPTS, OPEN_GUESS_MODES
+from wordlist import load_word_list
+
+# bump when the builder changes the trees it makes so stale trees are ignored
+TREE_VERSION = 2
+
+TREE_FILE = f"{CACHE_DIR}/decision_tree.json"
+
+# guesses expanded at each depth, deeper levels reuse the last width
+DEFAULT_BEAM = [8, 4, 2, 1]
+
+# guesses tried at a node whose beam found no subtree finishing within MAX_ATTEMPTS
+RESCUE_WIDTH = 32
+
+# where the builder draws guesses from
+TREE_GUESS_MODES = OPEN_GUESS_MODES
+
+# see batchsolver._worker_solver
+_worker_builder = None
+
+
+# canonical key for a sorted candidate subset, the same subset reached by different
+# guesses shares one memo entry
+def subset_key(candidates):
+    return hashlib.blake2b(candidates.tobytes(), digest_size=16).digest()
+
+
+# fewest total guesses a set of answers could take, one lucky guess and two for every other answer
+def lower_bound(count):
+    return 2 * count - 1
+
+
+def peak_memory_mb(who=resource.RUSAGE_SELF):
+    # ru_maxrss is reported in kilobytes on linux
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+# a guess and the subtree for each feedback pattern it can get, cost is the total number
+# of guesses needed to solve every answer below the node and height the most any one needs
+class TreeNode:
+
+    def __init__(self, guess, cost, children):
+        self.guess = guess
+        self.cost = cost
+        self.children = children
+        self.height = 1 + max((child.height for child in children.values()), default=0)
+
+
+# trees that finish within the remaining guesses win on total guesses, the rest on height
+def better(node, best, remaining):
+    if best is None:
+        return True
+    node_fits, best_fits = node.height <= remaining, best.height <= remaining
+    if node_fits != best_fits:
+        return node_fits
+    if node_fits:
+        return node.cost < best.cost
+    return (node.height, node.cost) < (best.height, best.cost)
+
+
+# searches for the guess tree with the fewest total guesses over an answer set that solves
+# every answer within MAX_ATTEMPTS, expanding only the best few guesses by entropy at each
+# node and abandoning a guess once its lower bound can no longer beat the best found so far
+class TreeBuilder:
+
+    def bound(self, best, depth):
+        if best is None or best.height > MAX_ATTEMPTS - depth:
+            return math.inf
+        return best.cost
+
+    def beam_width(self, depth):
+        return self.beam[min(depth, len(self.beam) - 1)]
+
+    def ranked_guesses(self, candidates, width):
+        guesses = candidates if self.guess_mode == "candidates" else probe_order(candidates, self.all_indices)
+        scores = self.scorer.guess_scores(guesses, candidates)
+        return guesses[top_k(scores, width)]
+
+    # (feedback code, sorted answers) groups for a guess, the solved group is left out
+    def partition(self, guess, candidates):
+        row = self.matrix[guess, candidates]
+        order = np.argsort(row, kind="stable")
+        codes, starts = np.unique(row[order], return_index=True)
+        groups = np.split(candidates[order], starts[1:])
+        return [(code, group) for code, group in zip(codes.tolist(), groups) if code != self.solved_code]
+
+    # rescue widens the search when the beam finds nothing that finishes in time, subtrees
+    # explored by a rescue do not rescue again so a hopeless subset is not retried at every depth
+    def solve(self, candidates, depth=0, rescue=True):
+        if len(candidates) == 1:
+            return TreeNode(int(candidates[0]), 1, {})
+        if len(candidates) == 2:
+            guess, other = int(candidates[0]), int(candidates[1])
+            return TreeNode(guess, 3, {int(self.matrix[guess, other]): TreeNode(other, 1, {})})
+
+        # the best subtree depends on how many guesses are left, so depth is part of the key
+        key = (subset_key(candidates), depth, rescue)
+        best = self.memo.get(key)
+        if best is not None:
+            self.memo_hits += 1
+            return best
+
+        # three or more answers take at least two guesses, with one left no rescue can help
+        width = self.beam_width(depth)
+        remaining = MAX_ATTEMPTS - depth
+        rescue = rescue and remaining >= 2
+        ranked = self.ranked_guesses(candidates, max(width, RESCUE_WIDTH) if rescue else width)
+        for rank, guess in enumerate(ranked):
+            if rank >= width and best is not None and best.height <= remaining:
+                break
+            node = self.expand(int(guess), candidates, depth, self.bound(best, depth), rescue and rank < width)
+            if node is not None and better(node, best, remaining):
+                best = node
+        self.memo[key] = best
+        return best
+
+    # the subtree under a guess, or None once it cannot beat the bound
+    def expand(self, guess, candidates, depth, bound, rescue=True):
+        groups = self.partition(guess, candidates)
+
+        # a probe that splits nothing would be asked again forever
+        if len(groups) == 1 and len(groups[0][1]) == len(candidates):
+            return None
+
+        cost = len(candidates) + sum(lower_bound(len(group)) for _, group in groups)
+        children = {}
+        for code, group in sorted(groups, key=lambda item: -len(item[1])):
+            if cost >= bound:
+                self.pruned += 1
+                return None
+            child = self.solve(group, depth + 1, rescue)
+            cost += child.cost - lower_bound(len(group))
+            children[code] = child
+        if cost >= bound:
+            self.pruned += 1
+            return None
+        return TreeNode(guess, cost, children)
+
+    # the best of a set of built guess nodes, given in rank order so ties keep the better ranked guess
+    def best_node(self, nodes, depth):
+        best = None
+        for node in nodes:
+            if better(node, best, MAX_ATTEMPTS - depth):
+                best = node
+        return best
+
+    # the top two levels of guesses are compared here while the subtrees under every second
+    # guess are built in parallel, each worker keeps its own memo
+    def build(self, answers, processes=1):
+        if processes == 1 or len(answers) <= 2:
+            return self.solve(answers)
+
+        root_guesses = [int(guess) for guess in self.ranked_guesses(answers, self.beam_width(0))]
+        root_groups = {guess: self.partition(guess, answers) for guess in root_guesses}
+
+        # second level subsets shared between root guesses are only built once
+        groups = {}
+        for guess in root_guesses:
+            for _, group in root_groups[guess]:
+                groups.setdefault(subset_key(group), group)
+
+        second = {}
+        jobs = []
+        for key, group in groups.items():
+            if len(group) <= 2:
+                second[key] = self.solve(group, 1)
+                continue
+            for rank, guess in enumerate(self.ranked_guesses(group, self.beam_width(1))):
+                jobs.append((key, rank, int(guess), len(group), self.partition(int(guess), group)))
+
+        # biggest subtrees first so a slow one does not start last
+        jobs.sort(key=lambda job: -job[3])
+        initargs = (self.words, self.cache_dir, self.beam, self.guess_mode)
+        ranked_nodes = {}
+        with multiprocessing.Pool(processes, initializer=init_worker, initargs=initargs) as pool:
+            for key, rank, node, counters in pool.imap_unordered(solve_subtrees, jobs):
+                ranked_nodes.setdefault(key, {})[rank] = node
+                self.add_counters(counters)
+
+        # a subset the beam could not finish in time is rescued here, in the parent
+        for key, ranked in ranked_nodes.items():
+            second[key] = self.best_node([ranked[rank] for rank in sorted(ranked)], 1)
+            if second[key].height > MAX_ATTEMPTS - 1:
+                second[key] = self.best_node([second[key], self.solve(groups[key], 1)], 1)
+
+        roots = []
+        for guess in root_guesses:
+            children = {code: second[subset_key(group)] for code, group in root_groups[guess]}
+            roots.append(TreeNode(guess, len(answers) + sum(child.cost for child in children.values()), children))
+        return self.best_node(roots, 0)
+
+    def counters(self):
+        return {"memo_size": len(self.memo), "memo_hits": self.memo_hits, "pruned": self.pruned}
+
+    # worker counters are added to the parent's so stats cover the whole build
+    def add_counters(self, counters):
+        self.worker_memo_size += counters["memo_size"]
+        self.memo_hits += counters["memo_hits"]
+        self.pruned += counters["pruned"]
+
+    def __init__(self, feedback_matrix, beam=DEFAULT_BEAM, guess_mode="candidates"):
+        self.feedback_matrix = feedback_matrix
+        self.words = feedback_matrix.words
+        self.cache_dir = feedback_matrix.cache_dir
+        self.matrix = feedback_matrix.matrix
+        self.solved_code = feedback_matrix.solved_code
+        self.all_indices = np.arange(len(self.words))
+        self.scorer = EntropyStrategy(feedback_matrix)
+        self.beam = beam
+        self.guess_mode = guess_mode
+
+        # best subtree for every candidate subset solved so far, keyed by subset_key
+        self.memo = {}
+        self.memo_hits = 0
+        self.pruned = 0
+        self.worker_memo_size = 0
+
+
+# workers memory map the feedback matrix the parent already saved
+def init_worker(words, cache_dir, beam, guess_mode):
+    global _worker_builder
+    _worker_builder = TreeBuilder(FeedbackMatrix(words, cache_dir), beam, guess_mode)
+
+
+# the node for one second level guess, counters are returned as the change made by this
+# job since workers run many jobs
+def solve_subtrees(job):
+    key, rank, guess, answer_count, groups = job
+    before = _worker_builder.counters()
+    children = {code: _worker_builder.solve(group, 2) for code, group in groups}
+    cost = answer_count + sum(child.cost for child in children.values())
+    after = _worker_builder.counters()
+    return key, rank, TreeNode(guess, cost, children), {name: after[name] - before[name] for name in after}
+
+
+# a built guess tree flattened to the guess for every history it reaches, so playing from it
+# is one dict lookup per turn, histories off the tree return None
+class DecisionTree:
+
+    def lookup(self, history):
+        return self.entries.get(history_key(history))
+
+    def add_entries(self, node, history, words):
+        word = words[node.guess]
+        self.entries[history_key(history)] = word
+        for code, child in node.children.items():
+            self.add_entries(child, history + [(word, code)], words)
+
+    # the guess number each answer is solved on, probe guesses that are not answers are skipped
+    def solve_depths(self, node, answers, depth=1):
+        if node.guess in answers:
+            yield depth
+        for child in node.children.values():
+            yield from self.solve_depths(child, answers, depth + 1)
+
+    def set_tree(self, root, words, answers):
+        self.entries = {}
+        self.add_entries(root, [], words)
+        depths = list(self.solve_depths(root, set(answers.tolist())))
+        self.stats.update({
+            "answers": len(answers),
+            "total_guesses": root.cost,
+            "mean_guesses": root.cost / len(answers),
+            "max_depth": max(depths),
+            "over_max_attempts": sum(depth > MAX_ATTEMPTS for depth in depths),
+            "entries": len(self.entries),
+        })
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.realpath(self.path)), exist_ok=True)
+        tree = {
+            "version": TREE_VERSION,
+            "words_digest": self.words_digest,
+            "guess_mode": self.guess_mode,
+            "stats": self.stats,
+            "entries": self.entries,
+        }
+        with atomic_write(self.path) as f:
+            json.dump(tree, f, sort_keys=True)
+        self.logger.info(f"saved decision tree to {self.path}")
+
+    def load(self):
+        if not os.path.exists(self.path):
+            self.logger.info(f"no decision tree at {self.path}")
+            return False
+
+        with open(self.path) as f:
+            tree = json.load(f)
+
+        if tree["version"] != TREE_VERSION or tree["words_digest"] != self.words_digest:
+            self.logger.warning(f"ignoring stale decision tree {self.path}")
+            return False
+
+        # a tree plays the probes of the mode it was built for, which hard mode may not allow
+        if tree["guess_mode"] != self.guess_mode:
+            self.logger.warning(f"ignoring {tree['guess_mode']} decision tree {self.path} in {self.guess_mode} mode")
+            return False
+
+        self.entries = tree["entries"]
+        self.stats = tree["stats"]
+        return True
+
+    def __init__(self, words, path=TREE_FILE, guess_mode="candidates"):
+        self.logger = logging.getLogger("tree")
+        self.path = path
+        self.guess_mode = guess_mode
+        self.words_digest = word_list_digest(words)
+        self.entries = {}
+        self.stats = {}
+
+
+def build_decision_tree(words, answers, path=TREE_FILE, beam=DEFAULT_BEAM, guess_mode="candidates", processes=1,
+                        cache_dir=CACHE_DIR):
+    logger = logging.getLogger("tree")
+    feedback_matrix = FeedbackMatrix(words, cache_dir)
+    builder = TreeBuilder(feedback_matrix, beam, guess_mode)
+    answer_indices = np.sort(feedback_matrix.indices_of(answers))
+
+    logger.info(f"building decision tree over {len(answers)} answers with beam {beam}")
+    start = time.perf_counter()
+    root = builder.build(answer_indices, processes)
+    build_s = time.perf_counter() - start
+
+    tree = DecisionTree(feedback_matrix.words, path, guess_mode)
+    tree.stats = {
+        "build_s": build_s,
+        "peak_memory_mb": peak_memory_mb(),
+        "peak_worker_memory_mb": peak_memory_mb(resource.RUSAGE_CHILDREN),
+        "beam": list(beam),
+        "guess_mode": guess_mode,
+        "memo_size": len(builder.memo) + builder.worker_memo_size,
+        "memo_hits": builder.memo_hits,
+        "pruned": builder.pruned,
+    }
+    tree.set_tree(root, feedback_matrix.words, answer_indices)
+    return tree
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    parser = argparse.ArgumentParser(description="build a decision tree the solver can play from")
+    parser.add_argument("--common", action="store_true", help="only use COMMON_WORDS as answers")
+    parser.add_argument("--beam", type=int, nargs="+", default=DEFAULT_BEAM, help="guesses expanded per depth")
+    parser.add_argument("--guess-mode", choices=TREE_GUESS_MODES, default="candidates")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes, 0 for one per core")
+    parser.add_argument("--output", default=TREE_FILE)
+    args = parser.parse_args()
+
+    word_list = load_word_list()
+    answer_words = sorted(word_list.common_words) if args.common else word_list.words
+    decision_tree = build_decision_tree(word_list.words, answer_words, args.output, args.beam, args.guess_mode,
+                                        args.processes or multiprocessing.cpu_count())
+    decision_tree.save()
+    for name, value in decision_tree.stats.items():
+        print(f"{name:<22} {value}")
@@ -0,0 +1,57 @@
+import numpy as np
+
+from batchsolver import BatchSolver
+from decisiontree import DecisionTree, TreeBuilder, build_decision_tree
+
+
+class TestDecisionTree:
+
+    def play(self, tree, feedback_matrix, answer):
+        history = []
+        while True:
+            guess = tree.lookup(history)
+            if guess == answer:
+                return len(history) + 1
+            history.append((guess, feedback_matrix.pattern(guess, answer)))
+
+    def test_tree_solves_every_answer(self, small_words, small_matrix, tmp_path):
+        tree = build_decision_tree(small_words, small_words, str(tmp_path / "tree.json"), cache_dir=str(tmp_path))
+
+        guesses = [self.play(tree, small_matrix, answer) for answer in small_words]
+        assert sum(guesses) == tree.stats["total_guesses"]
+        assert max(guesses) == tree.stats["max_depth"]
+        assert tree.stats["build_s"] > 0 and tree.stats["peak_memory_mb"] > 0
+
+    def test_parallel_build_matches_serial(self, small_words, tmp_path):
+        serial = build_decision_tree(small_words, small_words, cache_dir=str(tmp_path))
+        parallel = build_decision_tree(small_words, small_words, processes=2, cache_dir=str(tmp_path))
+
+        assert parallel.entries == serial.entries
+
+    def test_solver_plays_from_saved_tree(self, small_words, tmp_path):
+        path = str(tmp_path / "tree.json")
+        built = build_decision_tree(small_words, small_words, path, cache_dir=str(tmp_path))
+        built.save()
+
+        loaded = DecisionTree(small_words, path)
+        assert loaded.load()
+        assert loaded.entries == built.entries
+        assert not DecisionTree(small_words[1:], path).load()
+        assert not DecisionTree(small_words, path, "hard").load()
+
+        records = BatchSolver("frequency", processes=1, words=small_words, cache_dir=str(tmp_path),
+                              tree_path=path).solve_all(small_words)
+        assert sum(r.guesses for r in records) == built.stats["total_guesses"]
+
+    def test_rescue_when_beam_guesses_split_nothing(self, small_matrix):
+        builder = TreeBuilder(small_matrix, beam=[1], guess_mode="full")
+        candidates = small_matrix.indices_of(["catch", "hatch", "watch"])
+
+        # batch gets the same feedback from every candidate, so the only beam guess is useless
+        probe = small_matrix.index_of("batch")
+        assert len(set(small_matrix.matrix[probe, candidates].tolist())) == 1
+        builder.ranked_guesses = lambda guesses, width: np.concatenate([[probe], candidates])
+
+        node = builder.solve(candidates)
+        assert small_matrix.words[node.guess] in ["catch", "hatch", "watch"]
+        assert node.height <= 3
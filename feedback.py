@@ -0,0 +1,162 @@
+import hashlib
+import logging
+import os
+
+import numpy as np
+
+from result import Result
+from util import atomic_write
+from wordindex import SortedWords, encode_words
+
+CACHE_DIR = f"{os.path.dirname(os.path.realpath(__file__))}/cache"
+
+# feedback for a single letter is a base 3 digit, a guess pattern is the
+# sum of digit * 3 ** position so five letter patterns fit in a uint8
+DIGITS = {
+    Result.ABSENT: 0,
+    Result.PRESENT: 1,
+    Result.CORRECT: 2,
+}
+RESULTS = {digit: result for result, digit in DIGITS.items()}
+
+# number of guesses compared against every answer per vectorized block
+BLOCK_SIZE = 128
+
+
+# short content hash identifying a word list regardless of its ordering
+def word_list_digest(words):
+    return hashlib.sha1("\n".join(sorted(words)).encode("utf-8")).hexdigest()[:16]
+
+
+def pattern_powers(word_length):
+    return (3 ** np.arange(word_length)).astype(np.uint16)
+
+
+def encode_results(letter_results):
+    code = 0
+    for idx, status in enumerate(letter_results):
+        code += DIGITS[status] * 3 ** idx
+    return code
+
+
+def decode_pattern(code, word_length):
+    letter_results = []
+    for _ in range(word_length):
+        letter_results.append(RESULTS[code % 3])
+        code //= 3
+    return letter_results
+
+
+def pattern_count(word_length):
+    return 3 ** word_length
+
+
+# the smallest unsigned type holding every pattern, uint8 up to five letters and uint16 beyond
+def pattern_dtype(word_length):
+    return np.uint8 if pattern_count(word_length) <= 256 else np.uint16
+
+
+def solved_pattern(word_length):
+    return int(pattern_powers(word_length).sum() * 2)
+
+
+# the feedback wordle would show for a guess against an answer, a repeated
+# letter is only marked present as many times as it is unmatched in the answer
+def get_feedback(guess, answer):
+    letter_results = [Result.ABSENT] * len(guess)
+    unmatched = []
+    for idx, (g, a) in enumerate(zip(guess, answer)):
+        if g == a:
+            letter_results[idx] = Result.CORRECT
+        else:
+            unmatched.append(a)
+
+    for idx, g in enumerate(guess):
+        if letter_results[idx] != Result.CORRECT and g in unmatched:
+            letter_results[idx] = Result.PRESENT
+            unmatched.remove(g)
+    return letter_results
+
+
+# vectorized get_feedback for every (guess, answer) pair of two encoded word arrays
+def compute_patterns(guesses, answers):
+    word_length = guesses.shape[1]
+    powers = pattern_powers(word_length)
+
+    correct = guesses[:, None, :] == answers[None, :, :]
+    codes = (correct * powers).sum(axis=-1, dtype=np.uint16) * 2
+
+    # occurrences of every letter in each answer, shape (answers, alphabet)
+    alphabet_size = int(max(guesses.max(initial=0), answers.max(initial=0))) + 1
+    answer_counts = np.zeros((len(answers), alphabet_size), dtype=np.uint8)
+    for idx in range(word_length):
+        np.add.at(answer_counts, (np.arange(len(answers)), answers[:, idx]), 1)
+
+    for idx in range(word_length):
+        # occurrences of this guess letter in the answer, less those matched in place
+        # and those already claimed as present by an earlier occurrence in the guess
+        available = answer_counts[:, guesses[:, idx]].T.astype(np.int8)
+        for other in range(word_length):
+            repeated = guesses[:, other] == guesses[:, idx]
+            if not repeated.any():
+                continue
+            if other < idx:
+                available -= repeated[:, None]
+            else:
+                available -= repeated[:, None] & correct[:, :, other]
+        present = ~correct[:, :, idx] & (available > 0)
+        codes += present * powers[idx]
+
+    return codes.astype(pattern_dtype(word_length))
+
+
+# precomputed feedback pattern for every (guess, answer) pair of a word list, built once
+# and persisted to disk so later runs memory map it instead of recomputing
+class FeedbackMatrix(SortedWords):
+
+    def cache_path(self):
+        return f"{self.cache_dir}/feedback_{word_list_digest(self.words)}.npy"
+
+    def build(self):
+        self.logger.info(f"building feedback matrix for {len(self.words)} words")
+        encoded = encode_words(self.words)
+        matrix = np.empty((len(self.words), len(self.words)), dtype=pattern_dtype(self.word_length))
+        for start in range(0, len(self.words), BLOCK_SIZE):
+            end = start + BLOCK_SIZE
+            matrix[start:end] = compute_patterns(encoded[start:end], encoded)
+        return matrix
+
+    def save(self, matrix, path):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # a concurrent reader never maps a partial matrix
+        with atomic_write(path, "wb") as f:
+            np.save(f, matrix)
+        self.logger.info(f"saved feedback matrix to {path}")
+
+    def load(self):
+        path = self.cache_path()
+        if not os.path.exists(path):
+            self.save(self.build(), path)
+        self.logger.info(f"loading feedback matrix from {path}")
+        return np.load(path, mmap_mode="r")
+
+    def pattern(self, guess, answer):
+        return int(self.matrix[self.index[guess], self.index[answer]])
+
+    # remaining candidate indexes after guessing a word and receiving its feedback
+    def filter(self, guess, letter_results, candidates):
+        code = encode_results(letter_results)
+        row = self.matrix[self.index[guess]]
+        return candidates[row[candidates] == code]
+
+    def filter_words(self, guess, letter_results, words):
+        return self.words_at(self.filter(guess, letter_results, self.indices_of(words)))
+
+    def __init__(self, words, cache_dir=CACHE_DIR):
+        self.logger = logging.getLogger("feedback")
+        self.cache_dir = cache_dir
+        super().__init__(words)
+        self.solved_code = solved_pattern(self.word_length)
+        self.pattern_count = pattern_count(self.word_length)
+
+        self.matrix = self.load()
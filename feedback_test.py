@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from feedback import FeedbackMatrix, compute_patterns, decode_pattern, encode_results, get_feedback
+from result import Result
+from wordindex import encode_words
+
+WORD_LIST = ["abide", "cheek", "eerie", "elope", "geese", "lolly", "ready", "speed", "thorn", "vivid"]
+
+
+class TestFeedback:
+
+    @pytest.mark.parametrize("guess,answer,expected", [
+        ("speed", "abide", "AAPAP"),
+        ("eerie", "ready", "ACPAA"),
+        ("geese", "elope", "APAAC"),
+        ("lolly", "lolly", "CCCCC"),
+        ("thorn", "cheek", "ACAAA"),
+    ])
+    def test_get_feedback(self, guess, answer, expected):
+        statuses = {"C": Result.CORRECT, "P": Result.PRESENT, "A": Result.ABSENT}
+        assert get_feedback(guess, answer) == [statuses[s] for s in expected]
+
+    def test_vectorized_patterns_match_scalar(self):
+        codes = compute_patterns(encode_words(WORD_LIST), encode_words(WORD_LIST))
+        for i, guess in enumerate(WORD_LIST):
+            for j, answer in enumerate(WORD_LIST):
+                assert codes[i, j] == encode_results(get_feedback(guess, answer))
+
+    def test_eight_letter_patterns_use_uint16(self):
+        words = ["abundant", "bankrupt", "deadline", "eggshell", "nineteen"]
+        codes = compute_patterns(encode_words(words), encode_words(words))
+        assert codes.dtype == np.uint16
+        for i, guess in enumerate(words):
+            for j, answer in enumerate(words):
+                assert codes[i, j] == encode_results(get_feedback(guess, answer))
+
+    def test_decode_round_trip(self):
+        letter_results = get_feedback("eerie", "ready")
+        assert decode_pattern(encode_results(letter_results), 5) == letter_results
+
+    def test_matrix_is_persisted_and_memory_mapped(self, tmp_path):
+        FeedbackMatrix(WORD_LIST, cache_dir=str(tmp_path))
+        fm = FeedbackMatrix(reversed(WORD_LIST), cache_dir=str(tmp_path))
+
+        assert len(list(tmp_path.glob("feedback_*.npy"))) == 1
+        assert isinstance(fm.matrix, np.memmap)
+        assert fm.pattern("speed", "abide") == encode_results(get_feedback("speed", "abide"))
+
+    def test_filter_words(self, tmp_path):
+        fm = FeedbackMatrix(WORD_LIST, cache_dir=str(tmp_path))
+        remaining = fm.filter_words("speed", get_feedback("speed", "geese"), WORD_LIST)
+
+        assert "geese" in remaining
+        assert all(get_feedback("speed", word) == get_feedback("speed", "geese") for word in remaining)
@@ -1,6 +1,18 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
 from util import Util
 
+LOG_FILE = "wordle.log"
+JSON_LOG_FILE = "wordle.jsonl"
+
+# handlers shared by every CustomLogger, created by the first one
+_handlers = None
+_listener = None
+
 
 class ColorFormatter(logging.Formatter):
 
@@ -23,9 +35,12 @@ class ColorFormatter(logging.Formatter):
     }
 
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
-        return formatter.format(record)
+        return self.formatters[record.levelno].format(record)
+
+    # one formatter per level, built once instead of per record
+    def __init__(self):
+        logging.Formatter.__init__(self)
+        self.formatters = {level: logging.Formatter(log_fmt) for level, log_fmt in self.FORMATS.items()}
 
 
 class FileFormatter(logging.Formatter):
@@ -41,26 +56,79 @@ class FileFormatter(logging.Formatter):
     }
 
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
-        return formatter.format(record)
+        return self.formatters[record.levelno].format(record)
 
+    def __init__(self):
+        logging.Formatter.__init__(self)
+        self.formatters = {level: logging.Formatter(log_fmt) for level, log_fmt in self.FORMATS.items()}
 
-class CustomLogger(logging.Logger):
 
-    def __init__(self, name):
-        logging.Logger.__init__(self, name, logging.DEBUG)
+# one json object per line for log tooling, written next to the text log
+class JsonLinesFormatter(logging.Formatter):
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "logger": record.name,
+            "level": record.levelname,
+            "file": record.filename,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+# the console, text file and optional json lines handlers. with LOG_QUEUE on, loggers only
+# put records on a queue and a listener thread formats and writes them
+def get_handlers():
+    global _handlers, _listener
+    if _handlers is not None:
+        return _handlers
+
+    util = Util()
+    output_dir = util.get_output_directory()
+
+    console = logging.StreamHandler()
+    console.setFormatter(ColorFormatter())
+
+    # single process logging is thread safe, if we multiproc we'll need to change this
+    file_handler = logging.FileHandler(f"{output_dir}/{LOG_FILE}")
+    file_handler.setFormatter(FileFormatter())
+    sinks = [console, file_handler]
+
+    if util.get_bool_from_env("LOG_JSON", default=False):
+        json_handler = logging.FileHandler(f"{output_dir}/{JSON_LOG_FILE}")
+        json_handler.setFormatter(JsonLinesFormatter())
+        sinks.append(json_handler)
+
+    if util.get_bool_from_env("LOG_QUEUE", default=True):
+        log_queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(log_queue, *sinks, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+        _handlers = [logging.handlers.QueueHandler(log_queue)]
+    else:
+        _handlers = sinks
+    return _handlers
+
+
+# writes out anything still queued, safe to call more than once
+def stop_logging():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
-        console = logging.StreamHandler()
-        console.setFormatter(ColorFormatter())
-        self.addHandler(console)
 
-        util = Util()
-        output_dir = util.get_output_directory()
+class CustomLogger(logging.Logger):
+
+    # LOG_LEVEL=INFO or higher turns hot path debug calls into a level check
+    def __init__(self, name):
+        logging.Logger.__init__(self, name, os.getenv("LOG_LEVEL", "DEBUG").upper())
 
-        # single process logging is thread safe, if we multiproc we'll need to change this
-        file_handler = logging.FileHandler(f"{output_dir}/wordle.log")
-        file_handler.setFormatter(FileFormatter())
-        self.addHandler(file_handler)
+        for handler in get_handlers():
+            self.addHandler(handler)
 
         return
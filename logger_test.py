@@ -0,0 +1,29 @@
+import json
+import logging
+
+from logger import ColorFormatter, FileFormatter, JsonLinesFormatter
+
+
+def make_record(level, msg, *args):
+    return logging.LogRecord("solver", level, "wordlesolver.py", 42, msg, args, None)
+
+
+class TestLogger:
+
+    def test_file_formatter_matches_log_layout(self):
+        line = FileFormatter().format(make_record(logging.INFO, "results of %s", "CRANE"))
+        assert line.endswith("] [solver] [INFO] [wordlesolver.py:42] results of CRANE")
+
+    def test_color_formatter_reuses_level_formatters(self):
+        formatter = ColorFormatter()
+        formatters = dict(formatter.formatters)
+        formatter.format(make_record(logging.WARNING, "slow"))
+        assert formatter.formatters == formatters
+        assert ColorFormatter.yellow in formatter.format(make_record(logging.WARNING, "slow"))
+
+    def test_json_lines_formatter(self):
+        entry = json.loads(JsonLinesFormatter().format(make_record(logging.ERROR, "%d possible words", 3)))
+        assert entry["logger"] == "solver"
+        assert entry["level"] == "ERROR"
+        assert entry["line"] == 42
+        assert entry["message"] == "3 possible words"
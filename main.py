@@ -3,16 +3,30 @@ import os
 import traceback
 from pathlib import Path
 
-from browserwrapper import BrowserWrapper
-from logger import CustomLogger
+from artifactwriter import POLICY_ALL, ArtifactWriter
+from browserwrapper import WORDLE_URL, BrowserWrapper
+from decisiontree import DecisionTree
+from logger import CustomLogger, stop_logging
+from openingbook import OpeningBook
+from profiler import Profiler
 from socialsharer import SocialSharer
+from strategy import FrequencyStrategy
+from tracer import enable_tracing
 from util import Util
 from wordlesolver import WordleSolver
+from wordlist import load_word_list
 
 if __name__ == '__main__':
     util = Util()
     debug = util.get_bool_from_env("DEBUG")
     in_container = util.get_bool_from_env("RUNNING_IN_CONTAINER")
+    event_waits = util.get_bool_from_env("EVENT_WAITS", default=False)
+    wordle_url = os.getenv("WORDLE_URL", WORDLE_URL)
+    screenshot_policy = os.getenv("SCREENSHOT_POLICY", POLICY_ALL)
+    guess_mode = os.getenv("GUESS_MODE", "candidates")
+    tree_path = os.getenv("DECISION_TREE")
+    tracer = enable_tracing() if util.get_bool_from_env("TRACE", default=True) else None
+    profile_mode = util.get_profile_mode()
     app_dir = os.path.dirname(os.path.realpath(__file__))
 
     output_dir = util.get_output_directory()
@@ -23,13 +37,55 @@ if __name__ == '__main__':
     logger.info("initializing main")
     logger.info(f"output_dir: {output_dir}")
 
-    browser_wrapper = BrowserWrapper(in_container, output_dir, util)
-    solver = WordleSolver(output_dir, browser_wrapper, util)
-    social_sharer = SocialSharer(debug, output_dir)
-
+    profiler = None
+    artifact_writer = None
+    browser_wrapper = None
     try:
-        solved, time_to_solve_ms = solver.solve_wordle()
-        social_sharer.tweet_results(solved, time_to_solve_ms)
+        # a browser that fails to launch is logged and the trace still written, like any other failure
+        profiler = Profiler(profile_mode, output_dir)
+        artifact_writer = ArtifactWriter(output_dir, screenshot_policy)
+        with profiler.phase("browser"):
+            browser_wrapper = BrowserWrapper(in_container, output_dir, util, event_waits, wordle_url,
+                                             artifact_writer=artifact_writer)
+        with profiler.phase("startup"):
+            word_list = load_word_list()
+            strategy = FrequencyStrategy(word_list)
+
+            # a decision tree covers every turn, otherwise the strategy's prebuilt opening book
+            # answers the first two. loading either only reads json, no feedback matrix is needed
+            opening_book = None
+            if tree_path is not None:
+                opening_book = DecisionTree(word_list.words, tree_path, guess_mode)
+                if not opening_book.load():
+                    opening_book = None
+            if opening_book is None:
+                opening_book = OpeningBook(strategy.name, word_list.words, guess_mode=guess_mode)
+                if not opening_book.load():
+                    opening_book = None
+
+            solver = WordleSolver(output_dir, browser_wrapper, util, strategy=strategy, opening_book=opening_book,
+                                  guess_mode=guess_mode)
+            social_sharer = SocialSharer(debug, output_dir)
+
+        with profiler.phase("solve"):
+            solved, time_to_solve_ms = solver.solve_wordle()
+        with profiler.phase("share"):
+            social_sharer.tweet_results(solved, time_to_solve_ms)
     except Exception as e:
         logger.error(e)
         logger.error(traceback.format_exc())
+        # the page as it was when the run failed, if the browser is still there to show it
+        if browser_wrapper is not None:
+            try:
+                browser_wrapper.shoot_screen("error")
+            except Exception as screenshot_error:
+                logger.error(f"failed to capture error screenshot: {screenshot_error}")
+    finally:
+        if artifact_writer is not None:
+            artifact_writer.close()
+        if tracer is not None:
+            tracer.export(output_dir)
+            logger.info(f"wrote trace to {output_dir}")
+        if profiler is not None:
+            profiler.export()
+        stop_logging()
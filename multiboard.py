@@ -0,0 +1,244 @@
+import argparse
+import logging
+import random
+import time
+
+import numpy as np
+
+from feedback import CACHE_DIR, FeedbackMatrix, encode_results
+from openingbook import load_opening_book
+from simulatedbrowser import SimulatedMultiBoardWrapper
+from strategy import BLOCK_CELLS, AdaptiveStrategy, EntropyStrategy, probe_order, top_k
+from tracer import get_tracer
+from util import Util
+from wordindex import WordIndex
+from wordlesolver import MAX_ATTEMPTS, OPEN_GUESS_MODES
+from wordlist import load_word_list
+
+# guesses allowed by the common variants, dordle, quordle, octordle, sedecordle and duotrigordle
+BOARD_ATTEMPTS = {1: MAX_ATTEMPTS, 2: 7, 4: 9, 8: 13, 16: 21, 32: 37}
+
+# where guesses are drawn from, probing with any allowed word pays off far more with several
+# boards to split than with one
+MULTI_GUESS_MODES = OPEN_GUESS_MODES
+
+# guesses scored exactly each turn, picked from the pool by letter statistics over every board
+SHORTLIST_SIZE = 1024
+
+# information a guess is credited with for each board it is expected to solve outright
+SOLVE_BONUS = 1.0
+
+# boards with this many candidates or fewer always have them scored, whatever the shortlist says
+SMALL_BOARD = 8
+
+
+def attempts_for(boards):
+    return BOARD_ATTEMPTS.get(boards, boards + MAX_ATTEMPTS - 1)
+
+
+# picks the guess with the most information summed over the unsolved boards. the feedback of
+# each guess against every candidate of every board is gathered once, boards with the same
+# candidates are scored once and counted for each of them
+class MultiBoardStrategy:
+
+    name = "multiboard"
+
+    # identical candidate sets share a pattern histogram, every board starts on the same one
+    def group_boards(self, boards):
+        groups = {}
+        for candidates in boards:
+            key = candidates.tobytes()
+            if key in groups:
+                groups[key][1] += 1
+            else:
+                groups[key] = [candidates, 1]
+        return list(groups.values())
+
+    # the pool narrowed by letter statistics over the union of candidates, keeping the
+    # candidates of nearly solved boards so a guess that can finish one is always scored
+    def shortlist(self, pool, union, boards):
+        if len(pool) <= SHORTLIST_SIZE:
+            return pool
+        with self.letter_statistics.lock:
+            self.letter_statistics.update(union)
+            scores = self.letter_statistics.score(pool)
+        picks = pool[np.sort(top_k(scores, SHORTLIST_SIZE))]
+        small = [candidates for candidates in boards if len(candidates) <= SMALL_BOARD]
+        answers = np.unique(np.concatenate([picks[np.isin(picks, union)], *small]))
+        return probe_order(answers, picks) if len(answers) > 0 else picks
+
+    # (guesses, groups, patterns) histogram, one feedback lookup per guess and distinct candidate
+    # is shared by every group the candidate belongs to
+    def pattern_counts(self, guesses, groups):
+        columns = np.unique(np.concatenate([candidates for candidates, _ in groups]))
+        patterns = self.feedback_matrix.matrix[np.ix_(guesses, columns)]
+
+        positions = np.concatenate([np.searchsorted(columns, candidates) for candidates, _ in groups])
+        labels = np.concatenate([np.full(len(candidates), idx) for idx, (candidates, _) in enumerate(groups)])
+        pattern_count = self.feedback_matrix.pattern_count
+        bins = len(groups) * pattern_count
+        counts = np.empty((len(guesses), len(groups), pattern_count), dtype=np.int64)
+
+        block_size = max(1, BLOCK_CELLS // max(len(positions), bins))
+        for start in range(0, len(guesses), block_size):
+            block = patterns[start:start + block_size][:, positions].astype(np.int64)
+            # shift each guess and group into its own range of bins so one bincount covers the block
+            offsets = np.arange(len(block), dtype=np.int64)[:, None] * bins + labels * pattern_count
+            flat = np.bincount((block + offsets).ravel(), minlength=len(block) * bins)
+            counts[start:start + len(block)] = flat.reshape(len(block), len(groups), pattern_count)
+        return counts
+
+    # scores a block of guesses at a time, see EntropyStrategy.guess_scores
+    def guess_scores(self, guesses, groups):
+        cells = max(sum(len(candidates) for candidates, _ in groups), len(groups) * self.feedback_matrix.pattern_count)
+        block_size = max(1, BLOCK_CELLS // cells)
+        scores = np.empty(len(guesses))
+        for start in range(0, len(guesses), block_size):
+            block = guesses[start:start + block_size]
+            scores[start:start + len(block)] = self.score(self.pattern_counts(block, groups), groups)
+        return scores
+
+    # entropy of each group's split, weighted by the number of boards in the group
+    def score(self, counts, groups):
+        totals = np.array([len(candidates) for candidates, _ in groups])
+        weights = np.array([boards for _, boards in groups])
+        plogp = np.zeros(totals.max() + 1)
+        plogp[1:] = np.arange(1, totals.max() + 1) * np.log2(np.arange(1, totals.max() + 1))
+        entropies = np.log2(totals) - plogp[counts].sum(axis=2) / totals
+        # a guess solves a board outright when it lands on the solved pattern
+        solves = counts[:, :, self.feedback_matrix.solved_code] / totals
+        return entropies @ weights + SOLVE_BONUS * (solves @ weights)
+
+    # boards are the candidate indexes of every unsolved board. a board down to one word is
+    # finished first since that guess is free information for the others
+    def select(self, boards, attempt, guess_words=None):
+        for candidates in boards:
+            if len(candidates) == 1:
+                word = self.feedback_matrix.words_at(candidates)[0]
+                return word, [(word, 0.0)]
+
+        union = np.unique(np.concatenate(boards))
+        pool = union
+        if guess_words is not None:
+            pool = probe_order(union, self.feedback_matrix.indices_of(guess_words))
+        groups = self.group_boards(boards)
+        guesses = self.shortlist(pool, union, boards)
+        scores = self.guess_scores(guesses, groups)
+
+        # candidates come first in index order and top_k keeps it, so ties favour a possible answer
+        top = top_k(scores, 5)
+        top_candidates = list(zip(self.feedback_matrix.words_at(guesses[top]), scores[top].tolist()))
+        return top_candidates[0][0], top_candidates
+
+    def __init__(self, feedback_matrix, word_index=None):
+        self.feedback_matrix = feedback_matrix
+        self.word_index = word_index if word_index is not None else WordIndex(feedback_matrix.words)
+        self.letter_statistics = AdaptiveStrategy(self.word_index)
+
+
+# plays one guess at a time against several boards, tracking the candidates of each board
+class MultiBoardSolver:
+
+    def get_book_word(self, attempt):
+        if self.opening_book is None or attempt > 0:
+            return None
+        return self.opening_book.lookup(())
+
+    # candidates of every unsolved board after a guess, from a single row of the feedback matrix
+    def filter(self, word, board_results):
+        row = self.feedback_matrix.matrix[self.feedback_matrix.index_of(word)]
+        for board, letter_results in enumerate(board_results):
+            if self.solved_at[board] is not None or letter_results is None:
+                continue
+            code = encode_results(letter_results)
+            candidates = self.candidates[board]
+            self.candidates[board] = candidates[row[candidates] == code]
+            if code == self.feedback_matrix.solved_code:
+                self.solved_at[board] = len(self.guesses)
+
+    def solve(self):
+        all_indices = np.arange(len(self.feedback_matrix.words))
+        self.candidates = [all_indices] * self.boards
+        self.solved_at = [None] * self.boards
+        self.guesses = []
+        guess_words = self.feedback_matrix.words if self.guess_mode == "full" else None
+
+        for attempt_count in range(0, self.max_attempts):
+            unsolved = [board for board in range(self.boards) if self.solved_at[board] is None]
+            self.logger.info("beginning attempt %d/%d, %d boards left", attempt_count, self.max_attempts,
+                             len(unsolved))
+
+            with get_tracer().span("multiboard.score", "solver", attempt=attempt_count, boards=len(unsolved)):
+                word = self.get_book_word(attempt_count)
+                if word is None:
+                    word, _ = self.strategy.select([self.candidates[board] for board in unsolved], attempt_count,
+                                                   guess_words)
+            self.logger.info("%s is the most likely answer", word.upper())
+
+            board_results = self.browser_wrapper.submit_word(word, attempt_count)
+            self.guesses.append(word)
+            with get_tracer().span("multiboard.filter", "solver", boards=len(unsolved)):
+                self.filter(word, board_results)
+
+            if all(solved is not None for solved in self.solved_at):
+                return True
+        return False
+
+    def __init__(self, browser_wrapper, feedback_matrix, boards, strategy=None, opening_book=None,
+                 guess_mode="full", max_attempts=None):
+        self.logger = logging.getLogger("multiboard")
+        self.browser_wrapper = browser_wrapper
+        self.feedback_matrix = feedback_matrix
+        self.boards = boards
+
+        # guess selection across every board, defaults to summed entropy
+        self.strategy = strategy if strategy is not None else MultiBoardStrategy(feedback_matrix)
+
+        # the single board opening book, its first guess is as good for every board
+        self.opening_book = opening_book
+
+        if guess_mode not in MULTI_GUESS_MODES:
+            raise ValueError(f"unknown guess mode {guess_mode}")
+        self.guess_mode = guess_mode
+        self.max_attempts = max_attempts if max_attempts is not None else attempts_for(boards)
+
+        # per board candidate indexes and the guess count that solved it, set by solve
+        self.candidates = []
+        self.solved_at = []
+        self.guesses = []
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+
+    parser = argparse.ArgumentParser(description="solve random multi board games offline and report stats")
+    parser.add_argument("--boards", type=int, default=4)
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--guess-mode", choices=MULTI_GUESS_MODES, default="full")
+    parser.add_argument("--common", action="store_true", help="only draw answers from COMMON_WORDS")
+    parser.add_argument("--no-book", action="store_true", help="do not use the entropy opening book")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    word_list = load_word_list()
+    matrix = FeedbackMatrix(word_list.words, CACHE_DIR)
+    multi_strategy = MultiBoardStrategy(matrix, word_list.word_index())
+    book = None if args.no_book else load_opening_book(EntropyStrategy(matrix), matrix, CACHE_DIR)
+    answer_pool = sorted(word_list.common_words) if args.common else word_list.words
+    rng = random.Random(args.seed)
+    util = Util()
+
+    wins, total_guesses, total_ms = 0, 0, 0.0
+    for _ in range(args.games):
+        game = SimulatedMultiBoardWrapper(rng.sample(answer_pool, args.boards))
+        solver = MultiBoardSolver(game, matrix, args.boards, multi_strategy, book, args.guess_mode)
+        start_time = time.perf_counter()
+        won = solver.solve()
+        total_ms += util.ms_from_secs(time.perf_counter() - start_time)
+        wins += won
+        total_guesses += len(solver.guesses) if won else 0
+
+    print(f"boards       {args.boards} ({attempts_for(args.boards)} guesses)")
+    print(f"win rate     {wins / args.games:.2%} ({wins}/{args.games})")
+    print(f"mean guesses {total_guesses / wins:.3f}" if wins else "mean guesses -")
+    print(f"ms per game  {total_ms / args.games:.1f}")
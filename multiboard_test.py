@@ -0,0 +1,41 @@
+import numpy as np
+
+from multiboard import MultiBoardSolver, MultiBoardStrategy, attempts_for
+from simulatedbrowser import SimulatedMultiBoardWrapper
+from strategy import EntropyStrategy
+
+
+class TestMultiBoard:
+
+    def test_shared_counts_match_each_board(self, small_words, small_matrix):
+        strategy = MultiBoardStrategy(small_matrix)
+        boards = [np.array([0, 1, 2, 5]), np.array([3, 4, 6, 9]), np.array([0, 1, 2, 5])]
+        guesses = np.arange(len(small_words))
+
+        groups = strategy.group_boards(boards)
+        counts = strategy.pattern_counts(guesses, groups)
+
+        assert [boards for _, boards in groups] == [2, 1]
+        for idx, (candidates, _) in enumerate(groups):
+            expected = EntropyStrategy(small_matrix).pattern_counts(guesses, candidates)
+            assert (counts[:, idx] == expected).all()
+
+    def test_scores_in_blocks(self, small_words, small_matrix, monkeypatch):
+        strategy = MultiBoardStrategy(small_matrix)
+        groups = strategy.group_boards([np.array([0, 1, 2, 5]), np.array([3, 4, 6, 9])])
+        guesses = np.arange(len(small_words))
+        expected = strategy.score(strategy.pattern_counts(guesses, groups), groups)
+
+        monkeypatch.setattr("multiboard.BLOCK_CELLS", small_matrix.pattern_count * 2 * 3)
+        assert np.allclose(strategy.guess_scores(guesses, groups), expected)
+
+    def test_every_board_is_solved(self, small_matrix):
+        answers = ["watch", "blimp", "catch", "hatch"]
+        game = SimulatedMultiBoardWrapper(answers)
+
+        solver = MultiBoardSolver(game, small_matrix, len(answers))
+
+        assert solver.solve()
+        assert len(game.guesses) <= attempts_for(len(answers))
+        for answer, solved_at in zip(answers, solver.solved_at):
+            assert game.guesses[solved_at - 1] == answer
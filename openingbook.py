@@ -0,0 +1,135 @@
+import argparse
+import json
+import logging
+import os
+
+import numpy as np
+
+from constraints import Constraints
+from feedback import CACHE_DIR, FeedbackMatrix, decode_pattern, word_list_digest
+from strategy import STRATEGY_NAMES, get_strategy
+from util import atomic_write
+from wordindex import WordIndex
+from wordlesolver import GUESS_MODES
+from wordlist import load_word_list
+
+# bump when a strategy changes the guesses it makes so stale books are rebuilt
+BOOK_VERSION = 2
+
+# number of opening turns covered by the book
+BOOK_DEPTH = 2
+
+
+# key for a sequence of (guess, feedback code) pairs, the empty history is the first turn
+def history_key(history):
+    return "|".join(f"{word}:{code}" for word, code in history)
+
+
+# precomputed first and second guesses for a word list, strategy and guess mode, the first
+# guess never changes and the second only depends on the feedback to the first
+class OpeningBook:
+
+    def book_path(self):
+        return f"{self.cache_dir}/opening_book_{self.strategy_name}_{self.guess_mode}_{self.words_digest}.json"
+
+    # the guesses WordleSolver would offer the strategy for the same turn, None in candidates
+    # mode or once two or fewer candidates are left
+    def guess_words(self, word_index, candidates, history):
+        if self.guess_mode == "candidates" or len(candidates) <= 2:
+            return None
+        guess_pool = word_index.all_indices()
+        constraints = Constraints(word_index.word_length, word_index.alphabet)
+        for word, code in history:
+            guess_pool = guess_pool[guess_pool != word_index.index_of(word)]
+            constraints.apply(word, decode_pattern(code, word_index.word_length))
+        if self.guess_mode == "hard":
+            guess_pool = word_index.hard_mode_filter(constraints, guess_pool)
+        return word_index.words_at(guess_pool)
+
+    def lookup(self, history):
+        if len(history) >= BOOK_DEPTH:
+            return None
+        return self.entries.get(history_key(history))
+
+    def build(self, strategy, feedback_matrix, word_index=None):
+        self.logger.info(f"building {self.strategy_name} {self.guess_mode} opening book")
+        word_index = word_index if word_index is not None else WordIndex(feedback_matrix.words)
+        candidates = np.arange(len(feedback_matrix.words))
+        first_word, _ = strategy.select(feedback_matrix.words, 0, self.guess_words(word_index, candidates, []))
+        entries = {history_key([]): first_word}
+
+        row = feedback_matrix.matrix[feedback_matrix.index_of(first_word)]
+        for code in np.unique(row):
+            code = int(code)
+            if code == feedback_matrix.solved_code:
+                continue
+            remaining = candidates[row == code]
+            guess_words = self.guess_words(word_index, remaining, [(first_word, code)])
+            second_word, _ = strategy.select(feedback_matrix.words_at(remaining), 1, guess_words)
+            entries[history_key([(first_word, code)])] = second_word
+
+        self.entries = entries
+        self.logger.info(f"built opening book with {len(entries)} entries")
+
+    def save(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        book = {
+            "version": BOOK_VERSION,
+            "words_digest": self.words_digest,
+            "strategy": self.strategy_name,
+            "guess_mode": self.guess_mode,
+            "entries": self.entries,
+        }
+        with atomic_write(self.book_path()) as f:
+            json.dump(book, f, indent=1, sort_keys=True)
+        self.logger.info(f"saved opening book to {self.book_path()}")
+
+    def load(self):
+        path = self.book_path()
+        if not os.path.exists(path):
+            self.logger.info(f"no opening book at {path}")
+            return False
+
+        with open(path) as f:
+            book = json.load(f)
+
+        if (book["version"] != BOOK_VERSION or book["words_digest"] != self.words_digest
+                or book["guess_mode"] != self.guess_mode):
+            self.logger.warning(f"ignoring stale opening book {path}")
+            return False
+
+        self.entries = book["entries"]
+        return True
+
+    def __init__(self, strategy_name, words, cache_dir=CACHE_DIR, guess_mode="candidates"):
+        self.logger = logging.getLogger("book")
+        self.strategy_name = strategy_name
+        self.guess_mode = guess_mode
+        self.words_digest = word_list_digest(words)
+        self.cache_dir = cache_dir
+        self.entries = {}
+
+
+# loads the book for a strategy and guess mode, building and saving it first when missing or stale
+def load_opening_book(strategy, feedback_matrix, cache_dir=CACHE_DIR, guess_mode="candidates", word_index=None):
+    book = OpeningBook(strategy.name, feedback_matrix.words, cache_dir, guess_mode)
+    if not book.load():
+        book.build(strategy, feedback_matrix, word_index)
+        book.save()
+    return book
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    parser = argparse.ArgumentParser(description="(re)build the opening book for a strategy")
+    parser.add_argument("--strategy", choices=STRATEGY_NAMES, default="frequency")
+    parser.add_argument("--guess-mode", choices=GUESS_MODES, default="candidates")
+    args = parser.parse_args()
+
+    word_list = load_word_list()
+    matrix = FeedbackMatrix(word_list.words)
+    opening_book = OpeningBook(args.strategy, matrix.words, guess_mode=args.guess_mode)
+    opening_book.build(get_strategy(args.strategy, matrix, word_list.word_index(), word_list), matrix,
+                       word_list.word_index())
+    opening_book.save()
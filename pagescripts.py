@@ -0,0 +1,84 @@
+# javascript injected into the wordle page, async scripts receive the
+# selenium callback as their last argument
+
+# every row's letters, tile evaluations and tile animation state in one pass
+BOARD_STATE_FUNCTION = """
+function readBoard() {
+    const board = document.querySelector('game-app').shadowRoot.getElementById('board');
+    return Array.from(board.querySelectorAll('game-row')).map((row) => ({
+        letters: row.getAttribute('letters') || '',
+        tiles: Array.from(row.shadowRoot.querySelectorAll('game-tile')).map((tile) => {
+            const inner = tile.shadowRoot.querySelector('div');
+            return {
+                letter: tile.getAttribute('letter') || '',
+                evaluation: tile.getAttribute('evaluation'),
+                animation: inner === null ? null : inner.dataset.animation,
+            };
+        }),
+    }));
+}
+"""
+
+READ_BOARD_STATE = BOARD_STATE_FUNCTION + """
+return readBoard();
+"""
+
+# resolves with the board state once the last tile of a row has flipped and gone back to idle
+WAIT_FOR_ROW_SETTLED = BOARD_STATE_FUNCTION + """
+const [rowIndex, timeoutMs, done] = arguments;
+const start = performance.now();
+const board = document.querySelector('game-app').shadowRoot.getElementById('board');
+const row = board.querySelectorAll('game-row')[rowIndex];
+const tiles = row.shadowRoot.querySelectorAll('game-tile');
+const tile = tiles[tiles.length - 1];
+const inner = tile.shadowRoot.querySelector('div');
+let started = inner.dataset.animation !== 'idle';
+
+const observer = new MutationObserver(() => {
+    if (inner.dataset.animation !== 'idle') {
+        started = true;
+    } else if (started) {
+        finish(true);
+    }
+});
+const timer = setTimeout(() => finish(false), timeoutMs);
+
+function finish(settled) {
+    observer.disconnect();
+    clearTimeout(timer);
+    const waitedMs = Math.round(performance.now() - start);
+    done({settled: settled, waitedMs: waitedMs, board: settled ? readBoard() : null});
+}
+
+observer.observe(inner, {attributes: true, attributeFilter: ['data-animation']});
+
+// the flip can finish before this script runs on a fast page
+if (tile.hasAttribute('evaluation') && tile.hasAttribute('reveal') && inner.dataset.animation === 'idle') {
+    finish(true);
+}
+"""
+
+# resolves once the element matching a selector exists inside a shadow root
+WAIT_FOR_SHADOW_ELEMENT = """
+const [host, selector, timeoutMs, done] = arguments;
+const start = performance.now();
+const root = host.shadowRoot;
+
+const observer = new MutationObserver(() => {
+    if (root.querySelector(selector) !== null) {
+        finish(true);
+    }
+});
+const timer = setTimeout(() => finish(false), timeoutMs);
+
+function finish(found) {
+    observer.disconnect();
+    clearTimeout(timer);
+    done({found: found, waitedMs: Math.round(performance.now() - start)});
+}
+
+observer.observe(root, {childList: true, subtree: true});
+if (root.querySelector(selector) !== null) {
+    finish(true);
+}
+"""
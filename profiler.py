@@ -0,0 +1,168 @@
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+# off, deterministic cProfile of every call, or a low overhead stack sampler
+PROFILE_OFF = "off"
+PROFILE_CPROFILE = "cprofile"
+PROFILE_SAMPLE = "sample"
+PROFILE_MODES = [PROFILE_OFF, PROFILE_CPROFILE, PROFILE_SAMPLE]
+
+# seconds between stack samples
+SAMPLE_INTERVAL_S = 0.005
+
+# frames kept per allocation traceback and allocation sites listed per phase
+TRACEMALLOC_FRAMES = 8
+TOP_ALLOCATIONS = 20
+
+# functions listed in the text summary of a cProfile run
+TOP_FUNCTIONS = 40
+
+MEMORY_FILE = "profile_memory.json"
+
+
+# folded stack frame name, flamegraph.pl and speedscope split frames on ';'
+def frame_name(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+# samples the stack of one thread on a timer and counts each distinct stack, written out in
+# the collapsed format flamegraph tools read
+class SamplingProfiler:
+
+    def sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            stack.append(frame_name(frame))
+            frame = frame.f_back
+        if stack:
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def write_collapsed(self, path):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL_S):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="profile-sampler", daemon=True)
+
+
+# profiles named phases of a run into the output directory and tracks their memory with
+# tracemalloc. with the mode off every phase is a no-op and nothing is written
+class Profiler:
+
+    # runs the block under the selected profiler, a phase entered more than once gets a numbered file
+    @contextmanager
+    def phase(self, name):
+        if self.mode == PROFILE_OFF:
+            yield
+            return
+
+        self.counts[name] += 1
+        file_name = name if self.counts[name] == 1 else f"{name}_{self.counts[name]}"
+        self.logger.info(f"profiling {file_name} with {self.mode}")
+
+        tracemalloc.reset_peak()
+        start_memory, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            match self.mode:
+                case "cprofile":
+                    profile = cProfile.Profile()
+                    profile.enable()
+                    try:
+                        yield
+                    finally:
+                        profile.disable()
+                        self.write_pstats(profile, file_name)
+                case "sample":
+                    sampler = SamplingProfiler(threading.get_ident(), self.interval)
+                    sampler.start()
+                    try:
+                        yield
+                    finally:
+                        sampler.stop()
+                        sampler.write_collapsed(f"{self.output_dir}/profile_{file_name}.collapsed")
+                        self.samples[file_name] = sum(sampler.stacks.values())
+        finally:
+            self.record_memory(file_name, start_memory, time.perf_counter() - start)
+
+    # binary stats for snakeviz or gprof2dot and a readable summary next to them
+    def write_pstats(self, profile, file_name):
+        profile.dump_stats(f"{self.output_dir}/profile_{file_name}.pstats")
+        summary = io.StringIO()
+        pstats.Stats(profile, stream=summary).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_FUNCTIONS)
+        with open(f"{self.output_dir}/profile_{file_name}.txt", "w") as f:
+            f.write(summary.getvalue())
+
+    def record_memory(self, file_name, start_memory, duration_s):
+        current, peak = tracemalloc.get_traced_memory()
+        top = tracemalloc.take_snapshot().statistics("lineno")[:TOP_ALLOCATIONS]
+        self.memory[file_name] = {
+            "duration_s": duration_s,
+            "start_mb": start_memory / 2 ** 20,
+            "end_mb": current / 2 ** 20,
+            "peak_mb": peak / 2 ** 20,
+            # memory mapped word lists and matrices are invisible to tracemalloc, the resident
+            # high water mark of the whole process covers them. ru_maxrss is in kilobytes on linux
+            "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            "top_allocations": [
+                {"site": str(stat.traceback[0]), "size_kb": stat.size / 1024, "count": stat.count} for stat in top
+            ],
+        }
+        if file_name in self.samples:
+            self.memory[file_name]["samples"] = self.samples[file_name]
+        self.logger.info(f"{file_name} took {duration_s:.3f} s, peak traced memory {peak / 2 ** 20:.1f} MB")
+
+    # writes the memory summary of every phase and stops tracemalloc if this profiler started it
+    def export(self):
+        if self.mode == PROFILE_OFF:
+            return
+        with open(f"{self.output_dir}/{MEMORY_FILE}", "w") as f:
+            json.dump({"mode": self.mode, "phases": self.memory}, f, indent=1)
+        if self.started_tracemalloc:
+            tracemalloc.stop()
+            self.started_tracemalloc = False
+
+    def __init__(self, mode, output_dir, interval=SAMPLE_INTERVAL_S):
+        self.logger = logging.getLogger("profiler")
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"unknown profile mode {mode}, expected one of {PROFILE_MODES}")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.interval = interval
+        self.counts = Counter()
+        self.memory = {}
+        self.samples = {}
+
+        # tracing allocations slows every allocation down, so it only runs while profiling
+        self.started_tracemalloc = mode != PROFILE_OFF and not tracemalloc.is_tracing()
+        if self.started_tracemalloc:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
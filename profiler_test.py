@@ -0,0 +1,56 @@
+import json
+import pstats
+import time
+
+import pytest
+
+from profiler import MEMORY_FILE, Profiler
+
+
+def busy_work():
+    end = time.perf_counter() + 0.05
+    blocks = []
+    while time.perf_counter() < end:
+        blocks.append(bytearray(1024))
+    return len(blocks)
+
+
+class TestProfiler:
+
+    def test_off_writes_nothing(self, tmp_path):
+        profiler = Profiler("off", str(tmp_path))
+        with profiler.phase("solve"):
+            busy_work()
+        profiler.export()
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_cprofile_phase(self, tmp_path):
+        profiler = Profiler("cprofile", str(tmp_path))
+        with profiler.phase("solve"):
+            busy_work()
+        with profiler.phase("solve"):
+            pass
+        profiler.export()
+
+        stats = pstats.Stats(str(tmp_path / "profile_solve.pstats"))
+        assert any(name == "busy_work" for _, _, name in stats.stats)
+        assert (tmp_path / "profile_solve_2.pstats").exists()
+
+        memory = json.loads((tmp_path / MEMORY_FILE).read_text())
+        assert memory["phases"]["solve"]["peak_mb"] > 0
+        assert set(memory["phases"]) == {"solve", "solve_2"}
+
+    def test_sampled_phase_is_collapsed(self, tmp_path):
+        profiler = Profiler("sample", str(tmp_path), interval=0.001)
+        with profiler.phase("browser"):
+            busy_work()
+        profiler.export()
+
+        lines = (tmp_path / "profile_browser.collapsed").read_text().splitlines()
+        assert any("busy_work (profiler_test.py" in line for line in lines)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    def test_unknown_mode(self, tmp_path):
+        with pytest.raises(ValueError):
+            Profiler("perf", str(tmp_path))
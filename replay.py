@@ -0,0 +1,222 @@
+import argparse
+import json
+import logging
+import os
+import re
+from contextlib import nullcontext
+from pathlib import Path
+
+from batchsolver import OfflineSolver
+from constraints import Constraints
+from feedback import CACHE_DIR
+from result import Result
+from strategy import STRATEGY_NAMES
+from wordindex import WordIndex
+from wordlesolver import MAX_ATTEMPTS
+from wordlist import load_word_list
+
+LOG_ROOT = f"{os.path.dirname(os.path.realpath(__file__))}/logs"
+LOG_FILE = "wordle.log"
+SUMMARY_FILE = "game_summary.txt"
+
+# one output directory per daily run
+RUN_DIR = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# messages written by WordleSolver, matched after the FileFormatter prefix is stripped
+LOG_LINE = re.compile(r"^\[[^\]]*\] \[[^\]]*\] \[[^\]]*\] \[[^\]]*\] (?P<message>.*)$")
+GAME_START = re.compile(r"^solving wordle ")
+RESULTS_OF = re.compile(r"^results of (?P<word>[A-Z]+)$")
+LETTER_RESULT = re.compile(r"^letter [A-Z] Result\.(?P<status>[A-Z]+)$")
+SOLVE_TIME = re.compile(r"^calculated time to solve (?P<ms>-?\d+) ms$")
+SUMMARY_TITLE = re.compile(r"Wordle (?P<number>[\d,]+) (?P<guesses>[1-6X])/6")
+
+
+# one daily run as recorded in its output directory
+class HistoricalGame:
+
+    def solved(self):
+        return bool(self.results) and all(status == Result.CORRECT for status in self.results[-1])
+
+    def __init__(self, run_date, guesses, results, latency_ms=None, game_number=None):
+        self.run_date = run_date
+        self.guesses = guesses
+        self.results = results
+        self.latency_ms = latency_ms
+        self.game_number = game_number
+        self.answer = None
+
+
+# the guesses and letter results of the last run in a log, read a line at a time
+def parse_log(path):
+    guesses, results, latency_ms = [], [], None
+    with open(path, errors="replace") as f:
+        for line in f:
+            if (line_match := LOG_LINE.match(line.rstrip("\n"))) is None:
+                continue
+            message = line_match.group("message")
+            if GAME_START.match(message):
+                guesses, results, latency_ms = [], [], None
+            elif word_match := RESULTS_OF.match(message):
+                guesses.append(word_match.group("word").lower())
+                results.append([])
+            elif (letter_match := LETTER_RESULT.match(message)) and results:
+                results[-1].append(Result[letter_match.group("status")])
+            elif time_match := SOLVE_TIME.match(message):
+                latency_ms = int(time_match.group("ms"))
+    return guesses, results, latency_ms
+
+
+def parse_game_number(path):
+    if not os.path.exists(path):
+        return None
+    title = SUMMARY_TITLE.search(Path(path).read_text(errors="replace"))
+    return int(title.group("number").replace(",", "")) if title else None
+
+
+# historical games in date order, one run directory at a time
+def iter_games(log_root=LOG_ROOT):
+    for run_dir in sorted(Path(log_root).iterdir()):
+        if not run_dir.is_dir() or not RUN_DIR.match(run_dir.name) or not (run_dir / LOG_FILE).exists():
+            continue
+        guesses, results, latency_ms = parse_log(run_dir / LOG_FILE)
+        if not guesses:
+            continue
+        yield HistoricalGame(run_dir.name, guesses, results, latency_ms, parse_game_number(run_dir / SUMMARY_FILE))
+
+
+# running totals for one column of the comparison, kept as counts so memory stays flat
+class ReplayTally:
+
+    def add(self, solved, guesses, baseline=None):
+        self.games += 1
+        if solved:
+            self.wins += 1
+            self.total_guesses += guesses
+            self.distribution[guesses - 1] += 1
+        if baseline is not None:
+            # a loss counts as one guess past the limit
+            score = guesses if solved else MAX_ATTEMPTS + 1
+            if score < baseline:
+                self.better += 1
+            elif score > baseline:
+                self.worse += 1
+
+    def to_dict(self):
+        return {
+            "games": self.games,
+            "wins": self.wins,
+            "win_rate": self.wins / self.games if self.games else 0.0,
+            "mean_guesses": self.total_guesses / self.wins if self.wins else None,
+            "distribution": {str(n + 1): count for n, count in enumerate(self.distribution)},
+            "better": self.better,
+            "worse": self.worse,
+        }
+
+    def __init__(self, name):
+        self.name = name
+        self.games = 0
+        self.wins = 0
+        self.total_guesses = 0
+        self.distribution = [0] * MAX_ATTEMPTS
+        self.better = 0
+        self.worse = 0
+
+
+# re-plays each historical answer with the current strategies and tallies them against
+# what the daily run actually did
+class Replayer:
+
+    # the last guess of a win, otherwise the only word consistent with every result seen
+    def infer_answer(self, game):
+        if game.solved():
+            return game.guesses[-1]
+        constraints = Constraints(self.word_index.word_length, self.word_index.alphabet)
+        for word, letter_results in zip(game.guesses, game.results):
+            if len(letter_results) != self.word_index.word_length:
+                return None
+            constraints.apply(word, letter_results)
+        remaining = self.word_index.filter(constraints, self.word_index.all_indices())
+        return self.word_index.words_at(remaining)[0] if len(remaining) == 1 else None
+
+    # one comparison row per game with a known answer, games whose answer cannot be
+    # recovered are counted and skipped
+    def replay(self, games):
+        for game in games:
+            game.answer = self.infer_answer(game)
+            if game.answer is None or game.answer not in self.word_index.index:
+                self.unresolved += 1
+                self.logger.warning(f"skipping {game.run_date}, answer unknown")
+                continue
+
+            baseline = len(game.guesses) if game.solved() else MAX_ATTEMPTS + 1
+            self.history.add(game.solved(), len(game.guesses))
+            row = {
+                "date": game.run_date,
+                "game_number": game.game_number,
+                "answer": game.answer,
+                "history": {"solved": game.solved(), "guesses": len(game.guesses), "latency_ms": game.latency_ms},
+            }
+            for name, solver in self.solvers.items():
+                record = solver.solve_one(game.answer)
+                self.tallies[name].add(record.solved, record.guesses, baseline)
+                row[name] = record.to_dict()
+            yield row
+
+    def __init__(self, strategy_names, use_book=True, words=None, cache_dir=CACHE_DIR):
+        self.logger = logging.getLogger("replay")
+        self.word_index = WordIndex(words) if words is not None else load_word_list().word_index()
+        self.solvers = {
+            name: OfflineSolver(name, use_book, self.word_index.words, cache_dir) for name in strategy_names
+        }
+        self.history = ReplayTally("history")
+        self.tallies = {name: ReplayTally(name) for name in strategy_names}
+        self.unresolved = 0
+
+
+def format_guesses(solved, guesses):
+    return str(guesses) if solved else "X"
+
+
+def print_row(row, strategy_names):
+    history = row["history"]
+    cells = [f"{row['date']:<10}", f"{row['game_number'] or '':>5}", f"{row['answer'].upper():<6}",
+             f"{format_guesses(history['solved'], history['guesses']):>7}"]
+    cells += [f"{format_guesses(row[name]['solved'], row[name]['guesses']):>{max(len(name), 2)}}"
+              for name in strategy_names]
+    print("  ".join(cells))
+
+
+def print_comparison(replayer):
+    print(f"{'source':<10}  {'games':>5}  {'win rate':>8}  {'mean':>6}  {'better':>6}  {'worse':>6}")
+    for tally in [replayer.history, *replayer.tallies.values()]:
+        summary = tally.to_dict()
+        mean = f"{summary['mean_guesses']:.3f}" if summary["mean_guesses"] is not None else "-"
+        print(f"{tally.name:<10}  {summary['games']:>5}  {summary['win_rate']:>8.2%}  {mean:>6}  "
+              f"{summary['better']:>6}  {summary['worse']:>6}")
+    print(f"skipped {replayer.unresolved} runs with an unknown answer")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+
+    parser = argparse.ArgumentParser(description="replay historical runs against the current strategies")
+    parser.add_argument("--logs", default=LOG_ROOT, help="directory holding the YYYY-MM-DD run directories")
+    parser.add_argument("--strategy", action="append", choices=STRATEGY_NAMES,
+                        help="strategy to compare, may be repeated, defaults to all")
+    parser.add_argument("--no-book", action="store_true", help="do not use the opening book")
+    parser.add_argument("--json", help="stream one json line per game to this file")
+    args = parser.parse_args()
+
+    strategies = args.strategy or STRATEGY_NAMES
+    game_replayer = Replayer(strategies, use_book=not args.no_book)
+
+    print("  ".join([f"{'date':<10}", f"{'game':>5}", f"{'answer':<6}", f"{'history':>7}",
+                     *[f"{name:>2}" for name in strategies]]))
+    with open(args.json, "w") if args.json else nullcontext() as out:
+        for game_row in game_replayer.replay(iter_games(args.logs)):
+            print_row(game_row, strategies)
+            if out is not None:
+                out.write(json.dumps(game_row) + "\n")
+
+    print()
+    print_comparison(game_replayer)
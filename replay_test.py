@@ -0,0 +1,57 @@
+import logging
+
+from feedback import get_feedback
+from logger import FileFormatter
+from replay import Replayer, iter_games
+
+
+# writes a run directory the way main and WordleSolver log a daily game
+def write_run(log_root, run_date, guesses, answer, game_number):
+    run_dir = log_root / run_date
+    run_dir.mkdir(parents=True)
+    handler = logging.FileHandler(run_dir / "wordle.log")
+    handler.setFormatter(FileFormatter())
+    logger = logging.Logger("solver")
+    logger.addHandler(handler)
+
+    logger.info(f"solving wordle {run_date}")
+    for word in guesses:
+        logger.info(f"{word.upper()} is the most likely answer")
+        logger.info(f"results of {word.upper()}")
+        for letter, status in zip(word, get_feedback(word, answer)):
+            logger.info(f"letter {letter.upper()} {status}")
+    logger.info("calculated time to solve 42 ms")
+    handler.close()
+
+    (run_dir / "game_summary.txt").write_text(f"Wordle {game_number} {len(guesses)}/6\n\n🟩🟩🟩🟩🟩")
+
+
+class TestReplay:
+
+    def test_parses_runs_in_date_order(self, tmp_path):
+        write_run(tmp_path, "2022-03-02", ["champ", "patch"], "patch", 257)
+        write_run(tmp_path, "2022-03-01", ["blimp", "hatch", "watch"], "watch", 256)
+        (tmp_path / "notes").mkdir()
+
+        games = list(iter_games(tmp_path))
+
+        assert [game.run_date for game in games] == ["2022-03-01", "2022-03-02"]
+        assert games[0].guesses == ["blimp", "hatch", "watch"]
+        assert games[0].results[1] == get_feedback("hatch", "watch")
+        assert games[0].latency_ms == 42
+        assert games[1].game_number == 257
+
+    def test_replay_compares_strategies(self, small_words, tmp_path):
+        log_root = tmp_path / "logs"
+        write_run(log_root, "2022-03-01", ["blimp", "hatch", "watch"], "watch", 256)
+        # an unsolved run whose results still pin down the answer
+        write_run(log_root, "2022-03-02", ["blimp", "champ", "catch", "hatch", "match", "watch"], "batch", 257)
+
+        replayer = Replayer(["entropy"], words=small_words, cache_dir=str(tmp_path))
+        rows = list(replayer.replay(iter_games(log_root)))
+
+        assert [row["answer"] for row in rows] == ["watch", "batch"]
+        assert all(row["entropy"]["solved"] for row in rows)
+        assert replayer.history.to_dict()["wins"] == 1
+        assert replayer.tallies["entropy"].to_dict()["games"] == 2
+        assert replayer.tallies["entropy"].better >= 1
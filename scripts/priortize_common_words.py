@@ -1,12 +1,62 @@
 #!/usr/bin/env python3
 
+import argparse
 import logging
+import math
 import os
-import mmap
+import sys
+import time
 
-COMMON_WORDS_FILE_PATH = "/Users/nboyd/git/google-10000-english/google-10000-english-usa-no-swears-medium.txt"
-ALLOWED_STRINGS_FILE = f"/Users/nboyd/git/wordle_bot/allowed_strings.txt"
-NEW_ALLOWED_STRINGS_FILE = f"/Users/nboyd/git/wordle_bot/allowed_strings_new.txt"
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from util import atomic_write  # noqa: E402
+
+ALLOWED_STRINGS_FILE = f"{REPO_DIR}/allowed_strings.txt"
+
+# weight given to a source listed without one
+DEFAULT_SOURCE_WEIGHT = 1.0
+
+# decimal places kept in the written weights
+WEIGHT_PRECISION = 4
+
+
+# a frequency list ordered most common first, one word per line, with how much it counts
+# towards the combined weight
+class RankedSource:
+
+    # rank 0 scores 1 and scores fall off with the log of the rank, so the difference between
+    # the 10th and 100th word matters more than between the 5000th and 5100th
+    def score(self, word):
+        rank = self.ranks.get(word)
+        if rank is None:
+            return 0.0
+        return 1 - math.log1p(rank) / math.log1p(len(self.ranks))
+
+    def load(self):
+        with open(self.path) as f:
+            for line in f:
+                word = line.strip().lower()
+                # only the first, most common, occurrence of a word sets its rank
+                if word and word not in self.ranks:
+                    self.ranks[word] = len(self.ranks)
+
+    def __init__(self, path, weight=DEFAULT_SOURCE_WEIGHT):
+        self.path = path
+        self.weight = weight
+        self.ranks = {}
+
+
+# 'path' or 'path:weight'
+def parse_source(value):
+    path, _, weight = value.rpartition(":")
+    if not path or not weight.replace(".", "", 1).isdigit():
+        return RankedSource(value)
+    return RankedSource(path, float(weight))
+
+
+def format_weight(weight):
+    return f"{weight:.{WEIGHT_PRECISION}f}".rstrip("0").rstrip(".")
 
 
 class Handler:
@@ -17,43 +67,65 @@ class Handler:
         else:
             self.logger.info(f"path exists {path}")
 
+    # the weighted mean of every source's score, 0 for a word no source knows
+    def weigh(self, word):
+        total = sum(source.weight * source.score(word) for source in self.sources)
+        return total / self.total_weight
+
+    # reads the allowed words a line at a time and writes each word with its new weight to a
+    # temporary file, replacing the output only once every line is written
     def priortize_words(self):
+        start = time.perf_counter()
+        for source in self.sources:
+            source.load()
+            self.logger.info(f"loaded {len(source.ranks)} ranked words from {source.path}")
 
-        replacement = ""
         count = 0
-        with open(ALLOWED_STRINGS_FILE) as allowed_words_file:
-            with open(COMMON_WORDS_FILE_PATH) as common_words_file, mmap.mmap(common_words_file.fileno(), 0,
-                                                                              access=mmap.ACCESS_READ) as s:
-                for line in allowed_words_file:
-                    word_on_line = line.split(',')[1]
-                    if s.find(str.encode(word_on_line)) != -1:
-                        changes = line.replace(line, f"1,{word_on_line}")
-                        count += 1
-                    else:
-                        changes = line.replace(line, f"0,{word_on_line}")
-                    replacement += changes
+        with open(self.allowed_path) as allowed_words_file, atomic_write(self.output_path) as fout:
+            for line in allowed_words_file:
+                if not line.strip():
+                    continue
+                word = line.rstrip("\n").split(',')[-1].lower()
+                weight = self.weigh(word)
+                if weight > 0:
+                    count += 1
+                fout.write(f"{format_weight(weight)},{word}\n")
+
         self.logger.info(f"found {count} common words")
-        fout = open(NEW_ALLOWED_STRINGS_FILE, "w")
-        fout.write(replacement)
-        fout.close()
+        self.logger.info(f"wrote {self.output_path} in {(time.perf_counter() - start) * 1000:.1f} ms")
 
-    def __init__(self):
+    def __init__(self, sources, allowed_path=ALLOWED_STRINGS_FILE, output_path=None):
 
         logging.basicConfig(
             level=logging.INFO,
             format="%(asctime)s [%(levelname)s] %(message)s",
             handlers=[
-                logging.FileHandler("debug.log"),
                 logging.StreamHandler()
             ]
         )
 
         self.logger = logging.getLogger()
 
-        self.check_files(COMMON_WORDS_FILE_PATH)
-        self.check_files(ALLOWED_STRINGS_FILE)
+        self.sources = sources
+        self.total_weight = sum(source.weight for source in sources)
+        self.allowed_path = allowed_path
+        # the allowed words file is rewritten in place unless told otherwise
+        self.output_path = output_path if output_path is not None else allowed_path
+
+        if self.total_weight <= 0:
+            raise Exception("source weights must add up to more than 0")
+        for source in self.sources:
+            self.check_files(source.path)
+        self.check_files(self.allowed_path)
 
 
 if __name__ == '__main__':
-    h = Handler()
+    parser = argparse.ArgumentParser(description="weight the allowed words by how common they are")
+    parser.add_argument("sources", nargs="+", type=parse_source, metavar="SOURCE[:WEIGHT]",
+                        help="word frequency list, most common first, e.g. google-10000-english-usa.txt:2")
+    parser.add_argument("--allowed", default=ALLOWED_STRINGS_FILE, help="the 'weight,word' allowed words file")
+    parser.add_argument("--output", help="where to write the weighted words, defaults to rewriting --allowed")
+    args = parser.parse_args()
+
+    h = Handler(args.sources, args.allowed, args.output)
     h.priortize_words()
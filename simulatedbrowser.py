@@ -0,0 +1,43 @@
+from feedback import get_feedback
+
+
+# stands in for BrowserWrapper when the answer is known, returning the feedback
+# wordle would show without driving a browser
+class SimulatedBrowserWrapper:
+
+    def submit_word(self, word, attempt):
+        self.guesses.append(word)
+        return get_feedback(word, self.answer)
+
+    def save_game_summary(self):
+        pass
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.guesses = []
+        self.time_waiting_ms = 0
+
+
+# the simulated browser for a multi board game, every guess is played on all boards at
+# once and boards that are already solved report None
+class SimulatedMultiBoardWrapper:
+
+    def submit_word(self, word, attempt):
+        self.guesses.append(word)
+        letter_results = []
+        for board, answer in enumerate(self.answers):
+            if self.solved[board]:
+                letter_results.append(None)
+                continue
+            letter_results.append(get_feedback(word, answer))
+            self.solved[board] = word == answer
+        return letter_results
+
+    def save_game_summary(self):
+        pass
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.solved = [False] * len(answers)
+        self.guesses = []
+        self.time_waiting_ms = 0
@@ -0,0 +1,355 @@
+import argparse
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from batchsolver import OfflineSolver
+from feedback import CACHE_DIR, FeedbackMatrix, encode_results
+from openingbook import history_key, load_opening_book
+from result import Result
+from strategy import STRATEGY_NAMES, get_strategy
+from wordindex import WordIndex
+from wordlesolver import MAX_ATTEMPTS
+from wordlist import DEFAULT_DICTIONARY, load_dictionary
+
+DEFAULT_PORT = 8080
+
+# next guesses remembered per (strategy, history), most games share their first few states
+GUESS_CACHE_SIZE = 100000
+
+# dictionaries kept warm at once, the least recently used is dropped beyond this
+DICTIONARY_CACHE_SIZE = 4
+
+# idle games are dropped after this long
+SESSION_TTL_SECONDS = 3600
+
+
+# one independent game: the guesses made so far and the candidates left
+class GameSession:
+
+    def to_dict(self):
+        return {
+            "game_id": self.game_id,
+            "strategy": self.strategy_name,
+            "dictionary": self.dictionary.name,
+            "attempt": len(self.history),
+            "remaining": len(self.candidates),
+            "solved": self.solved,
+            "guess": self.next_guess,
+            "history": [{"guess": word, "code": code} for word, code in self.history],
+        }
+
+    def __init__(self, game_id, strategy_name, dictionary, candidates):
+        self.game_id = game_id
+        self.strategy_name = strategy_name
+        self.dictionary = dictionary
+        self.candidates = candidates
+        self.history = []
+        self.solved = False
+        self.next_guess = None
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()
+
+
+# the word index, feedback matrix, strategies and opening books of one dictionary
+class DictionaryEngine:
+
+    def get_strategy(self, strategy_name):
+        if strategy_name not in STRATEGY_NAMES:
+            raise ValueError(f"unknown strategy {strategy_name}")
+        with self.lock:
+            if strategy_name not in self.strategies:
+                strategy = get_strategy(strategy_name, self.feedback_matrix, self.word_index, self.word_list)
+                self.strategies[strategy_name] = strategy
+                self.opening_books[strategy_name] = load_opening_book(strategy, self.feedback_matrix, self.cache_dir)
+            return self.strategies[strategy_name]
+
+    # shares the engine's matrix, strategy and opening book, so batches start warm
+    def get_offline_solver(self, strategy_name):
+        strategy = self.get_strategy(strategy_name)
+        with self.lock:
+            if strategy_name not in self.offline_solvers:
+                self.offline_solvers[strategy_name] = OfflineSolver(
+                    strategy_name, cache_dir=self.cache_dir, word_list=self.word_list, word_index=self.word_index,
+                    feedback_matrix=self.feedback_matrix, strategy=strategy,
+                    opening_book=self.opening_books[strategy_name])
+            return self.offline_solvers[strategy_name]
+
+    def __init__(self, name, word_list, words=None, cache_dir=CACHE_DIR):
+        self.name = name
+        self.cache_dir = cache_dir
+        self.word_list = word_list
+        self.word_index = WordIndex(words) if words is not None else word_list.word_index()
+        self.feedback_matrix = FeedbackMatrix(self.word_index.words, cache_dir)
+        self.strategies = {}
+        self.opening_books = {}
+        self.offline_solvers = {}
+        self.lock = threading.Lock()
+
+
+# the games in progress and a warm DictionaryEngine per recently used dictionary, shared by
+# every request. games keep their dictionary's engine, so evicting it never breaks a game
+class SolverEngine:
+
+    def get_dictionary(self, name):
+        with self.lock:
+            dictionary = self.dictionaries.get(name)
+            if dictionary is not None:
+                self.dictionaries.move_to_end(name)
+                return dictionary
+
+        # loading can build indexes and matrices, so it happens outside the engine lock
+        words = self.words if name == DEFAULT_DICTIONARY else None
+        dictionary = DictionaryEngine(name, load_dictionary(name), words, self.cache_dir)
+        with self.lock:
+            dictionary = self.dictionaries.setdefault(name, dictionary)
+            self.dictionaries.move_to_end(name)
+            if len(self.dictionaries) > DICTIONARY_CACHE_SIZE:
+                evicted, _ = self.dictionaries.popitem(last=False)
+                self.logger.info(f"evicted dictionary {evicted}")
+            return dictionary
+
+    def get_strategy(self, strategy_name, dictionary_name=DEFAULT_DICTIONARY):
+        return self.get_dictionary(dictionary_name).get_strategy(strategy_name)
+
+    def cached_guess(self, key):
+        with self.lock:
+            guess = self.guess_cache.get(key)
+            if guess is not None:
+                self.guess_cache.move_to_end(key)
+            return guess
+
+    def cache_guess(self, key, guess):
+        with self.lock:
+            self.guess_cache[key] = guess
+            if len(self.guess_cache) > GUESS_CACHE_SIZE:
+                self.guess_cache.popitem(last=False)
+
+    # the opening book, then the cache, and only then the strategy
+    def next_guess(self, session):
+        dictionary = session.dictionary
+        strategy = dictionary.get_strategy(session.strategy_name)
+        guess = dictionary.opening_books[session.strategy_name].lookup(session.history)
+        if guess is not None:
+            return guess
+
+        key = (dictionary.name, session.strategy_name, history_key(session.history))
+        guess = self.cached_guess(key)
+        if guess is None:
+            possible_words = dictionary.word_index.words_at(session.candidates)
+            guess, _ = strategy.select(possible_words, len(session.history))
+            self.cache_guess(key, guess)
+        return guess
+
+    def apply_feedback(self, session, guess, letter_results):
+        word_index = session.dictionary.word_index
+        if len(session.history) >= MAX_ATTEMPTS:
+            raise ValueError(f"game {session.game_id} has no attempts left")
+        if len(letter_results) != word_index.word_length:
+            raise ValueError(f"expected {word_index.word_length} results")
+        if guess not in word_index.index:
+            raise ValueError(f"{guess} is not an allowed word")
+
+        session.history.append((guess, encode_results(letter_results)))
+        session.solved = letter_results.count(Result.CORRECT) == len(letter_results)
+        if session.solved:
+            session.candidates = session.candidates[:0]
+            session.next_guess = None
+            return
+
+        session.candidates = session.dictionary.feedback_matrix.filter(guess, letter_results, session.candidates)
+        if len(session.candidates) == 0 or len(session.history) >= MAX_ATTEMPTS:
+            session.next_guess = None
+        else:
+            session.next_guess = self.next_guess(session)
+
+    def start_game(self, strategy_name, dictionary_name=DEFAULT_DICTIONARY):
+        dictionary = self.get_dictionary(dictionary_name)
+        dictionary.get_strategy(strategy_name)
+        self.expire_sessions()
+
+        session = GameSession(uuid.uuid4().hex, strategy_name, dictionary, dictionary.word_index.all_indices())
+        session.next_guess = self.next_guess(session)
+        with self.lock:
+            self.sessions[session.game_id] = session
+        return session
+
+    def get_session(self, game_id):
+        with self.lock:
+            session = self.sessions.get(game_id)
+        if session is None:
+            raise LookupError(f"no game {game_id}")
+        session.last_used = time.monotonic()
+        return session
+
+    def end_game(self, game_id):
+        with self.lock:
+            if self.sessions.pop(game_id, None) is None:
+                raise LookupError(f"no game {game_id}")
+
+    def expire_sessions(self):
+        cutoff = time.monotonic() - SESSION_TTL_SECONDS
+        with self.lock:
+            for game_id in [g for g, s in self.sessions.items() if s.last_used < cutoff]:
+                del self.sessions[game_id]
+
+    def batch_solve(self, strategy_name, answers, dictionary_name=DEFAULT_DICTIONARY):
+        dictionary = self.get_dictionary(dictionary_name)
+        if strategy_name not in STRATEGY_NAMES:
+            raise ValueError(f"unknown strategy {strategy_name}")
+        offline_solver = dictionary.get_offline_solver(strategy_name)
+        for answer in answers:
+            if answer not in dictionary.word_index.index:
+                raise ValueError(f"{answer} is not an allowed word")
+        return [record.to_dict() for record in offline_solver.run(answers)]
+
+    def __init__(self, words=None, cache_dir=CACHE_DIR):
+        self.logger = logging.getLogger("service")
+        self.cache_dir = cache_dir
+        # overrides the default dictionary's words, other dictionaries always come from their file
+        self.words = words
+        self.dictionaries = OrderedDict()
+        self.guess_cache = OrderedDict()
+        self.sessions = {}
+        self.lock = threading.RLock()
+
+
+# request fields are a string or a list of strings, anything else is a bad request
+def string_field(body, key, default):
+    value = body.get(key, default)
+    if not isinstance(value, str):
+        raise ValueError(f"{key} must be a string")
+    return value
+
+
+def string_list_field(body, key, default):
+    value = body.get(key, default)
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"{key} must be a list of strings")
+    return value
+
+
+def parse_letter_results(feedback):
+    try:
+        return [Result[status.upper()] for status in feedback]
+    except (KeyError, AttributeError, TypeError):
+        raise ValueError("feedback must be a list of correct, present or absent")
+
+
+class SolverRequestHandler(BaseHTTPRequestHandler):
+
+    # set on the handler class by SolverService
+    engine = None
+
+    def send_json(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        if length == 0:
+            return {}
+        body = json.loads(self.rfile.read(length))
+        if not isinstance(body, dict):
+            raise ValueError("request body must be a json object")
+        return body
+
+    def route(self, method):
+        parts = [part for part in self.path.split("?")[0].split("/") if part]
+        body = self.read_json() if method == "POST" else {}
+
+        match method, parts:
+            case "POST", ["games"]:
+                session = self.engine.start_game(string_field(body, "strategy", "entropy"),
+                                                 string_field(body, "dictionary", DEFAULT_DICTIONARY))
+                return 201, session.to_dict()
+            case "GET", ["games", game_id]:
+                return 200, self.engine.get_session(game_id).to_dict()
+            case "GET", ["games", game_id, "guess"]:
+                session = self.engine.get_session(game_id)
+                return 200, {"game_id": game_id, "guess": session.next_guess, "solved": session.solved}
+            case "POST", ["games", game_id, "feedback"]:
+                session = self.engine.get_session(game_id)
+                letter_results = parse_letter_results(string_list_field(body, "feedback", None))
+                with session.lock:
+                    if session.solved:
+                        raise ValueError(f"game {game_id} is already solved")
+                    guess = string_field(body, "guess", session.next_guess)
+                    self.engine.apply_feedback(session, guess, letter_results)
+                    return 200, session.to_dict()
+            case "DELETE", ["games", game_id]:
+                self.engine.end_game(game_id)
+                return 200, {"game_id": game_id}
+            case "POST", ["solve"]:
+                records = self.engine.batch_solve(string_field(body, "strategy", "entropy"),
+                                                  string_list_field(body, "answers", []),
+                                                  string_field(body, "dictionary", DEFAULT_DICTIONARY))
+                return 200, {"results": records}
+            case "GET", ["health"]:
+                return 200, {"status": "ok", "sessions": len(self.engine.sessions)}
+        return 404, {"error": f"no route {method} {self.path}"}
+
+    def handle_method(self, method):
+        try:
+            status, body = self.route(method)
+        except LookupError as e:
+            status, body = 404, {"error": str(e)}
+        except (ValueError, json.JSONDecodeError) as e:
+            status, body = 400, {"error": str(e)}
+        self.send_json(status, body)
+
+    def do_GET(self):
+        self.handle_method("GET")
+
+    def do_POST(self):
+        self.handle_method("POST")
+
+    def do_DELETE(self):
+        self.handle_method("DELETE")
+
+    def log_message(self, format, *args):
+        logging.getLogger("service").debug(format % args)
+
+
+# a long running http server sharing one warm engine across concurrent game sessions
+class SolverService:
+
+    def serve_forever(self):
+        self.logger.info(f"serving solver on port {self.server.server_port}")
+        self.server.serve_forever()
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __init__(self, engine, host="127.0.0.1", port=DEFAULT_PORT):
+        self.logger = logging.getLogger("service")
+        handler = type("BoundSolverRequestHandler", (SolverRequestHandler,), {"engine": engine})
+        self.server = ThreadingHTTPServer((host, port), handler)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    parser = argparse.ArgumentParser(description="serve the solver engine over http")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--strategy", action="append", choices=STRATEGY_NAMES,
+                        help="strategies to warm up before serving")
+    parser.add_argument("--dictionary", action="append", help="dictionaries to warm up, defaults to the allowed words")
+    args = parser.parse_args()
+
+    solver_engine = SolverEngine()
+    for dictionary_name in args.dictionary or [DEFAULT_DICTIONARY]:
+        for name in args.strategy or ["entropy"]:
+            solver_engine.get_strategy(name, dictionary_name)
+
+    SolverService(solver_engine, args.host, args.port).serve_forever()
@@ -0,0 +1,172 @@
+import json
+import threading
+import urllib.request
+from contextlib import contextmanager
+
+import pytest
+
+import wordlist
+from feedback import get_feedback
+from solverservice import SolverEngine, SolverService
+from util import atomic_write
+
+SIX_LETTER_WORDS = ["carpet", "market", "basket", "garden", "pocket", "rocket", "silver", "target"]
+
+
+@pytest.fixture
+def service(small_words, tmp_path):
+    solver_service = SolverService(SolverEngine(small_words, cache_dir=str(tmp_path)), port=0)
+    thread = threading.Thread(target=solver_service.server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{solver_service.server.server_port}"
+    solver_service.shutdown()
+
+
+def request(url, method="GET", body=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req) as res:
+            return res.status, json.loads(res.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+class TestSolverService:
+
+    @pytest.mark.parametrize("answer", ["watch", "plumb"])
+    def test_play_game(self, service, answer):
+        status, game = request(f"{service}/games", "POST", {"strategy": "entropy"})
+        assert status == 201
+
+        for _ in range(6):
+            guess = game["guess"]
+            feedback = [r.name.lower() for r in get_feedback(guess, answer)]
+            status, game = request(f"{service}/games/{game['game_id']}/feedback", "POST",
+                                   {"guess": guess, "feedback": feedback})
+            assert status == 200
+            if game["solved"]:
+                break
+
+        assert game["solved"]
+        assert game["history"][-1]["guess"] == answer
+
+    def test_sessions_are_independent(self, service):
+        _, first = request(f"{service}/games", "POST", {})
+        _, second = request(f"{service}/games", "POST", {})
+        guess = first["guess"]
+
+        request(f"{service}/games/{first['game_id']}/feedback", "POST",
+                {"guess": guess, "feedback": [r.name.lower() for r in get_feedback(guess, "match")]})
+
+        assert request(f"{service}/games/{second['game_id']}")[1]["attempt"] == 0
+        assert request(f"{service}/games/{first['game_id']}")[1]["attempt"] == 1
+
+    def test_errors(self, service):
+        _, game = request(f"{service}/games", "POST", {})
+
+        assert request(f"{service}/games/missing/guess")[0] == 404
+        assert request(f"{service}/games/{game['game_id']}/feedback", "POST", {"feedback": ["nope"]})[0] == 400
+        assert request(f"{service}/games", "POST", {"strategy": "nope"})[0] == 400
+        assert request(f"{service}/games", "POST", [])[0] == 400
+
+    @pytest.mark.parametrize("path, body", [
+        ("games", {"strategy": 5}),
+        ("games", {"dictionary": 5}),
+        ("games", {"dictionary": ["six"]}),
+        ("solve", {"answers": 5}),
+        ("solve", {"answers": "watch"}),
+        ("solve", {"answers": ["watch", 5]}),
+        ("solve", {"strategy": None}),
+    ])
+    def test_wrong_typed_fields(self, service, path, body):
+        status, response = request(f"{service}/{path}", "POST", body)
+
+        assert status == 400 and "must be" in response["error"]
+
+    def test_wrong_typed_feedback(self, service):
+        _, game = request(f"{service}/games", "POST", {})
+        url = f"{service}/games/{game['game_id']}/feedback"
+
+        assert request(url, "POST", {"guess": 5, "feedback": ["absent"] * 5})[0] == 400
+        assert request(url, "POST", {"feedback": "absent"})[0] == 400
+        assert request(url, "POST", {"feedback": [1, 2, 3, 4, 5]})[0] == 400
+
+    def test_no_guesses_after_max_attempts(self, service):
+        _, game = request(f"{service}/games", "POST", {})
+        url = f"{service}/games/{game['game_id']}/feedback"
+
+        for guess in ["blimp", "champ", "plumb", "batch", "catch", "hatch"]:
+            feedback = [r.name.lower() for r in get_feedback(guess, "watch")]
+            status, game = request(url, "POST", {"guess": guess, "feedback": feedback})
+            assert status == 200
+        assert game["attempt"] == 6 and game["guess"] is None
+
+        feedback = [r.name.lower() for r in get_feedback("watch", "watch")]
+        status, response = request(url, "POST", {"guess": "watch", "feedback": feedback})
+        assert status == 400 and "no attempts left" in response["error"]
+
+    def test_batches_share_the_warm_dictionary(self, small_words, tmp_path):
+        engine = SolverEngine(small_words, cache_dir=str(tmp_path))
+        dictionary = engine.get_dictionary("default")
+        offline_solver = dictionary.get_offline_solver("entropy")
+
+        assert offline_solver.feedback_matrix is dictionary.feedback_matrix
+        assert offline_solver.strategy is dictionary.get_strategy("entropy")
+        assert offline_solver.opening_book is dictionary.opening_books["entropy"]
+
+    def test_batch_solve(self, small_words, service):
+        status, body = request(f"{service}/solve", "POST", {"answers": small_words})
+
+        assert status == 200
+        assert [r["answer"] for r in body["results"]] == small_words
+        assert all(r["solved"] for r in body["results"])
+
+    def test_dictionary_games(self, service, tmp_path, monkeypatch):
+        monkeypatch.setattr(wordlist, "DICTIONARY_DIR", str(tmp_path))
+        (tmp_path / "six.txt").write_text("\n".join(SIX_LETTER_WORDS) + "\n")
+
+        _, game = request(f"{service}/games", "POST", {"dictionary": "six"})
+        for _ in range(6):
+            guess = game["guess"]
+            feedback = [r.name.lower() for r in get_feedback(guess, "carpet")]
+            _, game = request(f"{service}/games/{game['game_id']}/feedback", "POST",
+                              {"guess": guess, "feedback": feedback})
+            if game["solved"]:
+                break
+
+        assert game["solved"] and game["dictionary"] == "six"
+        assert request(f"{service}/games", "POST", {"dictionary": "missing"})[0] == 404
+        assert request(f"{service}/games", "POST", {"dictionary": "../six"})[0] == 400
+
+    def test_concurrent_cold_dictionary_loads(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(wordlist, "DICTIONARY_DIR", str(tmp_path))
+        (tmp_path / "six.txt").write_text("\n".join(SIX_LETTER_WORDS) + "\n")
+        engine = SolverEngine(cache_dir=str(tmp_path))
+        barrier = threading.Barrier(2)
+        loaded, errors = [], []
+
+        # both threads hold their feedback matrix write open until the other one is writing too
+        @contextmanager
+        def overlapping_write(path, mode="w"):
+            with atomic_write(path, mode) as f:
+                yield f
+                barrier.wait(timeout=5)
+        monkeypatch.setattr("feedback.atomic_write", overlapping_write)
+
+        def load():
+            barrier.wait()
+            try:
+                loaded.append(engine.get_dictionary("six"))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=load) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert loaded[0] is loaded[1]
+        assert not list(tmp_path.glob("*.tmp"))
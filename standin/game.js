@@ -0,0 +1,212 @@
+// a local stand-in for the wordle page, mirroring the game-app / game-row / game-tile
+// shadow dom, tile animation attributes and share flow that BrowserWrapper drives
+
+const params = new URLSearchParams(window.location.search);
+const config = Object.assign({answer: 'cheek', flipMs: 250, gameNumber: 0}, window.STANDIN_CONFIG || {});
+if (params.has('answer')) config.answer = params.get('answer');
+if (params.has('flip_ms')) config.flipMs = Number(params.get('flip_ms'));
+if (params.has('game_number')) config.gameNumber = Number(params.get('game_number'));
+config.answer = config.answer.toLowerCase();
+
+const WORD_LENGTH = config.answer.length;
+const MAX_ATTEMPTS = 6;
+const SQUARES = {correct: '🟩', present: '🟨', absent: '⬜'};
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// same rules as feedback.get_feedback, repeated letters are only present while unmatched
+function evaluate(guess, answer) {
+    const evaluations = new Array(guess.length).fill('absent');
+    const unmatched = [];
+    for (let i = 0; i < guess.length; i++) {
+        if (guess[i] === answer[i]) {
+            evaluations[i] = 'correct';
+        } else {
+            unmatched.push(answer[i]);
+        }
+    }
+    for (let i = 0; i < guess.length; i++) {
+        const idx = unmatched.indexOf(guess[i]);
+        if (evaluations[i] !== 'correct' && idx !== -1) {
+            evaluations[i] = 'present';
+            unmatched.splice(idx, 1);
+        }
+    }
+    return evaluations;
+}
+
+class GameTile extends HTMLElement {
+    static get observedAttributes() {
+        return ['letter'];
+    }
+
+    constructor() {
+        super();
+        this.attachShadow({mode: 'open'});
+        this.shadowRoot.innerHTML = `
+            <style>
+                .tile {
+                    width: 62px; height: 62px; margin: 2px; border: 2px solid #d3d6da;
+                    display: inline-flex; justify-content: center; align-items: center;
+                    font-size: 32px; font-weight: bold; text-transform: uppercase; box-sizing: border-box;
+                }
+                .tile[data-state='correct'] { background: #6aaa64; border-color: #6aaa64; color: #fff; }
+                .tile[data-state='present'] { background: #c9b458; border-color: #c9b458; color: #fff; }
+                .tile[data-state='absent'] { background: #787c7e; border-color: #787c7e; color: #fff; }
+            </style>
+            <div class="tile" data-state="empty" data-animation="idle"></div>`;
+        this.tile = this.shadowRoot.querySelector('div');
+    }
+
+    attributeChangedCallback(name, oldValue, newValue) {
+        this.tile.textContent = newValue || '';
+    }
+
+    // flip in, show the evaluation, flip out
+    async reveal(evaluation, flipMs) {
+        this.tile.dataset.animation = 'flip-in';
+        await sleep(flipMs / 2);
+        this.setAttribute('evaluation', evaluation);
+        this.tile.dataset.state = evaluation;
+        this.tile.dataset.animation = 'flip-out';
+        await sleep(flipMs / 2);
+        this.tile.dataset.animation = 'idle';
+        this.setAttribute('reveal', '');
+    }
+}
+
+class GameRow extends HTMLElement {
+    constructor() {
+        super();
+        this.attachShadow({mode: 'open'});
+        this.shadowRoot.innerHTML = '<style>:host { display: block; }</style>';
+        for (let i = 0; i < WORD_LENGTH; i++) {
+            this.shadowRoot.appendChild(document.createElement('game-tile'));
+        }
+        this.tiles = Array.from(this.shadowRoot.querySelectorAll('game-tile'));
+    }
+
+    set letters(letters) {
+        this.setAttribute('letters', letters);
+        this.tiles.forEach((tile, idx) => tile.setAttribute('letter', letters[idx] || ''));
+    }
+
+    // tiles flip one after another, resolves when the last one is idle
+    reveal(evaluations, flipMs) {
+        return Promise.all(this.tiles.map(async (tile, idx) => {
+            await sleep(idx * flipMs);
+            await tile.reveal(evaluations[idx], flipMs);
+        }));
+    }
+}
+
+class GameStats extends HTMLElement {
+    constructor() {
+        super();
+        this.attachShadow({mode: 'open'});
+        this.shadowRoot.innerHTML = `
+            <h1>Statistics</h1>
+            <button id="share-button">Share</button>`;
+        this.shadowRoot.getElementById('share-button').addEventListener('click', (e) => {
+            e.stopPropagation();
+            this.dispatchEvent(new CustomEvent('game-share', {bubbles: true, composed: true}));
+        });
+    }
+}
+
+class GameModal extends HTMLElement {
+}
+
+class GameApp extends HTMLElement {
+    constructor() {
+        super();
+        this.attachShadow({mode: 'open'});
+        this.shadowRoot.innerHTML = `
+            <style>
+                #welcome { position: fixed; inset: 0; background: rgba(255, 255, 255, 0.9); padding: 40px; }
+                #board { display: grid; justify-content: center; padding-top: 60px; }
+            </style>
+            <div id="welcome">Welcome to the wordle stand-in, click anywhere to play</div>
+            <div id="game">
+                <div id="board-container"><div id="board"></div></div>
+                <game-modal></game-modal>
+            </div>`;
+
+        this.board = this.shadowRoot.getElementById('board');
+        for (let i = 0; i < MAX_ATTEMPTS; i++) {
+            this.board.appendChild(document.createElement('game-row'));
+        }
+        this.rows = Array.from(this.board.querySelectorAll('game-row'));
+        this.modal = this.shadowRoot.querySelector('game-modal');
+
+        this.current = '';
+        this.evaluations = [];
+        this.busy = false;
+        this.over = false;
+
+        document.addEventListener('click', () => this.shadowRoot.getElementById('welcome')?.remove(), {once: true});
+        window.addEventListener('keydown', (e) => this.onKey(e));
+        this.addEventListener('game-share', () => this.share());
+    }
+
+    onKey(e) {
+        if (this.busy || this.over) return;
+        const row = this.rows[this.evaluations.length];
+        if (e.key === 'Enter') {
+            if (this.current.length === WORD_LENGTH) this.submit();
+        } else if (e.key === 'Backspace') {
+            this.current = this.current.slice(0, -1);
+            row.letters = this.current;
+        } else if (/^[a-zA-Z]$/.test(e.key) && this.current.length < WORD_LENGTH) {
+            this.current += e.key.toLowerCase();
+            row.letters = this.current;
+        }
+    }
+
+    async submit() {
+        this.busy = true;
+        const row = this.rows[this.evaluations.length];
+        const evaluations = evaluate(this.current, config.answer);
+        this.evaluations.push(evaluations);
+        await row.reveal(evaluations, config.flipMs);
+
+        const solved = evaluations.every((evaluation) => evaluation === 'correct');
+        this.current = '';
+        this.busy = false;
+        if (solved || this.evaluations.length === MAX_ATTEMPTS) {
+            this.over = true;
+            this.solved = solved;
+            await sleep(config.flipMs * 2);
+            this.modal.appendChild(document.createElement('game-stats'));
+        }
+    }
+
+    shareText() {
+        const score = this.solved ? this.evaluations.length : 'X';
+        const rows = this.evaluations.map((row) => row.map((evaluation) => SQUARES[evaluation]).join(''));
+        return `Wordle ${String(config.gameNumber).padStart(3, '0')} ${score}/${MAX_ATTEMPTS}\n\n${rows.join('\n')}`;
+    }
+
+    share() {
+        const text = this.shareText();
+        const fallback = () => {
+            const area = document.createElement('textarea');
+            area.value = text;
+            document.body.appendChild(area);
+            area.select();
+            document.execCommand('copy');
+            area.remove();
+        };
+        if (navigator.clipboard) {
+            navigator.clipboard.writeText(text).catch(fallback);
+        } else {
+            fallback();
+        }
+    }
+}
+
+customElements.define('game-tile', GameTile);
+customElements.define('game-row', GameRow);
+customElements.define('game-stats', GameStats);
+customElements.define('game-modal', GameModal);
+customElements.define('game-app', GameApp);
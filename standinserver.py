@@ -0,0 +1,74 @@
+import argparse
+import json
+import logging
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+STANDIN_DIR = f"{os.path.dirname(os.path.realpath(__file__))}/standin"
+DEFAULT_PORT = 8000
+DEFAULT_FLIP_MS = 250
+
+
+class StandinRequestHandler(SimpleHTTPRequestHandler):
+
+    # set on the handler class by StandinServer
+    game_config = None
+
+    def do_GET(self):
+        if self.path.split("?")[0] == "/config.js":
+            payload = f"window.STANDIN_CONFIG = {json.dumps(self.game_config)};\n".encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/javascript")
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        logging.getLogger("standin").debug(format % args)
+
+
+# serves the local wordle stand-in page with a fixed answer and animation speed,
+# the page also accepts answer, flip_ms and game_number query parameters
+class StandinServer:
+
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/index.html"
+
+    def serve_forever(self):
+        self.logger.info(f"serving wordle stand-in at {self.url()}")
+        self.server.serve_forever()
+
+    def start(self):
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        return self.url()
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __init__(self, answer, flip_ms=DEFAULT_FLIP_MS, game_number=0, host="127.0.0.1", port=DEFAULT_PORT):
+        self.logger = logging.getLogger("standin")
+        game_config = {"answer": answer, "flipMs": flip_ms, "gameNumber": game_number}
+        handler = type("BoundStandinRequestHandler", (StandinRequestHandler,), {"game_config": game_config})
+        self.server = ThreadingHTTPServer((host, port), partial(handler, directory=STANDIN_DIR))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    parser = argparse.ArgumentParser(description="serve a local wordle stand-in page")
+    parser.add_argument("--answer", default="cheek")
+    parser.add_argument("--flip-ms", type=int, default=DEFAULT_FLIP_MS, help="tile flip duration")
+    parser.add_argument("--game-number", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    StandinServer(args.answer, args.flip_ms, args.game_number, args.host, args.port).serve_forever()
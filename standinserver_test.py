@@ -0,0 +1,41 @@
+import json
+import urllib.request
+
+import pytest
+
+from standinserver import StandinServer
+
+
+@pytest.fixture
+def standin():
+    standin_server = StandinServer("carpet", flip_ms=10, game_number=7, port=0)
+    url = standin_server.start()
+    yield url.rsplit("/", 1)[0]
+    standin_server.shutdown()
+
+
+def fetch(url):
+    with urllib.request.urlopen(url) as res:
+        return res.status, res.headers["Content-Type"], res.read().decode("utf-8")
+
+
+class TestStandinServer:
+
+    def test_serves_the_page(self, standin):
+        status, content_type, body = fetch(f"{standin}/index.html")
+
+        assert status == 200 and content_type == "text/html"
+        assert '<script src="config.js"></script>' in body
+
+    def test_config_carries_the_answer(self, standin):
+        status, content_type, body = fetch(f"{standin}/config.js")
+        prefix = "window.STANDIN_CONFIG = "
+
+        assert status == 200 and content_type == "application/javascript"
+        assert body.startswith(prefix)
+        config = json.loads(body[len(prefix):].strip().rstrip(";"))
+        assert config == {"answer": "carpet", "flipMs": 10, "gameNumber": 7}
+
+        # the page takes its word length from the configured answer
+        _, _, game = fetch(f"{standin}/game.js")
+        assert "const WORD_LENGTH = config.answer.length;" in game
@@ -0,0 +1,254 @@
+import logging
+import threading
+
+import numpy as np
+
+from wordlist import load_word_list
+
+# upper bound on guess x candidate cells histogrammed in one numpy call, and on guess x pattern
+# cells of histogram held at once, which for long words outgrow the candidates
+BLOCK_CELLS = 1 << 22
+
+# candidate count above which pattern histograms are built row by row
+ROW_COUNT_THRESHOLD = 2048
+
+
+# indexes of the k highest scores, highest first with ties in index order, without sorting
+# every score. candidates are kept in alphabetical order, so a tie picks the first word
+def top_k(scores, k):
+    if len(scores) > k:
+        kth = -np.partition(-scores, k - 1)[k - 1]
+        above = np.flatnonzero(scores > kth)
+        tied = np.flatnonzero(scores == kth)[:k - len(above)]
+        picks = np.concatenate([above, tied])
+    else:
+        picks = np.arange(len(scores))
+    return picks[np.lexsort((picks, -scores[picks]))]
+
+
+# the candidates followed by the other allowed guesses, so ties between a candidate and a
+# probe word go to the candidate that could still win
+def probe_order(candidates, guesses):
+    found = np.searchsorted(candidates, guesses)
+    is_candidate = candidates[np.minimum(found, len(candidates) - 1)] == guesses
+    return np.concatenate([candidates, guesses[~is_candidate]])
+
+
+# picks the guess with the most common letters, preferring common words late in the game
+class FrequencyStrategy:
+
+    name = "frequency"
+
+    # word scoring function that determines how common the letters are in a given word.
+    # adds preference for common words in attempts > 2, weighted by how common the word is
+    def get_commonality(self, word, attempt):
+        score = 0.0
+        for char in word:
+            score += self.char_frequency[char]
+        if attempt > 3 and word in self.word_weights:
+            score += self.word_weights[word]
+            self.logger.debug("added common word preference to %s", word)
+        return score / (len(word) - len(set(word)) + 1)
+
+    # get_commonality for every word in the list, only the common word bonus depends on the
+    # attempt so both variants are computed once up front
+    def build_scores(self, word_list):
+        word_index = word_list.word_index()
+        frequencies = np.array([self.char_frequency.get(char, 0.0) for char in word_index.alphabet])
+        letter_sums = frequencies[word_index.letters].sum(axis=1)
+        divisors = word_index.word_length - np.count_nonzero(word_index.counts, axis=1) + 1
+        weights = np.fromiter((self.word_weights.get(word, 0.0) for word in word_index.words), dtype=float,
+                              count=len(word_index.words))
+        self.word_index = word_index
+        self.early_scores = letter_sums / divisors
+        self.late_scores = (letter_sums + weights) / divisors
+
+    def scores_of(self, possible_words, attempt):
+        try:
+            candidates = np.sort(self.word_index.indices_of(possible_words))
+        except KeyError:
+            # words outside the scored list fall back to scoring one at a time
+            words = sorted(possible_words)
+            return words, np.array([self.get_commonality(word, attempt) for word in words])
+        scores = self.late_scores if attempt > 3 else self.early_scores
+        return self.word_index.words_at(candidates), scores[candidates]
+
+    # candidates are scored in alphabetical order, so taking the first of the best scores keeps
+    # the alphabetical tie-break. scores do not depend on the candidates, so a probe word would
+    # learn nothing the strategy uses and guess_words is ignored
+    def select(self, possible_words, attempt, guess_words=None):
+        words, scores = self.scores_of(possible_words, attempt)
+        top = top_k(scores, 5)
+        top_candidates = [(words[idx], float(scores[idx])) for idx in top]
+        return top_candidates[0][0], top_candidates
+
+    def __init__(self, word_list=None):
+        self.logger = logging.getLogger("strategy")
+        word_list = word_list if word_list is not None else load_word_list()
+        self.char_frequency = word_list.char_frequency
+        self.word_weights = word_list.weights
+        self.build_scores(word_list)
+
+
+# picks the guess whose letters split the remaining candidates most evenly, with letter counts
+# kept over the live candidates and decremented as words are eliminated instead of recounted
+class AdaptiveStrategy:
+
+    name = "adaptive"
+
+    def recount(self, candidates):
+        letters = self.word_index.letters[candidates]
+        alphabet_size = len(self.word_index.alphabet)
+        self.positional = np.stack([
+            np.bincount(letters[:, pos], minlength=alphabet_size) for pos in range(self.word_index.word_length)
+        ])
+        self.containing = np.count_nonzero(self.word_index.counts[candidates], axis=0)
+        self.live = np.zeros(len(self.word_index.words), dtype=bool)
+        self.live[candidates] = True
+        self.live_count = len(candidates)
+
+    def eliminate(self, removed):
+        letters = self.word_index.letters[removed]
+        for pos in range(self.word_index.word_length):
+            self.positional[pos] -= np.bincount(letters[:, pos], minlength=len(self.word_index.alphabet))
+        self.containing -= np.count_nonzero(self.word_index.counts[removed], axis=0)
+        self.live[removed] = False
+        self.live_count -= len(removed)
+
+    # candidates only shrink over a game, any other set is a new game and is counted from scratch
+    def update(self, candidates):
+        if self.live is None or len(candidates) > self.live_count or not self.live[candidates].all():
+            self.recount(candidates)
+            return
+        keep = np.zeros_like(self.live)
+        keep[candidates] = True
+        self.eliminate(np.flatnonzero(self.live & ~keep))
+
+    # sum over positions of the entropy of the green, yellow and gray split each letter would give,
+    # a repeated letter only splits green from not green since its first use already tested presence
+    def score(self, guesses):
+        letters = self.word_index.letters[guesses]
+        positions = np.arange(self.word_index.word_length)
+        green = self.positional[positions, letters] / self.live_count
+        present = self.containing[letters] / self.live_count
+        first = self.first_use[guesses]
+        splits = [
+            green,
+            np.where(first, present - green, 0.0),
+            np.where(first, 1 - present, 1 - green),
+        ]
+
+        scores = np.zeros(len(guesses))
+        for split in splits:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores -= np.where(split > 0, split * np.log2(split), 0.0).sum(axis=1)
+        return scores
+
+    def select(self, possible_words, attempt, guess_words=None):
+        candidates = np.sort(self.word_index.indices_of(possible_words))
+        guesses = candidates
+        if guess_words is not None:
+            guesses = probe_order(candidates, self.word_index.indices_of(guess_words))
+        with self.lock:
+            self.update(candidates)
+            scores = self.score(guesses)
+
+        top = top_k(scores, 5)
+        top_candidates = list(zip(self.word_index.words_at(guesses[top]), scores[top].tolist()))
+        return top_candidates[0][0], top_candidates
+
+    def __init__(self, word_index=None):
+        self.word_index = word_index if word_index is not None else load_word_list().word_index()
+        letters = self.word_index.letters
+
+        # whether each letter is the first of its kind in the word
+        self.first_use = np.stack([
+            (letters[:, :pos] != letters[:, pos:pos + 1]).all(axis=1) for pos in range(self.word_index.word_length)
+        ], axis=1)
+
+        # counts over the candidates of the game in progress, shared by callers so updates are locked
+        self.lock = threading.Lock()
+        self.live = None
+        self.live_count = 0
+        self.positional = None
+        self.containing = None
+
+
+# picks the guess whose feedback splits the remaining candidates best, either by
+# maximizing the expected information or minimizing the expected candidates left
+class EntropyStrategy:
+
+    # histogram of feedback patterns for every guess row against the candidate columns
+    def pattern_counts(self, guesses, candidates):
+        matrix = self.feedback_matrix.matrix
+        pattern_count = self.feedback_matrix.pattern_count
+        full_columns = len(candidates) == len(self.feedback_matrix.words)
+        counts = np.empty((len(guesses), pattern_count), dtype=np.int64)
+
+        # long rows are cheapest counted one at a time, the per call overhead is amortized
+        if len(candidates) >= ROW_COUNT_THRESHOLD:
+            for idx, guess in enumerate(guesses):
+                row = matrix[guess] if full_columns else matrix[guess, candidates]
+                counts[idx] = np.bincount(row, minlength=pattern_count)
+            return counts
+
+        block_size = max(1, BLOCK_CELLS // max(len(candidates), pattern_count))
+        for start in range(0, len(guesses), block_size):
+            block = guesses[start:start + block_size]
+            patterns = matrix[np.ix_(block, candidates)]
+            # shift each row into its own range of bins so a single bincount covers the block
+            offsets = np.arange(len(block), dtype=np.int64)[:, None] * pattern_count
+            flat = np.bincount((patterns + offsets).ravel(), minlength=len(block) * pattern_count)
+            counts[start:start + len(block)] = flat.reshape(len(block), pattern_count)
+        return counts
+
+    # scores a block of guesses at a time, so only one block's histograms are ever allocated
+    def guess_scores(self, guesses, candidates):
+        block_size = max(1, BLOCK_CELLS // max(len(candidates), self.feedback_matrix.pattern_count))
+        scores = np.empty(len(guesses))
+        for start in range(0, len(guesses), block_size):
+            block = guesses[start:start + block_size]
+            scores[start:start + len(block)] = self.score(self.pattern_counts(block, candidates), len(candidates))
+        return scores
+
+    # higher is better for both metrics so ranking code is shared
+    def score(self, counts, total):
+        if self.metric == "expected":
+            return -(counts * counts).sum(axis=1) / total
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weighted = np.where(counts > 0, counts * np.log2(counts), 0.0)
+        return np.log2(total) - weighted.sum(axis=1) / total
+
+    def select(self, possible_words, attempt, guess_words=None):
+        candidates = np.sort(self.feedback_matrix.indices_of(possible_words))
+        if len(candidates) <= 2:
+            selected_word = self.feedback_matrix.words_at(candidates)[0]
+            return selected_word, [(word, 0.0) for word in self.feedback_matrix.words_at(candidates)]
+
+        guesses = candidates
+        if guess_words is not None:
+            guesses = probe_order(candidates, self.feedback_matrix.indices_of(guess_words))
+        scores = self.guess_scores(guesses, candidates)
+
+        top = top_k(scores, 5)
+        top_candidates = list(zip(self.feedback_matrix.words_at(guesses[top]), scores[top].tolist()))
+        return top_candidates[0][0], top_candidates
+
+    def __init__(self, feedback_matrix, metric="entropy"):
+        self.feedback_matrix = feedback_matrix
+        self.metric = metric
+        self.name = metric
+
+
+STRATEGY_NAMES = ["frequency", "adaptive", "entropy", "expected"]
+
+
+def get_strategy(name, feedback_matrix=None, word_index=None, word_list=None):
+    match name:
+        case "frequency":
+            return FrequencyStrategy(word_list)
+        case "adaptive":
+            return AdaptiveStrategy(word_index)
+        case "entropy" | "expected":
+            return EntropyStrategy(feedback_matrix, metric=name)
+    raise KeyError(f"unknown strategy {name}")
@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from feedback import get_feedback
+from openingbook import OpeningBook, load_opening_book
+from strategy import AdaptiveStrategy, EntropyStrategy, FrequencyStrategy, get_strategy, top_k
+from wordindex import WordIndex
+
+
+class TestStrategy:
+
+    def test_frequency_ties_break_alphabetically(self):
+        word, top_candidates = FrequencyStrategy().select(["hatch", "catch", "batch"], 0)
+        assert word == "batch"
+        assert len(top_candidates) == 3
+
+    def test_frequency_scores_match_get_commonality(self):
+        strategy = FrequencyStrategy()
+        words = ["cheek", "crane", "geese", "sassy", "zebra"]
+        for attempt in [0, 5]:
+            _, top_candidates = strategy.select(words, attempt)
+            assert {word: score for word, score in top_candidates} == {
+                word: strategy.get_commonality(word, attempt) for word in words
+            }
+
+    def test_top_k_orders_ties_by_index(self):
+        scores = np.array([1.0, 3.0, 2.0, 3.0, 2.0, 2.0, 0.5])
+        assert top_k(scores, 4).tolist() == [1, 3, 2, 4]
+        assert top_k(scores, 10).tolist() == np.argsort(-scores, kind="stable").tolist()
+
+    def test_adaptive_counts_follow_eliminations(self, small_words, small_matrix):
+        word_index = WordIndex(small_words)
+        strategy = AdaptiveStrategy(word_index)
+
+        possible_words = list(small_words)
+        while True:
+            word, top_candidates = strategy.select(possible_words, 0)
+            assert top_candidates == AdaptiveStrategy(word_index).select(possible_words, 0)[1]
+            if word == "patch":
+                break
+            possible_words = small_matrix.filter_words(word, get_feedback(word, "patch"), possible_words)
+
+        # a later game starts over from its own candidates
+        assert strategy.select(small_words, 0) == AdaptiveStrategy(word_index).select(small_words, 0)
+        assert strategy.live_count == len(small_words)
+
+    @pytest.mark.parametrize("metric", ["entropy", "expected"])
+    def test_entropy_prefers_splitting_guess(self, small_words, small_matrix, metric):
+        strategy = EntropyStrategy(small_matrix, metric=metric)
+
+        word, top_candidates = strategy.select(small_words, 0)
+
+        # a -atch word leaves most of the family sharing one pattern
+        assert not word.endswith("atch")
+        assert top_candidates[0][0] == word
+
+    # a block smaller than one histogram row still scores one guess at a time
+    def test_entropy_scores_in_blocks(self, small_words, small_matrix, monkeypatch):
+        strategy = EntropyStrategy(small_matrix)
+        guesses = np.arange(len(small_words))
+        candidates = np.arange(1, 8)
+        expected = strategy.score(strategy.pattern_counts(guesses, candidates), len(candidates))
+
+        monkeypatch.setattr("strategy.BLOCK_CELLS", small_matrix.pattern_count * 3)
+        assert np.allclose(strategy.guess_scores(guesses, candidates), expected)
+        monkeypatch.setattr("strategy.BLOCK_CELLS", 1)
+        assert np.allclose(strategy.guess_scores(guesses, candidates), expected)
+
+    def test_entropy_solves_family(self, small_words, small_matrix):
+        strategy = get_strategy("entropy", small_matrix)
+
+        for answer in small_words:
+            possible_words = list(small_words)
+            for _ in range(6):
+                word, _ = strategy.select(possible_words, 0)
+                if word == answer:
+                    break
+                possible_words = small_matrix.filter_words(word, get_feedback(word, answer), possible_words)
+            assert word == answer
+
+    def test_opening_book_round_trip(self, small_words, small_matrix, tmp_path):
+        strategy = get_strategy("entropy", small_matrix)
+        first_word, _ = strategy.select(small_words, 0)
+
+        built = load_opening_book(strategy, small_matrix, cache_dir=str(tmp_path))
+        loaded = OpeningBook("entropy", small_words, cache_dir=str(tmp_path))
+
+        assert loaded.load()
+        assert loaded.entries == built.entries
+        assert loaded.lookup([]) == first_word
+
+        code = small_matrix.pattern(first_word, "watch")
+        remaining = small_matrix.filter_words(first_word, get_feedback(first_word, "watch"), small_words)
+        assert loaded.lookup([(first_word, code)]) == strategy.select(remaining, 1)[0]
+        assert loaded.lookup([(first_word, code), ("watch", code)]) is None
+
+    def test_opening_book_ignores_other_word_lists(self, small_words, small_matrix, tmp_path):
+        load_opening_book(get_strategy("entropy", small_matrix), small_matrix, cache_dir=str(tmp_path))
+
+        assert not OpeningBook("entropy", small_words[1:], cache_dir=str(tmp_path)).load()
+
+    def test_opening_book_plays_probes_in_full_mode(self, small_words, small_matrix, tmp_path):
+        strategy = get_strategy("entropy", small_matrix)
+        load_opening_book(strategy, small_matrix, cache_dir=str(tmp_path))
+        assert not OpeningBook("entropy", small_words, cache_dir=str(tmp_path), guess_mode="full").load()
+
+        book = load_opening_book(strategy, small_matrix, cache_dir=str(tmp_path), guess_mode="full")
+        first_word = book.lookup([])
+        probes = [word for word in small_words if word != first_word]
+        for answer in small_words:
+            remaining = small_matrix.filter_words(first_word, get_feedback(first_word, answer), small_words)
+            if answer == first_word or len(remaining) <= 2:
+                continue
+            second_word = book.lookup([(first_word, small_matrix.pattern(first_word, answer))])
+            assert second_word == strategy.select(remaining, 1, probes)[0]
@@ -0,0 +1,119 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+TRACE_FILE = "trace.json"
+CHROME_TRACE_FILE = "trace_chrome.json"
+
+_NULL_SPAN = nullcontext()
+
+
+# one timed phase of a run, times are perf_counter nanoseconds
+class Span:
+
+    def to_dict(self, origin_ns):
+        return {
+            "name": self.name,
+            "category": self.category,
+            "start_ms": (self.start_ns - origin_ns) / 1e6,
+            "duration_ms": self.duration_ns / 1e6,
+            "thread": self.thread_id,
+            "args": self.args,
+        }
+
+    def to_trace_event(self, origin_ns, pid):
+        return {
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": (self.start_ns - origin_ns) / 1e3,
+            "dur": self.duration_ns / 1e3,
+            "pid": pid,
+            "tid": self.thread_id,
+            "args": self.args,
+        }
+
+    def __init__(self, name, category, start_ns, duration_ns, thread_id, args):
+        self.name = name
+        self.category = category
+        self.start_ns = start_ns
+        self.duration_ns = duration_ns
+        self.thread_id = thread_id
+        self.args = args
+
+
+# records named spans for each phase of a run and writes them out as json and as
+# chrome trace events, a disabled tracer hands out a shared no-op context
+class Tracer:
+
+    def span(self, name, category, **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return self.timed_span(name, category, args)
+
+    @contextmanager
+    def timed_span(self, name, category, args):
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add_span(name, category, start_ns, time.perf_counter_ns() - start_ns, **args)
+
+    # for phases measured elsewhere, such as waits timed inside the page
+    def add_span(self, name, category, start_ns, duration_ns, **args):
+        if not self.enabled:
+            return
+        span = Span(name, category, start_ns, duration_ns, threading.get_ident(), args)
+        with self.lock:
+            self.spans.append(span)
+
+    def summary(self):
+        totals = {}
+        with self.lock:
+            spans = list(self.spans)
+        for span in spans:
+            total = totals.setdefault(span.name, {"category": span.category, "count": 0, "total_ms": 0.0})
+            total["count"] += 1
+            total["total_ms"] += span.duration_ns / 1e6
+        return totals
+
+    def write_json(self, path):
+        with self.lock:
+            spans = [span.to_dict(self.origin_ns) for span in self.spans]
+        with open(path, "w") as f:
+            json.dump({"summary": self.summary(), "spans": spans}, f, indent=1)
+
+    def write_chrome_trace(self, path):
+        pid = os.getpid()
+        with self.lock:
+            events = [span.to_trace_event(self.origin_ns, pid) for span in self.spans]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def export(self, output_dir):
+        if not self.enabled:
+            return
+        self.write_json(f"{output_dir}/{TRACE_FILE}")
+        self.write_chrome_trace(f"{output_dir}/{CHROME_TRACE_FILE}")
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.origin_ns = time.perf_counter_ns()
+        self.spans = []
+        self.lock = threading.Lock()
+
+
+# the process wide tracer, disabled until a run enables it
+_tracer = Tracer(enabled=False)
+
+
+def get_tracer():
+    return _tracer
+
+
+def enable_tracing():
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
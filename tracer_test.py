@@ -0,0 +1,33 @@
+import json
+
+from tracer import Tracer
+
+
+class TestTracer:
+
+    def test_disabled_tracer_records_nothing(self, tmp_path):
+        tracer = Tracer(enabled=False)
+        with tracer.span("solver.filter", "solver"):
+            pass
+        tracer.export(str(tmp_path))
+
+        assert tracer.spans == []
+        assert list(tmp_path.iterdir()) == []
+
+    def test_export(self, tmp_path):
+        tracer = Tracer()
+        with tracer.span("solver.score", "solver", attempt=0):
+            with tracer.span("solver.filter", "solver"):
+                pass
+        with tracer.span("solver.filter", "solver"):
+            pass
+        tracer.export(str(tmp_path))
+
+        trace = json.loads((tmp_path / "trace.json").read_text())
+        chrome = json.loads((tmp_path / "trace_chrome.json").read_text())
+
+        assert trace["summary"]["solver.filter"]["count"] == 2
+        score = next(span for span in trace["spans"] if span["name"] == "solver.score")
+        assert score["args"] == {"attempt": 0}
+        assert {event["ph"] for event in chrome["traceEvents"]} == {"X"}
+        assert len(chrome["traceEvents"]) == 3
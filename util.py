@@ -1,10 +1,28 @@
 import time
 import os
 import logging
+import tempfile
+from contextlib import contextmanager
 from datetime import date
 from distutils.util import strtobool
 
 
+# writes through a temporary file that replaces path only once the block completes, so a
+# concurrent reader never sees a partial file and a failed write leaves the old one in place.
+# every writer gets its own temporary file, threads of one process can write the same path
+@contextmanager
+def atomic_write(path, mode="w"):
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{os.path.basename(path)}.", suffix=".tmp",
+                                    dir=os.path.dirname(path) or None)
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
 class Util:
 
     def current_milli_time(self):
@@ -16,15 +34,21 @@ class Util:
     def ms_from_secs(self, seconds):
         return seconds * 1000
 
-    def get_bool_from_env(self, env_name):
+    def get_bool_from_env(self, env_name, default=None):
         env_val = os.getenv(env_name)
 
         if env_val is None:
+            if default is not None:
+                return default
             raise KeyError(f"ENV var not set {env_name}")
 
         env_bool = bool(strtobool(env_val))
         return env_bool
 
+    # how the daily run is profiled, one of profiler.PROFILE_MODES and off unless set
+    def get_profile_mode(self):
+        return os.getenv("PROFILE", "off").strip().lower()
+
     def get_app_dir(self):
         return os.path.dirname(os.path.realpath(__file__))
 
@@ -0,0 +1,100 @@
+import numpy as np
+
+# letters a dictionary may use, one bit each in a uint64 mask
+MAX_ALPHABET_SIZE = 64
+
+
+# the smallest unsigned type with a bit for every letter of an alphabet
+def letter_mask_dtype(alphabet_size):
+    return np.uint32 if alphabet_size <= 32 else np.uint64
+
+
+# the distinct letters of a word list in sorted order, a letter is encoded as its position
+def word_alphabet(words):
+    return "".join(sorted(set("".join(words))))
+
+
+# encode a list of words as an (n, word_length) array of letter indexes into the alphabet,
+# by default the word list's own
+def encode_words(words, alphabet=None):
+    if len(words) == 0:
+        return np.zeros((0, 0), dtype=np.uint8)
+    alphabet = alphabet if alphabet is not None else word_alphabet(words)
+    joined = "".join(words)
+    if alphabet.isascii() and joined.isascii():
+        table = np.zeros(128, dtype=np.uint8)
+        table[np.frombuffer(alphabet.encode("ascii"), dtype=np.uint8)] = np.arange(len(alphabet))
+        letters = table[np.frombuffer(joined.encode("ascii"), dtype=np.uint8)]
+    else:
+        index = {letter: idx for idx, letter in enumerate(alphabet)}
+        letters = np.fromiter((index[letter] for letter in joined), dtype=np.uint8, count=len(joined))
+    return letters.reshape(len(words), -1)
+
+
+# a word list in sorted order and every word's position in it, so the same words give the
+# same indexes in every structure built over them
+class SortedWords:
+
+    def all_indices(self):
+        return np.arange(len(self.words))
+
+    def index_of(self, word):
+        return self.index[word]
+
+    def indices_of(self, words):
+        return np.fromiter((self.index[word] for word in words), dtype=np.int64, count=len(words))
+
+    def words_at(self, indices):
+        return self.word_array[indices].tolist()
+
+    def __init__(self, words):
+        # sorted so indexes and cache keys do not depend on set ordering
+        self.words = sorted(words)
+        self.word_array = np.array(self.words)
+        self.index = {word: idx for idx, word in enumerate(self.words)}
+        self.word_length = len(self.words[0])
+
+
+# a sorted word list pre-encoded as integer arrays so candidate filtering is vectorized
+class WordIndex(SortedWords):
+
+    # remaining candidate indexes consistent with every revealed hint
+    def filter(self, constraints, candidates):
+        keep = np.ones(len(candidates), dtype=bool)
+        for idx, mask in enumerate(constraints.allowed):
+            keep &= (self.bits[candidates, idx] & mask) != 0
+
+        # only letters with a known count are compared
+        for letter in constraints.counted_letters():
+            counts = self.counts[candidates, letter]
+            keep &= (counts >= constraints.min_count[letter]) & (counts <= constraints.max_count[letter])
+        return candidates[keep]
+
+    # guesses that use every revealed hint as hard mode requires, correct letters stay in
+    # place and present letters are played at least as many times as they are known to occur
+    def hard_mode_filter(self, constraints, guesses):
+        keep = np.ones(len(guesses), dtype=bool)
+        for idx, letter in enumerate(constraints.correct):
+            if letter >= 0:
+                keep &= self.letters[guesses, idx] == letter
+        for letter in np.flatnonzero(constraints.min_count):
+            keep &= self.counts[guesses, letter] >= constraints.min_count[letter]
+        return guesses[keep]
+
+    def __init__(self, words, alphabet=None):
+        super().__init__(words)
+
+        # the letters words are encoded against, a dictionary's own unless given
+        self.alphabet = alphabet if alphabet is not None else word_alphabet(self.words)
+        if len(self.alphabet) > MAX_ALPHABET_SIZE:
+            raise ValueError(f"alphabet of {len(self.alphabet)} letters, at most {MAX_ALPHABET_SIZE} are supported")
+
+        # (words, word_length) letter indexes and their single bit masks
+        self.letters = encode_words(self.words, self.alphabet)
+        mask_dtype = letter_mask_dtype(len(self.alphabet))
+        self.bits = np.left_shift(mask_dtype(1), self.letters.astype(mask_dtype))
+
+        # (words, alphabet) occurrences of every letter in each word
+        self.counts = np.zeros((len(self.words), len(self.alphabet)), dtype=np.uint8)
+        for idx in range(self.word_length):
+            np.add.at(self.counts, (np.arange(len(self.words)), self.letters[:, idx]), 1)
@@ -10,6 +10,7 @@ from wordlesolver import WordleSolver
 class MockBrowserWrapper:
     def __init__(self, target_word):
         self.target_word = target_word
+        self.time_waiting_ms = 0
 
     def submit_word(self, word, _):
 
@@ -1,105 +1,78 @@
 import logging
-import operator
-import os
-import string
-from collections import Counter
 from datetime import date
-from itertools import chain
-from pathlib import Path
+from constraints import Constraints
+from feedback import encode_results
 from result import Result
+from strategy import FrequencyStrategy
+from tracer import get_tracer
+from wordlist import load_word_list
 
 MAX_ATTEMPTS = 6
-MAX_WORD_LENGTH = 5
 
-ALLOWED_STRINGS_FILE = f"{os.path.dirname(os.path.realpath(__file__))}/allowed_strings.txt"
-VALID_CHARS = set(string.ascii_letters)
+# where guesses are drawn from: the remaining candidates, any word that uses every revealed
+# hint as hard mode requires, or any allowed word as an information gathering probe
+GUESS_MODES = ["candidates", "hard", "full"]
 
-# set comprehension to generate a set of valid wordle words
-WORDS = {
-    word.split(',')[1].lower()
-    for word in Path(ALLOWED_STRINGS_FILE).read_text().splitlines()
-}
-
-# a list of words marked as common, sourced from the google 10000 list
-COMMON_WORDS = {
-    word.split(',')[1].lower()
-    for word in Path(ALLOWED_STRINGS_FILE).read_text().splitlines()
-    if word.split(',')[0] == '1'
-}
-
-# a count of letter occurrences in the words list
-CHAR_COUNT = Counter(chain.from_iterable(WORDS))
-
-# a set of all characters and their frequencies in WORDS
-CHAR_FREQUENCY = {
-    char: value / sum(CHAR_COUNT.values())
-    for char, value in CHAR_COUNT.items()
-}
+# GUESS_MODES without hard mode, for the searches that do not track the hints revealed so far
+OPEN_GUESS_MODES = ["candidates", "full"]
 
 
 class WordleSolver:
-    # word scoring function that determines how common the letters are in a given word.
-    # adds preference for common words in attempts > 2
-    def get_commonality(self, word, attempt):
-        score = 0.0
-        for char in word:
-            score += CHAR_FREQUENCY[char]
-        if attempt > 3 and word in COMMON_WORDS:
-            score += 1
-            self.logger.info(f"added common word preference to {word}")
-        return score / (MAX_WORD_LENGTH - len(set(word)) + 1)
-
-    # sort words by character frequency
-    def sort_by_commonality(self, words, attempt):
-        sort_by = operator.itemgetter(1)
-        return sorted(
-            [(word, self.get_commonality(word, attempt)) for word in words],
-            key=sort_by,
-            reverse=True,
-        )
-
     # prints the commonality of the supplied list of words
     def print_frequency(self, word_commonalities):
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         for (word, freq) in word_commonalities:
             template = f"{word.upper():<5} | {freq:<5.4}"
             self.logger.info(template)
 
-    def apply_vector(self, word, word_vector):
-        for letter, v_letter in zip(word, word_vector):
-            if letter not in v_letter:
-                return False
-        return True
-
-    def filter(self, word_vector, possible_words):
-        return [word for word in possible_words if self.apply_vector(word, word_vector)]
-
-    def get_most_likely_word(self, possible_words, attempt):
+    def filter(self, constraints, candidates):
+        with get_tracer().span("solver.filter", "solver", candidates=len(candidates)):
+            return self.word_index.filter(constraints, candidates)
+
+    def get_book_word(self, history):
+        if self.opening_book is None:
+            return None
+        return self.opening_book.lookup(history)
+
+    # allowed guesses for the next attempt, narrowed from the previous pool so the played word
+    # and, in hard mode, anything ignoring a revealed hint drop out
+    def next_guess_pool(self, guess_pool, constraints, word):
+        guess_pool = guess_pool[guess_pool != self.word_index.index_of(word)]
+        if self.guess_mode == "hard":
+            guess_pool = self.word_index.hard_mode_filter(constraints, guess_pool)
+        return guess_pool
+
+    # with two or fewer candidates left guessing one of them is always best
+    def get_guess_words(self, guess_pool, candidates):
+        if self.guess_mode == "candidates" or len(candidates) <= 2:
+            return None
+        return self.word_index.words_at(guess_pool)
+
+    def get_most_likely_word(self, possible_words, attempt, history=(), guess_words=None):
         if len(possible_words) <= 0:
             self.logger.error("all words eliminated")
 
-        idx = 0
-        sorted_words = self.sort_by_commonality(possible_words, attempt)
-        word_options_with_same_commonality = [sorted_words[idx]]
-
-        # make a list of words with same commonality as selected word
-        while len(sorted_words) > 1 and sorted_words[0][1] == sorted_words[idx + 1][1]:
-            word_options_with_same_commonality.append(sorted_words[idx + 1])
-            idx += 1
-
-        # alpha sort words with same commonality them for idempotency
-        word_options_with_same_commonality.sort(key=lambda y: y[0])
-
-        selected_word = word_options_with_same_commonality[0][0]
-        possible_words.remove(selected_word)
-        return selected_word, sorted_words[:5]
+        with get_tracer().span("solver.score", "solver", attempt=attempt, candidates=len(possible_words)):
+            selected_word = self.get_book_word(history)
+            if selected_word is not None:
+                self.logger.info("%s selected from opening book", selected_word.upper())
+                top_candidates = []
+            else:
+                selected_word, top_candidates = self.strategy.select(possible_words, attempt, guess_words)
+        return selected_word, top_candidates
 
     def solve_wordle(self):
         start_time_ms = self.util.current_milli_time()
         self.logger.info(f"solving wordle {date.today()}")
-        solved, word = self.solve()
+        with get_tracer().span("solver.solve", "solver"):
+            solved, word = self.solve()
 
         end_time_ms = self.util.current_milli_time()
         total_time = end_time_ms - start_time_ms
+
+        # waits are tracked by the browser wrapper as it sleeps or blocks on the page
+        self.time_waiting_ms = self.browser_wrapper.time_waiting_ms
         self.time_to_solve = total_time - self.time_waiting_ms
         self.logger.info(f"time waiting {self.time_waiting_ms} ms")
         self.logger.info(f"calculated time to solve {self.time_to_solve} ms")
@@ -110,44 +83,48 @@ class WordleSolver:
         return solved, self.time_to_solve
 
     def solve(self):
-        possible_words = WORDS.copy()
-        word_vector = [set(string.ascii_lowercase) for _ in range(MAX_WORD_LENGTH)]
+        candidates = self.word_index.all_indices()
+        guess_pool = candidates
+        possible_words = self.word_index.words_at(candidates)
+        constraints = Constraints(self.word_index.word_length, self.word_index.alphabet)
+        history = []
 
         for attempt_count in range(0, MAX_ATTEMPTS):
-            self.logger.info(f"beginning attempt {attempt_count}/{MAX_ATTEMPTS}")
-            self.logger.info(f"{len(possible_words)} possible words")
+            self.logger.info("beginning attempt %d/%d", attempt_count, MAX_ATTEMPTS)
+            self.logger.info("%d possible words", len(possible_words))
 
-            word, top_candidates = self.get_most_likely_word(possible_words, attempt_count)
+            guess_words = self.get_guess_words(guess_pool, candidates)
+            word, top_candidates = self.get_most_likely_word(possible_words, attempt_count, history, guess_words)
             self.print_frequency(top_candidates)
-            self.logger.info(f"{word.upper()} is the most likely answer")
+            self.logger.info("%s is the most likely answer", word.upper())
 
             letter_results = self.browser_wrapper.submit_word(word, attempt_count)
-            self.logger.info(f"results of {word.upper()}")
+            self.logger.info("results of %s", word.upper())
 
-            self.evaluate_results(letter_results, word, word_vector)
-            if letter_results.count(Result.CORRECT) == MAX_WORD_LENGTH:
+            self.evaluate_results(letter_results, word, constraints)
+            if letter_results.count(Result.CORRECT) == self.word_index.word_length:
                 return True, word
 
-            possible_words = self.filter(word_vector, possible_words)
+            history.append((word, encode_results(letter_results)))
+            if self.feedback_matrix is None:
+                candidates = self.filter(constraints, candidates)
+            else:
+                with get_tracer().span("solver.filter", "solver", candidates=len(candidates)):
+                    candidates = self.feedback_matrix.filter(word, letter_results, candidates)
+            possible_words = self.word_index.words_at(candidates)
+            if self.guess_mode != "candidates":
+                guess_pool = self.next_guess_pool(guess_pool, constraints, word)
         return False, ""
 
-    def evaluate_results(self, letter_results, word, word_vector):
-        for idx, status in enumerate(letter_results):
-            message_template = f"letter {word[idx].upper()} {status}"
-            match status:
-                case Result.CORRECT:
-                    self.logger.info(message_template)
-                    word_vector[idx] = {word[idx]}
-                case Result.PRESENT:
-                    self.logger.info(message_template)
-                    word_vector[idx].discard(word[idx])
-                case Result.ABSENT:
-                    self.logger.info(message_template)
-                    for vector in word_vector:
-                        if len(vector) != 1:
-                            vector.discard(word[idx])
-
-    def __init__(self, output_dir, browser_wrapper, util):
+    def evaluate_results(self, letter_results, word, constraints):
+        # batch solves run with info disabled, skip the per letter messages entirely
+        if self.logger.isEnabledFor(logging.INFO):
+            for idx, status in enumerate(letter_results):
+                self.logger.info("letter %s %s", word[idx].upper(), status)
+        constraints.apply(word, letter_results)
+
+    def __init__(self, output_dir, browser_wrapper, util, feedback_matrix=None, strategy=None, opening_book=None,
+                 word_index=None, guess_mode="candidates"):
         self.logger = logging.getLogger("solver")
         self.logger.info('initializing wordleSolver')
 
@@ -157,6 +134,23 @@ class WordleSolver:
         self.output_dir = output_dir
         self.browser_wrapper = browser_wrapper
 
+        # optional precomputed feedback patterns, filters candidates with a row lookup
+        self.feedback_matrix = feedback_matrix
+
+        # guess selection strategy, defaults to the letter frequency heuristic
+        self.strategy = strategy if strategy is not None else FrequencyStrategy()
+
+        # precomputed opening guesses for the strategy, consulted before any scoring
+        self.opening_book = opening_book
+
+        # pre-encoded words the answer is drawn from, defaults to the full allowed list
+        self.word_index = word_index if word_index is not None else load_word_list().word_index()
+
+        # one of GUESS_MODES, candidates only unless probing or playing hard mode
+        if guess_mode not in GUESS_MODES:
+            raise ValueError(f"unknown guess mode {guess_mode}")
+        self.guess_mode = guess_mode
+
         # time spent waiting on wordle to return results or animation tiles
         self.time_waiting_ms = 0
 
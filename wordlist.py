@@ -0,0 +1,220 @@
+import hashlib
+import logging
+import os
+import re
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from tracer import get_tracer
+from util import atomic_write
+from wordindex import MAX_ALPHABET_SIZE, WordIndex, encode_words, word_alphabet
+
+# word lengths the engine supports, feedback patterns for 8 letters still fit in a uint16
+MIN_WORD_LENGTH = 4
+MAX_WORD_LENGTH = 8
+
+ALLOWED_STRINGS_FILE = f"{os.path.dirname(os.path.realpath(__file__))}/allowed_strings.txt"
+
+# named dictionaries for variant games, dictionaries/<name>.txt in the same format as the allowed words
+DEFAULT_DICTIONARY = "default"
+DICTIONARY_DIR = f"{os.path.dirname(os.path.realpath(__file__))}/dictionaries"
+DICTIONARY_NAME = re.compile(r"^[a-z0-9_-]+$")
+
+# word lists kept loaded at once, the least recently used is dropped beyond this
+WORD_LIST_CACHE_SIZE = 8
+
+# binary index layout: header, the alphabet as utf-8, one byte per letter holding its index
+# into the alphabet, commonness weights, letter counts
+INDEX_MAGIC = b"WLIX"
+INDEX_VERSION = 3
+INDEX_HEADER = struct.Struct("<4sIIII")
+
+# word lists loaded in this process, keyed by source path, least recently used first
+_word_lists = OrderedDict()
+_word_lists_lock = threading.Lock()
+
+
+def content_digest(path):
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()[:16]
+
+
+# parse the 'weight,word' source file into sorted words and their commonness weights. the
+# weight is 0 for rare words and up to 1 for the most common, older files use 0/1 flags and
+# a custom dictionary may list bare words
+def parse_word_file(path):
+    weights = {}
+    for line_number, line in enumerate(Path(path).read_text(encoding="utf-8").splitlines(), start=1):
+        if not line.strip():
+            continue
+        weight, _, word = line.strip().rpartition(',')
+        word = word.lower()
+        if not word.isalpha():
+            raise ValueError(f"{path}:{line_number} {word!r} is not a word")
+        weights[word] = float(weight) if weight else 0.0
+
+    lengths = {len(word) for word in weights}
+    if len(lengths) != 1:
+        raise ValueError(f"{path} needs words of a single length, found {sorted(lengths)}")
+    if not MIN_WORD_LENGTH <= lengths.pop() <= MAX_WORD_LENGTH:
+        raise ValueError(f"{path} words must be {MIN_WORD_LENGTH} to {MAX_WORD_LENGTH} letters")
+    words = sorted(weights)
+    alphabet = word_alphabet(words)
+    if len(alphabet) > MAX_ALPHABET_SIZE:
+        raise ValueError(f"{path} uses {len(alphabet)} letters, at most {MAX_ALPHABET_SIZE} are supported")
+    return words, [weights[word] for word in words], alphabet
+
+
+# the allowed words and their letter statistics, read from a binary index that is built
+# from the source file on first use and memory mapped on later runs
+class WordList:
+
+    def index_path(self):
+        stem = Path(self.source_path).stem
+        return f"{self.cache_dir}/{stem}.{content_digest(self.source_path)}.idx"
+
+    # indexes of earlier versions of the source file are never read again
+    def remove_stale_indexes(self, path):
+        stale = re.compile(rf"^{re.escape(Path(self.source_path).stem)}\.[0-9a-f]{{16}}\.idx$")
+        for other in Path(self.cache_dir).iterdir():
+            if stale.match(other.name) and str(other) != path:
+                other.unlink(missing_ok=True)
+                self.logger.info(f"removed stale word index {other}")
+
+    def build_index(self, path):
+        self.logger.info(f"building word index for {self.source_path}")
+        words, weights, alphabet = parse_word_file(self.source_path)
+        word_length = len(words[0])
+        encoded_alphabet = alphabet.encode("utf-8")
+
+        letters = encode_words(words, alphabet).ravel()
+        char_count = np.bincount(letters, minlength=len(alphabet)).astype(np.uint32)
+
+        with atomic_write(path, "wb") as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(words), word_length, len(encoded_alphabet)))
+            f.write(encoded_alphabet)
+            f.write(letters.tobytes())
+            f.write(np.array(weights, dtype=np.float32).tobytes())
+            f.write(char_count.tobytes())
+        self.logger.info(f"saved word index to {path}")
+        self.remove_stale_indexes(path)
+
+    def load_index(self):
+        path = self.index_path()
+        if not os.path.exists(path):
+            self.build_index(path)
+
+        data = np.memmap(path, dtype=np.uint8, mode="r")
+        header = INDEX_HEADER.unpack(bytes(data[:INDEX_HEADER.size]))
+        magic, version, word_count, word_length, alphabet_bytes = header
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self.build_index(path)
+            return self.load_index()
+
+        offset = INDEX_HEADER.size
+        alphabet = bytes(data[offset:offset + alphabet_bytes]).decode("utf-8")
+        offset += alphabet_bytes
+        packed = data[offset:offset + word_count * word_length]
+        offset += len(packed)
+        weights = data[offset:offset + word_count * 4].view(np.float32)
+        offset += word_count * 4
+        char_count = data[offset:offset + len(alphabet) * 4].view(np.uint32)
+
+        self.word_length = word_length
+        self.alphabet = alphabet
+        self.letters = packed.reshape(word_count, word_length)
+        self.weights_array = weights
+        self.packed = packed
+        self.char_count_array = char_count
+
+    # the words spelled out from their letter indexes, a single table lookup for ascii alphabets
+    def decode_words(self):
+        if self.alphabet.isascii():
+            table = np.frombuffer(self.alphabet.encode("ascii"), dtype=np.uint8)
+            text = table[self.packed].tobytes().decode("ascii")
+        else:
+            text = "".join(self.alphabet[letter] for letter in self.packed.tolist())
+        length = self.word_length
+        return [text[i:i + length] for i in range(0, len(text), length)]
+
+    def word_index(self):
+        if self._word_index is None:
+            self._word_index = WordIndex(self.words, self.alphabet)
+        return self._word_index
+
+    def __init__(self, source_path=ALLOWED_STRINGS_FILE, cache_dir=None):
+        self.logger = logging.getLogger("wordlist")
+        self.source_path = source_path
+        # the index is cached next to the source file unless told otherwise
+        self.cache_dir = cache_dir if cache_dir is not None else os.path.dirname(os.path.realpath(source_path))
+        self._word_index = None
+
+        with get_tracer().span("wordlist.load", "startup", source=source_path):
+            self.load_index()
+
+        self.words = self.decode_words()
+
+        # how common each word is, from 0 for words missing from every frequency source up to 1
+        self.weights = {self.words[idx]: float(self.weights_array[idx]) for idx in np.flatnonzero(self.weights_array)}
+
+        # a list of words marked as common, any word found in a frequency source
+        self.common_words = set(self.weights)
+
+        # a count of letter occurrences in the words list
+        self.char_count = {
+            self.alphabet[idx]: int(count)
+            for idx, count in enumerate(self.char_count_array)
+            if count > 0
+        }
+
+        # a set of all characters and their frequencies in the words list
+        total = sum(self.char_count.values())
+        self.char_frequency = {char: count / total for char, count in self.char_count.items()}
+
+
+# the word list for a source file, loaded on first use and kept until WORD_LIST_CACHE_SIZE
+# other lists have been used since
+def load_word_list(source_path=ALLOWED_STRINGS_FILE):
+    with _word_lists_lock:
+        word_list = _word_lists.get(source_path)
+        if word_list is None:
+            word_list = WordList(source_path)
+            _word_lists[source_path] = word_list
+            if len(_word_lists) > WORD_LIST_CACHE_SIZE:
+                evicted, _ = _word_lists.popitem(last=False)
+                logging.getLogger("wordlist").info(f"evicted word list {evicted}")
+        _word_lists.move_to_end(source_path)
+        return word_list
+
+
+def dictionary_path(name):
+    if name == DEFAULT_DICTIONARY:
+        return ALLOWED_STRINGS_FILE
+    if not DICTIONARY_NAME.match(name):
+        raise ValueError(f"invalid dictionary name {name!r}")
+    path = f"{DICTIONARY_DIR}/{name}.txt"
+    if not os.path.exists(path):
+        raise LookupError(f"no dictionary {name}")
+    return path
+
+
+# a named dictionary, see DICTIONARY_DIR
+def load_dictionary(name=DEFAULT_DICTIONARY):
+    return load_word_list(dictionary_path(name))
+
+
+# the module level names older callers import, resolved lazily on first access
+def __getattr__(name):
+    match name:
+        case "WORDS":
+            return set(load_word_list().words)
+        case "COMMON_WORDS":
+            return load_word_list().common_words
+        case "CHAR_COUNT":
+            return load_word_list().char_count
+        case "CHAR_FREQUENCY":
+            return load_word_list().char_frequency
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+
+import pytest
+
+import wordlist
+from wordlist import WordList, load_word_list
+
+SOURCE = "0,hatch\n1,catch\n0,eerie\n1,abide\n"
+
+
+class TestWordList:
+
+    def test_index_is_built_then_reused(self, tmp_path):
+        source = tmp_path / "words.txt"
+        source.write_text(SOURCE)
+
+        built = WordList(str(source))
+        index_files = list(tmp_path.glob("words.*.idx"))
+        loaded = WordList(str(source))
+
+        assert len(index_files) == 1
+        assert loaded.words == built.words == ["abide", "catch", "eerie", "hatch"]
+        assert loaded.common_words == {"abide", "catch"}
+        assert loaded.char_count["e"] == 4
+        assert abs(sum(loaded.char_frequency.values()) - 1) < 1e-9
+
+    def test_index_follows_source_changes(self, tmp_path):
+        source = tmp_path / "words.txt"
+        source.write_text(SOURCE)
+        other = tmp_path / "words.old.txt"
+        other.write_text(SOURCE)
+        WordList(str(source))
+        WordList(str(other))
+
+        source.write_text(SOURCE + "1,zesty\n")
+
+        assert "zesty" in WordList(str(source)).common_words
+        assert len(list(tmp_path.glob("words.????????????????.idx"))) == 1
+        assert len(list(tmp_path.glob("words.old.*.idx"))) == 1
+
+    def test_weights_are_read_from_the_source(self, tmp_path):
+        source = tmp_path / "words.txt"
+        source.write_text("0.25,hatch\n1,catch\n0,eerie\n")
+
+        word_list = WordList(str(source))
+
+        assert word_list.weights == {"catch": 1.0, "hatch": 0.25}
+        assert word_list.common_words == {"catch", "hatch"}
+
+    def test_bare_words_of_other_lengths(self, tmp_path):
+        source = tmp_path / "six.txt"
+        source.write_text("planet\nORANGE\n0.5,bright\n")
+
+        word_list = WordList(str(source))
+
+        assert word_list.words == ["bright", "orange", "planet"]
+        assert word_list.word_length == 6
+        assert word_list.common_words == {"bright"}
+
+    def test_alphabet_is_read_from_the_words(self, tmp_path):
+        source = tmp_path / "words.txt"
+        source.write_text("naïve\nhatch\n0.5,größe\n", encoding="utf-8")
+
+        built = WordList(str(source))
+        loaded = WordList(str(source))
+        word_index = loaded.word_index()
+
+        assert loaded.words == built.words == ["größe", "hatch", "naïve"]
+        assert loaded.alphabet == "aceghnrtvßïö"
+        assert loaded.char_count["ï"] == 1
+        assert word_index.words_at(word_index.letters[:, 3] == loaded.alphabet.index("v")) == ["naïve"]
+
+    @pytest.mark.parametrize("text", ["0,hatch\n0,latches\n", "0,abc\n", "0,ha-ch\n"])
+    def test_invalid_dictionaries(self, tmp_path, text):
+        source = tmp_path / "words.txt"
+        source.write_text(text)
+        with pytest.raises(ValueError):
+            WordList(str(source))
+
+    def test_least_recently_used_list_is_evicted(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(wordlist, "WORD_LIST_CACHE_SIZE", 2)
+        monkeypatch.setattr(wordlist, "_word_lists", OrderedDict())
+        paths = []
+        for name in ["one", "two", "three"]:
+            paths.append(tmp_path / f"{name}.txt")
+            paths[-1].write_text(SOURCE)
+
+        first = load_word_list(str(paths[0]))
+        load_word_list(str(paths[1]))
+        assert load_word_list(str(paths[0])) is first
+        load_word_list(str(paths[2]))
+
+        assert list(wordlist._word_lists) == [str(paths[0]), str(paths[2])]